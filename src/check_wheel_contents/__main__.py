@@ -1,15 +1,19 @@
 from __future__ import annotations
 from collections.abc import Iterator
+import os
 from pathlib import Path
 from typing import Any
 import click
-from wheel_filename import ParseError
 from . import __version__
 from .checker import NO_CONFIG, WheelChecker
 from .checks import Check, parse_checks_string
-from .contents import WheelContents
-from .errors import UserInputError, WheelValidationError
-from .util import comma_split
+from .contents import ZIP_LISTING_MODES
+from .errors import UserInputError
+from .report import REPORTERS
+from .runner import check_wheels
+from .server import HAS_UNIX_SOCKETS, encode_options, send_request
+from .server import serve as serve_forever
+from .util import comma_split, is_dist_info_dir, parse_size
 
 
 class ChecksParamType(click.ParamType):
@@ -54,6 +58,12 @@ class ConfigParamType(click.ParamType):
     "--version",
     message="%(prog)s %(version)s",
 )
+@click.option(
+    "--allow-duplicates",
+    type=comma_split,
+    help="Comma-separated list of file hashes that W002 & W301 allow to repeat",
+    metavar="HASHES",
+)
 @click.option(
     "-c",
     "--config",
@@ -67,12 +77,96 @@ class ConfigParamType(click.ParamType):
     type=ConfigParamType(),
     help="Do not read from a configuration file",
 )
+@click.option(
+    "--connect",
+    metavar="SOCKET",
+    help="Send the checks to a server listening on the given Unix socket",
+)
+@click.option(
+    "--cross-project",
+    is_flag=True,
+    help=(
+        "Also compare each wheel with the wheels for other projects checked"
+        " before it (check W301)"
+    ),
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop at the first failing check or wheel",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(list(REPORTERS)),
+    default="text",
+    show_default=True,
+    help="Output format",
+)
 @click.option(
     "--ignore",
     type=ChecksParamType(),
     help="Comma-separated list of checks to disable",
     metavar="CHECKS",
 )
+@click.option(
+    "--installed",
+    is_flag=True,
+    help=(
+        "Check the *.dist-info directories in directory arguments (e.g., a"
+        " site-packages directory or unpacked wheel) instead of *.whl files"
+    ),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default="number of CPUs",
+    help=(
+        "Maximum number of wheels to read at once, or of requests for --serve to"
+        " process at once"
+    ),
+)
+@click.option(
+    "--matrix",
+    is_flag=True,
+    help=(
+        "Also compare the wheels for the same project & version with each other"
+        " (checks W302 & W303)"
+    ),
+)
+@click.option(
+    "--max-file-size",
+    type=parse_size,
+    help="Maximum size of any single file in the wheel (check W502)",
+    metavar="SIZE",
+)
+@click.option(
+    "--max-library-size",
+    type=parse_size,
+    help="Maximum total size of the wheel's library (check W501)",
+    metavar="SIZE",
+)
+@click.option(
+    "--max-stored-size",
+    type=parse_size,
+    help="Maximum size of any uncompressed member of the wheel (check W504)",
+    metavar="SIZE",
+)
+@click.option(
+    "--max-toplevel-size",
+    type=parse_size,
+    help="Maximum size of each toplevel library entry (check W503)",
+    metavar="SIZE",
+)
+@click.option(
+    "--min-compression-ratio",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Minimum ratio of the wheel's uncompressed size to its compressed size"
+    " (check W505)",
+    metavar="RATIO",
+)
 @click.option(
     "--package",
     type=click.Path(exists=True),
@@ -82,28 +176,63 @@ class ConfigParamType(click.ParamType):
 @click.option(
     "--package-omit",
     type=comma_split,
-    help="Patterns in --package/--src-dir to ignore",
+    help="Patterns in --package/--src-dir/--sdist to ignore",
     metavar="PATTERNS",
 )
+@click.option(
+    "--plugins",
+    type=comma_split,
+    help="Comma-separated list of plugin checks to enable",
+    metavar="CHECKS",
+)
+@click.option(
+    "--sdist",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Sdist archive whose package files to expect in wheel library",
+)
 @click.option(
     "--select",
     type=ChecksParamType(),
     help="Comma-separated list of checks to enable",
     metavar="CHECKS",
 )
+@click.option(
+    "--serve",
+    metavar="SOCKET",
+    help="Run as a server listening for --connect clients on the given Unix socket",
+)
 @click.option(
     "--src-dir",
     type=click.Path(exists=True, file_okay=False),
     multiple=True,
     help="Directory to expect contents of in wheel library",
 )
+@click.option(
+    "--src-from-git",
+    is_flag=True,
+    help="Read --package/--src-dir trees from the files tracked by Git",
+)
 @click.option(
     "--toplevel",
     type=comma_split,
     help="Comma-separated list of expected toplevel library entries",
     metavar="NAMES",
 )
-@click.argument("wheel", nargs=-1, type=click.Path(exists=True, dir_okay=True))
+@click.option(
+    "--zip-listing",
+    type=click.Choice(ZIP_LISTING_MODES),
+    default="never",
+    show_default=True,
+    help=(
+        "When to build the file list from the ZIP central directory instead of"
+        " RECORD: never, only for wheels without a RECORD, or always"
+    ),
+)
+@click.argument(
+    "wheel",
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=True, allow_dash=True),
+)
 @click.pass_context
 def main(
     ctx: click.Context,
@@ -114,7 +243,25 @@ def main(
     toplevel: list[str] | None,
     package: tuple[str, ...],
     src_dir: tuple[str, ...],
+    sdist: str | None,
+    src_from_git: bool,
     package_omit: list[str] | None,
+    plugins: list[str] | None,
+    allow_duplicates: list[str] | None,
+    max_library_size: int | None,
+    max_file_size: int | None,
+    max_toplevel_size: int | None,
+    max_stored_size: int | None,
+    min_compression_ratio: float | None,
+    serve: str | None,
+    connect: str | None,
+    jobs: int,
+    output_format: str,
+    fail_fast: bool,
+    cross_project: bool,
+    matrix: bool,
+    installed: bool,
+    zip_listing: str,
 ) -> None:
     """
     Check that your wheels have the right contents.
@@ -122,50 +269,96 @@ def main(
     Visit <https://github.com/jwodder/check-wheel-contents> for more
     information.
     """
+    configargs = {
+        "configpath": config,
+        "select": select,
+        "ignore": ignore,
+        "toplevel": toplevel,
+        "package": package,
+        "src_dir": src_dir,
+        "sdist": sdist,
+        "src_from_git": src_from_git,
+        "package_omit": package_omit,
+        "plugins": plugins,
+        "allow_duplicates": allow_duplicates,
+        "max_library_size": max_library_size,
+        "max_file_size": max_file_size,
+        "max_toplevel_size": max_toplevel_size,
+        "max_stored_size": max_stored_size,
+        "min_compression_ratio": min_compression_ratio,
+    }
+    if (serve is not None or connect is not None) and not HAS_UNIX_SOCKETS:
+        ctx.fail("--serve and --connect require Unix domain socket support")
+    if serve is not None:
+        if connect is not None or wheel:
+            ctx.fail("--serve cannot be combined with --connect or wheel arguments")
+        try:
+            serve_forever(serve, jobs)
+        except UserInputError as e:
+            ctx.fail(str(e))
+        ctx.exit(0)
+    if connect is not None:
+        if "-" in wheel:
+            ctx.fail("Wheels cannot be read from standard input with --connect")
+        request = {
+            "cwd": os.getcwd(),
+            "options": encode_options(**configargs),
+            "wheels": [str(w) for w in args2wheelpaths(wheel, installed=installed)],
+            "format": output_format,
+            "fail_fast": fail_fast,
+            "cross_project": cross_project,
+            "matrix": matrix,
+            "zip_listing": zip_listing,
+        }
+        try:
+            rc = send_request(connect, request, echo)
+        except UserInputError as e:
+            ctx.fail(str(e))
+        except OSError as e:
+            ctx.fail(f"Could not communicate with server at {connect}: {e}")
+        ctx.exit(rc)
     checker = WheelChecker()
     try:
-        checker.configure_options(
-            configpath=config,
-            select=select,
-            ignore=ignore,
-            toplevel=toplevel,
-            package=package,
-            src_dir=src_dir,
-            package_omit=package_omit,
-        )
+        checker.configure_options(**configargs)
     except UserInputError as e:
         ctx.fail(str(e))
-    ok = True
-    for w in args2wheelpaths(wheel):
-        try:
-            contents = WheelContents.from_wheel(w)
-        except ParseError:
-            click.echo(f"{w}: wheel has invalid filename", err=True)
-            ok = False
-            continue
-        except WheelValidationError as e:
-            click.echo(f"{w}: invalid wheel: {e}", err=True)
-            ok = False
-            continue
-        failures = checker.check_contents(contents)
-        if failures:
-            for f in failures:
-                print(f.show(str(w)))
-            ok = False
-        else:
-            print(f"{w}: OK")
+    reporter = REPORTERS[output_format](echo, checker.plugins)
+    ok = check_wheels(
+        checker,
+        args2wheelpaths(wheel, installed=installed),
+        reporter,
+        fail_fast=fail_fast,
+        cross_project=cross_project,
+        matrix=matrix,
+        jobs=jobs,
+        zip_listing=zip_listing,
+    )
     ctx.exit(0 if ok else 1)
 
 
-def args2wheelpaths(args: list[str]) -> Iterator[Path]:
+def echo(line: str, err: bool) -> None:
+    """Print a line of output to stdout or (if ``err`` is true) stderr"""
+    click.echo(line, err=err)
+
+
+def args2wheelpaths(args: list[str], installed: bool = False) -> Iterator[Path]:
     """
     Convert a list of paths to `Path` objects and, if a given path is a
-    directory, replace it with `Path`\\s to all wheels underneath it
+    directory, replace it with `Path`\\s to all wheels underneath it.
+
+    If ``installed`` is true, a directory is instead replaced with the
+    ``*.dist-info`` directories containing :file:`RECORD` files directly
+    inside it (or with itself, if it is such a directory).
     """
     for a in args:
         p = Path(a)
         if p.is_dir():
-            yield from p.rglob("*.[Ww][Hh][Ll]")
+            if not installed:
+                yield from p.rglob("*.[Ww][Hh][Ll]")
+            elif is_dist_info_dir(p.name):
+                yield p
+            else:
+                yield from sorted(r.parent for r in p.glob("*.dist-info/RECORD"))
         else:
             yield p
 
@@ -0,0 +1,81 @@
+"""
+Reading the wheels packed inside tar & zip bundles (e.g., wheelhouses)
+
+A bundle is read in a single pass: as each wheel member is reached, its bytes
+are copied into a `~tempfile.SpooledTemporaryFile`, which keeps them in memory
+unless they exceed `SPOOL_MAX_SIZE`, in which case they are spilled to a
+temporary file on disk.  Only one member is copied at a time (or, when wheels
+are read ahead of being checked, one per wheel being read), so the whole
+bundle never needs to be extracted.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+import os
+import shutil
+import tarfile
+from tempfile import SpooledTemporaryFile
+from typing import IO
+import zipfile
+
+#: The filename suffixes of the archives that are treated as bundles of wheels
+BUNDLE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".zip")
+
+#: The maximum size in bytes of a wheel member that is held in memory; larger
+#: members are spilled to a temporary file
+SPOOL_MAX_SIZE = 32 << 20
+
+
+def is_bundle(path: str | os.PathLike[str]) -> bool:
+    """
+    Test whether the file at ``path`` should be treated as a bundle of wheels
+    based on its filename
+    """
+    return os.fsdecode(path).lower().endswith(BUNDLE_SUFFIXES)
+
+
+def is_wheel_member(name: str) -> bool:
+    """Test whether a bundle member with the given name is a wheel"""
+    return name.lower().endswith(".whl")
+
+
+def spool(fp: IO[bytes], max_size: int = SPOOL_MAX_SIZE) -> IO[bytes]:
+    """
+    Copy the remaining contents of ``fp`` into a new spooled temporary file and
+    return it, rewound to the beginning
+    """
+    tmp = SpooledTemporaryFile(max_size=max_size)
+    shutil.copyfileobj(fp, tmp)
+    tmp.seek(0)
+    return tmp  # type: ignore[return-value]
+
+
+def iter_bundle(
+    path: str | os.PathLike[str], max_size: int = SPOOL_MAX_SIZE
+) -> Iterator[tuple[str, IO[bytes]]]:
+    """
+    Yield the name of each wheel in the bundle at ``path`` along with a
+    spooled copy of its contents, in archive order.  The caller is responsible
+    for closing each file.
+
+    Tar bundles are read in stream mode, and so each file must be yielded
+    before the next member is read.
+
+    :raises OSError: if the bundle cannot be read
+    :raises tarfile.TarError: if the bundle is an invalid tar file
+    :raises zipfile.BadZipFile: if the bundle is an invalid zip file
+    """
+    if os.fsdecode(path).lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            for zi in zf.infolist():
+                if not zi.is_dir() and is_wheel_member(zi.filename):
+                    with zf.open(zi) as fp:
+                        yield (zi.filename, spool(fp, max_size))
+    else:
+        with tarfile.open(path, mode="r|*") as tf:
+            for ti in tf:
+                if ti.isfile() and is_wheel_member(ti.name):
+                    member = tf.extractfile(ti)
+                    assert member is not None
+                    with member:
+                        yield (ti.name, spool(member, max_size))
@@ -1,36 +1,57 @@
 from __future__ import annotations
+from collections.abc import Iterable, Iterator
 from operator import attrgetter
 import re
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
+import zlib
 import attr
-from .checks import Check, FailedCheck
-from .config import Configuration
+from .checks import Check, CheckSpec, FailedCheck, Needs, PluginCheck
 from .contents import WheelContents
 from .filetree import Directory, File
-from .util import bytes_signature, is_stubs_dir
+from .index import DuplicateIndex, ReleaseIndex
+from .lightconfig import LightConfiguration, load_config_section
+from .util import BYTECODE_SUFFIXES, bytes_signature, format_size, is_stubs_dir
+from .zipstream import STORED
+
+if TYPE_CHECKING:
+    from .config import Configuration
 
 #: A sentinel object used to disable reading from a configuration file
 NO_CONFIG = object()
 
-#: The file extensions of Python bytecode files
-BYTECODE_SUFFIXES = (".pyc", ".pyo")
+#: The contents of common files that are excluded from W002's
+#: duplicate-checking
+ALLOWED_DUPLICATE_CONTENTS = [
+    b"",
+    b"\n",
+    b"\r\n",
+    b"# -*- coding: utf-8 -*-",
+    b"# -*- coding: utf-8 -*-\n",
+    b"# -*- coding: utf-8 -*-\n\r",
+]
 
 #: Signatures of common files that are excluded from W002's duplicate-checking
 ALLOWED_DUPLICATES = {
     (None, None),
-    bytes_signature(b""),
-    bytes_signature(b"\n"),
-    bytes_signature(b"\r\n"),
-    bytes_signature(b"# -*- coding: utf-8 -*-"),
-    bytes_signature(b"# -*- coding: utf-8 -*-\n"),
-    bytes_signature(b"# -*- coding: utf-8 -*-\n\r"),
+    *map(bytes_signature, ALLOWED_DUPLICATE_CONTENTS),
 }
 
+#: The sizes & CRC-32s of `ALLOWED_DUPLICATE_CONTENTS`, for excluding files
+#: whose hashes are unknown
+ALLOWED_DUPLICATE_CRCS = {(len(b), zlib.crc32(b)) for b in ALLOWED_DUPLICATE_CONTENTS}
+
 #: A regex matching filenames to ignore for the purposes of W003, W009, and
 #: W202.  Currently, it just matches ``*.pth`` files.
 IGNORED_TOPLEVEL_RGX = re.compile(r".\.pth\Z")
 
+#: The names of the files in a ``.dist-info`` directory that hold signatures
+#: of the :file:`RECORD` and so cannot be listed in it; ignored by W401
+RECORD_SIGNATURE_FILES = ("RECORD.jws", "RECORD.p7s")
+
+#: The maximum number of offending paths reported by each of W501 through W505
+MAX_SIZE_OFFENDERS = 10
+
 #: A list of common toplevel names for W005 to fail on
 COMMON_NAMES = set(
     """
@@ -41,6 +62,76 @@ COMMON_NAMES = set(
 )
 
 
+#: The registry of `CheckSpec`\s for all checks.  Checks that only look up a
+#: few names at the top of the wheel are cheapest, followed by those that
+#: iterate over the toplevel entries, and finally those that walk the whole
+#: file tree.
+CHECK_SPECS: dict[Check, CheckSpec] = {
+    c: CheckSpec(c, needs, cost)
+    for c, needs, cost in [
+        (Check.W001, frozenset({Needs.ALL_FILES}), 50),
+        (
+            Check.W002,
+            frozenset({Needs.SIGNATURES, Needs.ARCHIVE, Needs.MEMBER_HASHES}),
+            20,
+        ),
+        (Check.W003, frozenset({Needs.TOPLEVEL}), 5),
+        (Check.W004, frozenset({Needs.LIBRARY_FILES}), 80),
+        (Check.W005, frozenset({Needs.TOPLEVEL}), 2),
+        (Check.W006, frozenset({Needs.TOPLEVEL}), 1),
+        (Check.W007, frozenset({Needs.TOPLEVEL}), 1),
+        (Check.W008, frozenset({Needs.TOPLEVEL}), 1),
+        (Check.W009, frozenset({Needs.TOPLEVEL}), 5),
+        (Check.W010, frozenset({Needs.LIBRARY_FILES}), 60),
+        (Check.W101, frozenset({Needs.LIBRARY_FILES, Needs.PACKAGE_TREE}), 100),
+        (Check.W102, frozenset({Needs.LIBRARY_FILES, Needs.PACKAGE_TREE}), 100),
+        (Check.W201, frozenset({Needs.TOPLEVEL}), 2),
+        (Check.W202, frozenset({Needs.TOPLEVEL}), 5),
+        (Check.W301, frozenset({Needs.SIGNATURES, Needs.OTHER_WHEELS}), 30),
+        (Check.W302, frozenset({Needs.LIBRARY_FILES, Needs.OTHER_WHEELS}), 80),
+        (Check.W303, frozenset({Needs.LIBRARY_FILES, Needs.OTHER_WHEELS}), 80),
+        (Check.W401, frozenset({Needs.ALL_FILES, Needs.ARCHIVE}), 40),
+        (Check.W402, frozenset({Needs.ALL_FILES, Needs.ARCHIVE}), 40),
+        (Check.W403, frozenset({Needs.ALL_FILES, Needs.ARCHIVE}), 40),
+        (Check.W501, frozenset({Needs.TOPLEVEL}), 2),
+        (Check.W502, frozenset({Needs.ALL_FILES}), 50),
+        (Check.W503, frozenset({Needs.TOPLEVEL}), 2),
+        (Check.W504, frozenset({Needs.ARCHIVE}), 10),
+        (Check.W505, frozenset({Needs.ARCHIVE}), 10),
+    ]
+}
+
+#: All checks in ascending order of cost
+CHEAPEST_FIRST = sorted(Check, key=lambda c: (CHECK_SPECS[c].cost, c.name))
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class CheckPlan:
+    """
+    The order in which a `WheelChecker` will run its selected checks, along
+    with the data that they need.  Data shared between multiple checks (e.g.,
+    the list of library files) is computed at most once per wheel, the first
+    time a check needs it.
+    """
+
+    #: The checks to run, in order of execution
+    steps: tuple[CheckSpec, ...]
+
+    @property
+    def needs(self) -> frozenset[Needs]:
+        """The kinds of data needed by any of the checks in the plan"""
+        return frozenset().union(*(s.needs for s in self.steps))
+
+    @property
+    def cost(self) -> int:
+        """The estimated total cost of running all of the checks in the plan"""
+        return sum(s.cost for s in self.steps)
+
+    def describe(self) -> list[str]:
+        """Return a human-readable description of each step in the plan"""
+        return [s.describe() for s in self.steps]
+
+
 @attr.s(auto_attribs=True)
 class WheelChecker:
     """A class for performing various checks on a `WheelContents` instance"""
@@ -53,6 +144,26 @@ class WheelChecker:
     toplevel: list[str] | None = None
     #: The package tree to expect for W1, or `None` to disable the checks
     pkgtree: Directory | None = None
+    #: The enabled third-party checks
+    plugins: list[PluginCheck] = attr.Factory(list)
+    #: File hashes for which duplicates are allowed by W002 & W301, in
+    #: addition to those in `ALLOWED_DUPLICATES`
+    allowed_duplicates: frozenset[str] = frozenset()
+    #: The maximum total size in bytes of the wheel's library for W501, or
+    #: `None` to disable the check
+    max_library_size: int | None = None
+    #: The maximum size in bytes of a single file for W502, or `None` to
+    #: disable the check
+    max_file_size: int | None = None
+    #: The maximum size in bytes of a toplevel library entry for W503, or
+    #: `None` to disable the check
+    max_toplevel_size: int | None = None
+    #: The maximum size in bytes of an uncompressed member for W504, or `None`
+    #: to disable the check
+    max_stored_size: int | None = None
+    #: The minimum ratio of a wheel's uncompressed size to its compressed size
+    #: for W505, or `None` to disable the check
+    min_compression_ratio: float | None = None
 
     @selected.default
     def _selected_default(self) -> set[Check]:
@@ -66,35 +177,68 @@ class WheelChecker:
         toplevel: list[str] | None = None,
         package: tuple[str, ...] = (),
         src_dir: tuple[str, ...] = (),
+        sdist: str | None = None,
+        src_from_git: bool = False,
         package_omit: list[str] | None = None,
+        plugins: list[str] | None = None,
+        allow_duplicates: list[str] | None = None,
+        max_library_size: int | None = None,
+        max_file_size: int | None = None,
+        max_toplevel_size: int | None = None,
+        max_stored_size: int | None = None,
+        min_compression_ratio: float | None = None,
     ) -> None:
         """
         Configure the `WheelChecker` according to the given command-line
         options.  If ``configpath`` is `None`, the default configuration file
         is used.  If it is `NO_CONFIG`, no configuration file is used.
+
+        The pydantic-based `Configuration` class is only imported & used if a
+        configuration file section actually needs to be validated; otherwise,
+        the options are stored in a `LightConfiguration`.
         """
-        cfg = Configuration()
+        cfg = LightConfiguration()
         if configpath is not NO_CONFIG:
             if configpath is not None and not isinstance(configpath, str):
                 raise TypeError("configpath must be None, str, or NO_CONFIG")
-            cfg.update(Configuration.from_config_file(configpath))
+            found = load_config_section(configpath)
+            if found is not None:
+                from .config import Configuration
+
+                cfg.update(Configuration.from_config_data(*found))
         cfg.update(
-            Configuration.from_command_options(
+            LightConfiguration.from_command_options(
                 select=select,
                 ignore=ignore,
                 toplevel=toplevel,
                 package=package,
                 src_dir=src_dir,
+                sdist=sdist,
+                src_from_git=src_from_git,
                 package_omit=package_omit,
+                plugins=plugins,
+                allow_duplicates=allow_duplicates,
+                max_library_size=max_library_size,
+                max_file_size=max_file_size,
+                max_toplevel_size=max_toplevel_size,
+                max_stored_size=max_stored_size,
+                min_compression_ratio=min_compression_ratio,
             )
         )
         self.apply_config(cfg)
 
-    def apply_config(self, cfg: Configuration) -> None:
+    def apply_config(self, cfg: Configuration | LightConfiguration) -> None:
         """Apply a given `Configuration` to self"""
         self.selected = cfg.get_selected_checks()
         self.toplevel = cfg.toplevel
         self.pkgtree = cfg.get_package_tree()
+        self.plugins = cfg.get_plugin_checks()
+        self.allowed_duplicates = cfg.get_allowed_duplicates()
+        self.max_library_size = cfg.max_library_size
+        self.max_file_size = cfg.max_file_size
+        self.max_toplevel_size = cfg.max_toplevel_size
+        self.max_stored_size = cfg.max_stored_size
+        self.min_compression_ratio = cfg.min_compression_ratio
         if (
             self.toplevel is not None
             and self.pkgtree is not None
@@ -106,22 +250,75 @@ class WheelChecker:
                 file=sys.stderr,
             )
 
-    def check_contents(self, contents: WheelContents) -> list[FailedCheck]:
+    def __attrs_post_init__(self) -> None:
+        # A cache of the package tree and its file paths, so that W101 and
+        # W102 don't have to walk the tree for every wheel:
+        self._pkgtree_paths: tuple[Directory, frozenset[str]] | None = None
+
+    def plan(self) -> CheckPlan:
+        """
+        Return a `CheckPlan` describing the order in which the selected checks
+        will be run by `check_contents()`, i.e., in order of increasing cost.
+        Checks that compare a wheel against other wheels are not included.
+        """
+        steps = [
+            CHECK_SPECS[c]
+            for c in CHEAPEST_FIRST
+            if c in self.selected and Needs.OTHER_WHEELS not in CHECK_SPECS[c].needs
+        ]
+        steps.extend(p.spec for p in self.plugins)
+        # The sort is stable, so plugin checks run after builtin checks of
+        # equal cost:
+        steps.sort(key=attrgetter("cost"))
+        return CheckPlan(steps=tuple(steps))
+
+    def check_contents(
+        self, contents: WheelContents, first_failure_only: bool = False
+    ) -> list[FailedCheck]:
         """
         Check a given `WheelContents` against the checks in ``selected``.  For
         each check, the method ``check_{checkname}()`` of the `WheelChecker` is
         called with ``contents`` as an argument; the method must return a list
-        of any & all failures as `FailedCheck` instances.  `check_contents()`
-        collects these lists and returns their concatenation.
+        of any & all failures as `FailedCheck` instances.  Each of the enabled
+        ``plugins`` is likewise run by calling its ``func`` with the
+        `WheelChecker` and ``contents``.  `check_contents()`
+        collects these lists and returns their concatenation, ordered by check
+        name.
+
+        The checks are run in the order given by `plan()`, i.e., in order of
+        increasing cost.  If ``first_failure_only`` is true, only the failures
+        from the first check to fail are returned, and the remaining checks
+        are not run.
+        """
+        results: dict[Check | PluginCheck, list[FailedCheck]] = {}
+        for step in self.plan().steps:
+            failures: list[FailedCheck]
+            if isinstance(step.check, Check):
+                failures = getattr(self, "check_" + step.check.name)(contents)
+            else:
+                failures = step.check.func(self, contents)
+            if failures and first_failure_only:
+                return failures
+            results[step.check] = failures
+        return [f for c in sorted(results, key=attrgetter("name")) for f in results[c]]
+
+    def get_pkgtree_paths(self) -> frozenset[str] | None:
         """
-        failures = []
-        for c in sorted(self.selected, key=attrgetter("name")):
-            method = getattr(self, "check_" + c.name)
-            failures.extend(method(contents))
-        return failures
+        Return the paths of all files in ``pkgtree``, or `None` if ``pkgtree``
+        is `None`.  The result is cached for as long as ``pkgtree`` is not
+        replaced.
+        """
+        if self.pkgtree is None:
+            return None
+        if self._pkgtree_paths is None or self._pkgtree_paths[0] is not self.pkgtree:
+            paths = frozenset(f.path for f in self.pkgtree.all_files())
+            self._pkgtree_paths = (self.pkgtree, paths)
+        return self._pkgtree_paths[1]
 
     def check_W001(self, contents: WheelContents) -> list[FailedCheck]:
         """Check W001 — Wheel contains .pyc/.pyo files"""
+        if not contents.filetree.stats.bytecode:
+            return []
         badfiles = []
         for f in contents.filetree.all_files():
             if f.extension in BYTECODE_SUFFIXES:
@@ -131,17 +328,71 @@ class WheelChecker:
         else:
             return []
 
+    def is_allowed_duplicate(self, sig: tuple[int | None, str | None]) -> bool:
+        """
+        Returns `True` iff files with the signature ``sig`` are exempt from the
+        duplicate checks W002 & W301, i.e., iff ``sig`` is in
+        `ALLOWED_DUPLICATES`, its hash is in ``allowed_duplicates``, or it has
+        no hash (as files with the same size are not necessarily the same)
+        """
+        return (
+            sig[1] is None
+            or sig in ALLOWED_DUPLICATES
+            or sig[1] in self.allowed_duplicates
+        )
+
+    def new_duplicate_index(self) -> DuplicateIndex | None:
+        """
+        Return a new, empty `DuplicateIndex` for comparing the wheels checked
+        in a single run for check W301, or `None` if W301 is not selected.
+        The index is not stored on the `WheelChecker`, so that a checker can
+        be used for multiple runs (possibly at once).
+        """
+        if Check.W301 in self.selected:
+            return DuplicateIndex(self.is_allowed_duplicate)
+        else:
+            return None
+
+    def new_release_index(self) -> ReleaseIndex | None:
+        """
+        Return a new, empty `ReleaseIndex` for comparing the wheels for the
+        same releases checked in a single run for checks W302 & W303, or
+        `None` if neither check is selected
+        """
+        checks = frozenset({Check.W302, Check.W303} & self.selected)
+        if checks:
+            return ReleaseIndex(checks)
+        else:
+            return None
+
     def check_W002(self, contents: WheelContents) -> list[FailedCheck]:
         """
         Check W002 — Wheel contains duplicate files
 
-        Files whose signatures are in `ALLOWED_DUPLICATES` are ignored.
+        Files whose signatures are allowed by `is_allowed_duplicate()` are
+        ignored.
+
+        Files without hashes are instead compared by the uncompressed sizes &
+        CRC-32s of their entries in the wheel's ZIP central directory (see
+        `WheelContents.crc_duplicates()`), refined by their hashes where those
+        were computed while reading the wheel.
         """
-        ### TODO: Support reading sets of allowed duplicates from config
         dups = []
         for sig, files in contents.by_signature.items():
-            if len(files) > 1 and sig not in ALLOWED_DUPLICATES:
+            if len(files) > 1 and not self.is_allowed_duplicate(sig):
                 dups.append(FailedCheck(Check.W002, [f.path for f in files]))
+        for group in contents.crc_duplicates():
+            size, crc = group[0][1].size, group[0][1].crc
+            by_digest: dict[str | None, list[str]] = {}
+            for f, m in group:
+                by_digest.setdefault(m.digest, []).append(f.path)
+            for digest, paths in by_digest.items():
+                if digest is None:
+                    allowed = (size, crc) in ALLOWED_DUPLICATE_CRCS
+                else:
+                    allowed = self.is_allowed_duplicate((size, digest))
+                if len(paths) > 1 and not allowed:
+                    dups.append(FailedCheck(Check.W002, paths))
         return dups
 
     def check_W003(self, contents: WheelContents) -> list[FailedCheck]:
@@ -177,11 +428,14 @@ class WheelChecker:
         """
         # TODO: Ignore __init__.py files underneath *-stubs?  Or are those not
         # supposed to be there?
-        badfiles = []
-        for tree in (contents.purelib_tree, contents.platlib_tree):
-            for f in tree.all_files():
-                if f.has_module_ext() and not f.is_valid_module_path():
-                    badfiles.append(f.path)
+        # The names of the directories are checked once per directory rather
+        # than once per file:
+        badfiles = [
+            f.path
+            for tree in (contents.purelib_tree, contents.platlib_tree)
+            for f, importable in tree.module_files()
+            if not importable
+        ]
         if badfiles:
             return [FailedCheck(Check.W004, badfiles)]
         else:
@@ -289,9 +543,7 @@ class WheelChecker:
         baddirs = []
         for tree in (contents.purelib_tree, contents.platlib_tree):
             for name, subdir in tree.subdirectories.items():
-                if not is_stubs_dir(name) and not any(
-                    f.has_module_ext() for f in subdir.all_files()
-                ):
+                if not is_stubs_dir(name) and not subdir.stats.modules:
                     assert subdir.path is not None
                     baddirs.append(subdir.path)
         if baddirs:
@@ -307,13 +559,13 @@ class WheelChecker:
 
         Only active when ``--package`` or ``--src-dir`` given
         """
-        if self.pkgtree is None:
+        expected = self.get_pkgtree_paths()
+        if expected is None:
             return []
-        missing = {f.path for f in self.pkgtree.all_files()}
-        for tree in (contents.purelib_tree, contents.platlib_tree):
-            for f in tree.all_files():
-                assert f.libpath is not None
-                missing.discard(f.libpath)
+        missing = set(expected)
+        for f in contents.library_files:
+            assert f.libpath is not None
+            missing.discard(f.libpath)
         if missing:
             return [FailedCheck(Check.W101, sorted(missing))]
         else:
@@ -327,14 +579,13 @@ class WheelChecker:
 
         Only active when ``--package`` or ``--src-dir`` given
         """
-        if self.pkgtree is None:
+        expected = self.get_pkgtree_paths()
+        if expected is None:
             return []
-        expected = {f.path for f in self.pkgtree.all_files()}
         extra = []
-        for tree in (contents.purelib_tree, contents.platlib_tree):
-            for f in tree.all_files():
-                if f.libpath not in expected:
-                    extra.append(f.path)
+        for f in contents.library_files:
+            if f.libpath not in expected:
+                extra.append(f.path)
         if extra:
             return [FailedCheck(Check.W102, extra)]
         else:
@@ -380,3 +631,215 @@ class WheelChecker:
             return [FailedCheck(Check.W202, extra)]
         else:
             return []
+
+    def check_W401(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W401 — Wheel contains files not listed in RECORD
+
+        Compares the names in the wheel's ZIP central directory against the
+        files in the wheel's file tree, without decompressing anything.
+        Directory entries and :file:`RECORD` signature files are ignored.
+
+        Only active for wheels read from ZIP archives
+        """
+        if contents.archive is None:
+            return []
+        recorded = contents.files_by_path
+        signatures = {f"{contents.dist_info_dir}/{n}" for n in RECORD_SIGNATURE_FILES}
+        unlisted = [
+            m.name
+            for m in contents.archive
+            if not m.name.endswith("/")
+            and m.name not in recorded
+            and m.name not in signatures
+        ]
+        if unlisted:
+            return [FailedCheck(Check.W401, unlisted)]
+        else:
+            return []
+
+    def check_W402(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W402 — RECORD lists files not present in wheel
+
+        Only active for wheels read from ZIP archives
+        """
+        if contents.archive is None:
+            return []
+        present = {m.name for m in contents.archive}
+        missing = [path for path in contents.files_by_path if path not in present]
+        if missing:
+            return [FailedCheck(Check.W402, missing)]
+        else:
+            return []
+
+    def check_W403(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W403 — File sizes in RECORD do not match wheel
+
+        Compares the sizes listed in the wheel's :file:`RECORD` against the
+        uncompressed sizes in the wheel's ZIP central directory.  Files without
+        sizes in :file:`RECORD` are ignored.
+
+        Only active for wheels read from ZIP archives
+        """
+        if contents.archive is None:
+            return []
+        recorded = contents.files_by_path
+        mismatched = []
+        for m in contents.archive:
+            f = recorded.get(m.name)
+            if f is not None and f.size is not None and f.size != m.size:
+                mismatched.append(m.name)
+        if mismatched:
+            return [FailedCheck(Check.W403, mismatched)]
+        else:
+            return []
+
+    def check_W501(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W501 — Wheel library exceeds maximum size
+
+        Sizes are taken from the wheel's :file:`RECORD`; files without sizes
+        are ignored.  The largest toplevel library entries are reported.
+
+        Only active when ``--max-library-size`` given
+        """
+        if self.max_library_size is None:
+            return []
+        trees = (contents.purelib_tree, contents.platlib_tree)
+        if sum(tree.stats.size for tree in trees) <= self.max_library_size:
+            return []
+        return [largest_failure(Check.W501, list(toplevel_sizes(trees)))]
+
+    def check_W502(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W502 — Wheel contains file exceeding maximum size
+
+        Sizes are taken from the wheel's :file:`RECORD`; files without sizes
+        are ignored.
+
+        Only active when ``--max-file-size`` given
+        """
+        limit = self.max_file_size
+        if limit is None or contents.filetree.stats.largest <= limit:
+            return []
+        big = [
+            (f.size, f.path)
+            for f in contents.filetree.all_files()
+            if f.size is not None and f.size > limit
+        ]
+        return [largest_failure(Check.W502, big)]
+
+    def check_W503(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W503 — Wheel library has toplevel entry exceeding maximum size
+
+        Sizes are taken from the wheel's :file:`RECORD`; files without sizes
+        are ignored.
+
+        Only active when ``--max-toplevel-size`` given
+        """
+        limit = self.max_toplevel_size
+        if limit is None:
+            return []
+        big = [
+            (size, path)
+            for size, path in toplevel_sizes(
+                (contents.purelib_tree, contents.platlib_tree)
+            )
+            if size > limit
+        ]
+        if big:
+            return [largest_failure(Check.W503, big)]
+        else:
+            return []
+
+    def check_W504(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W504 — Wheel contains large uncompressed file
+
+        Reads the compression methods & uncompressed sizes of the files in the
+        wheel's ZIP central directory without decompressing anything.
+
+        Only active when ``--max-stored-size`` given and the wheel was read
+        from a ZIP archive
+        """
+        limit = self.max_stored_size
+        if limit is None or contents.archive is None:
+            return []
+        big = [
+            (m.size, m.name)
+            for m in contents.archive
+            if m.compress_type == STORED and m.size > limit
+        ]
+        if big:
+            return [largest_failure(Check.W504, big)]
+        else:
+            return []
+
+    def check_W505(self, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Check W505 — Wheel compression ratio is below minimum
+
+        Compares the total uncompressed & compressed sizes of the files in the
+        wheel's ZIP central directory without decompressing anything.  The
+        overall ratio is reported along with the nonempty files whose own
+        compression ratios are below the minimum, largest compressed size
+        first; there may be no such files if the overall ratio is only low
+        because of empty files, whose compressed data is never smaller than
+        their contents.
+
+        Only active when ``--min-compression-ratio`` given and the wheel was
+        read from a ZIP archive
+        """
+        ratio = self.min_compression_ratio
+        if ratio is None or contents.archive is None:
+            return []
+        sized = [
+            (m.size, m.compress_size, m.name)
+            for m in contents.archive
+            if m.compress_size is not None
+        ]
+        total = sum(size for size, _, _ in sized)
+        compressed = sum(csize for _, csize, _ in sized)
+        if compressed == 0 or total >= ratio * compressed:
+            return []
+        poor = [
+            (csize, name)
+            for size, csize, name in sized
+            if size > 0 and size < ratio * csize
+        ]
+        failure = largest_failure(Check.W505, poor)
+        failure.note = f"overall ratio {total / compressed:.2f}"
+        return [failure]
+
+
+def toplevel_sizes(trees: Iterable[Directory]) -> Iterator[tuple[int, str]]:
+    """
+    Yield the total size & path of each toplevel entry in ``trees``, ignoring
+    files without sizes
+    """
+    for tree in trees:
+        for entry in tree.entries.values():
+            assert entry.path is not None
+            if isinstance(entry, Directory):
+                yield (entry.stats.size, entry.path)
+            elif entry.size is not None:
+                yield (entry.size, entry.path)
+
+
+def largest_failure(check: Check, sized: list[tuple[int, str]]) -> FailedCheck:
+    """
+    Given a list of ``(size, path)`` pairs, return a `FailedCheck` for
+    ``check`` listing the paths & sizes of the largest `MAX_SIZE_OFFENDERS`
+    entries, largest first, along with a count of any entries omitted
+    """
+    sized.sort(key=lambda sp: (-sp[0], sp[1]))
+    shown = sized[:MAX_SIZE_OFFENDERS]
+    return FailedCheck(
+        check,
+        [path for _, path in shown],
+        details=[format_size(size) for size, _ in shown],
+        omitted=max(len(sized) - MAX_SIZE_OFFENDERS, 0),
+    )
@@ -1,11 +1,17 @@
 from __future__ import annotations
+from collections.abc import Callable
 from enum import Enum
 from functools import reduce
 from operator import or_
+from typing import TYPE_CHECKING
 import attr
 from .errors import UserInputError
 from .util import comma_split
 
+if TYPE_CHECKING:
+    from .checker import WheelChecker
+    from .contents import WheelContents
+
 
 class Check(Enum):
     """
@@ -26,6 +32,100 @@ class Check(Enum):
     W102 = "Wheel library contains files not in package tree"
     W201 = "Wheel library is missing specified toplevel entry"
     W202 = "Wheel library has undeclared toplevel entry"
+    W301 = "Wheel contains files duplicated in another wheel"
+    W302 = "Wheel is missing modules present in other wheels of the same release"
+    W303 = "Wheel's Python source files differ from other wheels of the same release"
+    W401 = "Wheel contains files not listed in RECORD"
+    W402 = "RECORD lists files not present in wheel"
+    W403 = "File sizes in RECORD do not match wheel"
+    W501 = "Wheel library exceeds maximum size"
+    W502 = "Wheel contains file exceeding maximum size"
+    W503 = "Wheel library has toplevel entry exceeding maximum size"
+    W504 = "Wheel contains large uncompressed file"
+    W505 = "Wheel compression ratio is below minimum"
+
+
+class Needs(Enum):
+    """The kinds of data that checks can require"""
+
+    #: The toplevel entries of the wheel and its library sections
+    TOPLEVEL = "toplevel entries"
+    #: Every file in the wheel
+    ALL_FILES = "all files"
+    #: Every file in the wheel's purelib and platlib sections
+    LIBRARY_FILES = "library files"
+    #: The files in the wheel grouped by signature
+    SIGNATURES = "signatures"
+    #: The paths of the files in the expected package tree
+    PACKAGE_TREE = "package tree"
+    #: The entries of the wheel's ZIP central directory
+    ARCHIVE = "ZIP archive"
+    #: The hashes of the wheel's unhashed files whose sizes & CRC-32s
+    #: collide, which can only be computed by decompressing them while the
+    #: wheel is being read
+    MEMBER_HASHES = "hashes of colliding ZIP members"
+    #: The other wheels checked in the same run.  Checks with this need are
+    #: not run by `WheelChecker.check_contents()` but by
+    #: `~check_wheel_contents.runner.check_wheels()`.
+    OTHER_WHEELS = "other wheels"
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class CheckSpec:
+    """A description of the requirements & cost of a check"""
+
+    #: The check being described
+    check: Check | PluginCheck
+    #: The kinds of data that the check operates on
+    needs: frozenset[Needs]
+    #: A rough estimate of the check's relative cost
+    cost: int
+
+    def describe(self) -> str:
+        """Return a human-readable description of the spec"""
+        needs = ", ".join(sorted(n.value for n in self.needs))
+        return f"{self.check.name} (cost {self.cost}; needs {needs})"
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class PluginCheck:
+    """
+    A check provided by a third-party package.  Plugin checks are registered
+    as entry points in the ``check_wheel_contents.checks`` group whose names
+    are the checks' IDs and whose values are `PluginCheck` instances.
+
+    A plugin check is run in the same pass as the builtin checks, using the
+    `WheelContents` that has already been read from the wheel.
+    """
+
+    #: The check's ID, e.g., ``"X001"``.  This must equal the name of the entry
+    #: point.
+    name: str
+    #: The error message shown when the check fails
+    message: str
+    #: The function implementing the check.  It is called with the
+    #: `WheelChecker` and the `WheelContents` being checked, and it must
+    #: return a list of any & all failures as `FailedCheck` instances.
+    func: Callable[[WheelChecker, WheelContents], list[FailedCheck]]
+    #: The kinds of data that the check operates on
+    needs: frozenset[Needs] = frozenset({Needs.ALL_FILES})
+    #: A rough estimate of the check's cost relative to the builtin checks
+    #: (see `CHECK_SPECS`)
+    cost: int = 100
+
+    @property
+    def value(self) -> str:
+        """The error message, for symmetry with `Check`"""
+        return self.message
+
+    @property
+    def spec(self) -> CheckSpec:
+        """A `CheckSpec` describing the check"""
+        return CheckSpec(check=self, needs=self.needs, cost=self.cost)
+
+    def fail(self, args: list[str] | None = None) -> FailedCheck:
+        """Return a `FailedCheck` for this check with the given file paths"""
+        return FailedCheck(self, args if args is not None else [])
 
 
 @attr.s(auto_attribs=True)
@@ -33,24 +133,52 @@ class FailedCheck:
     """A check that has failed"""
 
     #: The check that failed
-    check: Check
+    check: Check | PluginCheck
     #: The relevant filepaths, if any
     args: list[str] = attr.Factory(list)
+    #: Short notes on the corresponding elements of ``args`` (e.g., their
+    #: sizes), or an empty list if there are none
+    details: list[str] = attr.Factory(list)
+    #: The number of further relevant filepaths that were left out of ``args``
+    omitted: int = 0
+    #: A short note on the failure as a whole (e.g., a measured value), if any
+    note: str | None = None
+
+    def describe(self) -> str:
+        """Return the check's error message followed by the note, if any"""
+        if self.note is not None:
+            return f"{self.check.value} ({self.note})"
+        else:
+            return self.check.value
+
+    def shown_args(self) -> list[str]:
+        """
+        Return strings showing the file paths (if any), each followed by its
+        detail in parentheses, followed by a count of any omitted paths
+        """
+        if self.details:
+            shown = [f"{a} ({d})" for a, d in zip(self.args, self.details)]
+        else:
+            shown = list(self.args)
+        if self.omitted:
+            shown.append(f"... and {self.omitted} more")
+        return shown
 
     def show(self, filename: str | None = None) -> str:
         """
-        Return a string showing the check name, error message, and file paths
-        (if any).  If ``filename`` is specified, it is taken to be the name of
-        the wheel that was being checked, and it is placed at the beginning of
-        the string.
+        Return a string showing the check name, error message, note (if any),
+        and file paths (if any).  If ``filename`` is specified, it is taken to
+        be the name of the wheel that was being checked, and it is placed at
+        the beginning of the string.
         """
         s = ""
         if filename is not None:
             s = f"{filename}: "
-        s += f"{self.check.name}: {self.check.value}"
-        if self.args:
+        s += f"{self.check.name}: {self.describe()}"
+        shown = self.shown_args()
+        if shown:
             s += ":"
-            for a in self.args:
+            for a in shown:
                 s += f"\n  {a}"
         return s
 
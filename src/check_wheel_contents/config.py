@@ -1,38 +1,33 @@
 from __future__ import annotations
 from collections.abc import Sequence
-from configparser import ConfigParser
 from pathlib import Path
-import sys
 from typing import Any
 from pydantic import BaseModel, Field, ValidationError, field_validator
-from .checks import Check, parse_check_prefix
+from .checks import Check, PluginCheck, parse_check_prefix
 from .errors import UserInputError
 from .filetree import Directory
-from .util import comma_split
+from .lightconfig import (
+    CONFIG_FILES,
+    CONFIG_SECTION,
+    TRAVERSAL_EXCLUSIONS,
+    find_config_section,
+    get_allowed_duplicates,
+    get_package_tree,
+    get_plugin_checks,
+    get_selected_checks,
+    read_config_section,
+)
+from .util import comma_split, parse_size
 
-if sys.version_info[:2] >= (3, 11):
-    from tomllib import load as toml_load
-else:
-    from tomli import load as toml_load
-
-#: The filenames that configuration is read from by default, in descending
-#: order of preference
-CONFIG_FILES = [
-    "pyproject.toml",
-    "tox.ini",
-    "setup.cfg",
-    "check-wheel-contents.cfg",
-    ".check-wheel-contents.cfg",
+# These were originally defined in this module, and are re-exported for
+# backwards compatibility:
+__all__ = [
+    "CONFIG_FILES",
+    "CONFIG_SECTION",
+    "TRAVERSAL_EXCLUSIONS",
+    "Configuration",
 ]
 
-#: The name of the configuration section from which the configuration is
-#: retrieved for most configuration formats
-CONFIG_SECTION = "check-wheel-contents"
-
-#: The default set of exclusion patterns for traversing ``--package`` and
-#: ``--src-dir`` directories
-TRAVERSAL_EXCLUSIONS = [".*", "CVS", "RCS", "*.pyc", "*.pyo", "*.egg-info"]
-
 
 class Configuration(BaseModel, populate_by_name=True):
     """A container for a `WheelChecker`'s raw configuration values"""
@@ -50,9 +45,35 @@ class Configuration(BaseModel, populate_by_name=True):
     #: The list of paths specified with ``--src-dir``, or `None` if not
     #: specified
     src_dirs: list[Path] | None = Field(None, alias="src_dir")
-    #: The set of exclusion patterns for traversing ``package_paths`` and
-    #: ``src_dirs``, or `None` if not specified
+    #: The path specified with ``--sdist``, or `None` if not specified
+    sdist: Path | None = None
+    #: Whether to traverse ``package_paths`` and ``src_dirs`` by listing the
+    #: files tracked by Git, or `None` if not specified
+    src_from_git: bool | None = None
+    #: The set of exclusion patterns for traversing ``package_paths``,
+    #: ``src_dirs``, and ``sdist``, or `None` if not specified
     package_omit: list[str] | None = None
+    #: The list of plugin check IDs & ID prefixes to enable, or `None` if not
+    #: specified
+    plugins: list[str] | None = None
+    #: The list of file hashes for which duplicates are allowed by W002 & W301,
+    #: or `None` if not specified
+    allow_duplicates: list[str] | None = None
+    #: The maximum total size in bytes of the wheel's library for W501, or
+    #: `None` if not specified
+    max_library_size: int | None = Field(None, ge=0)
+    #: The maximum size in bytes of a single file in the wheel for W502, or
+    #: `None` if not specified
+    max_file_size: int | None = Field(None, ge=0)
+    #: The maximum size in bytes of a toplevel library entry for W503, or `None`
+    #: if not specified
+    max_toplevel_size: int | None = Field(None, ge=0)
+    #: The maximum size in bytes of an uncompressed member of the wheel for
+    #: W504, or `None` if not specified
+    max_stored_size: int | None = Field(None, ge=0)
+    #: The minimum ratio of the wheel's uncompressed size to its compressed
+    #: size for W505, or `None` if not specified
+    min_compression_ratio: float | None = Field(None, gt=0)
 
     @field_validator("select", "ignore", mode="before")
     @classmethod
@@ -79,6 +100,8 @@ class Configuration(BaseModel, populate_by_name=True):
         "package_paths",
         "src_dirs",
         "package_omit",
+        "plugins",
+        "allow_duplicates",
         mode="before",
     )
     @classmethod
@@ -92,6 +115,24 @@ class Configuration(BaseModel, populate_by_name=True):
         else:
             return value
 
+    @field_validator(
+        "max_library_size",
+        "max_file_size",
+        "max_toplevel_size",
+        "max_stored_size",
+        mode="before",
+    )
+    @classmethod
+    def _convert_size(cls, value: Any) -> Any:
+        """
+        Convert strings to numbers of bytes with `parse_size()`.  Leave
+        everything else untouched.
+        """
+        if isinstance(value, str):
+            return parse_size(value)
+        else:
+            return value
+
     @field_validator("toplevel")
     @classmethod
     def _convert_toplevel(cls, value: list[str] | None) -> list[str] | None:
@@ -110,13 +151,22 @@ class Configuration(BaseModel, populate_by_name=True):
         toplevel: list[str] | None = None,
         package: tuple[str, ...] = (),
         src_dir: tuple[str, ...] = (),
+        sdist: str | None = None,
+        src_from_git: bool = False,
         package_omit: list[str] | None = None,
+        plugins: list[str] | None = None,
+        allow_duplicates: list[str] | None = None,
+        max_library_size: int | None = None,
+        max_file_size: int | None = None,
+        max_toplevel_size: int | None = None,
+        max_stored_size: int | None = None,
+        min_compression_ratio: float | None = None,
     ) -> Configuration:
         """
         Construct a `Configuration` instance from option values passed in on
         the command line.  If either ``package`` or ``src_dir`` is an empty
-        tuple (indicating that the corresponding option was not given on the
-        command line), it is replaced by `None`.
+        tuple or ``src_from_git`` is `False` (indicating that the corresponding
+        option was not given on the command line), it is replaced by `None`.
         """
         return cls(
             select=select,
@@ -124,7 +174,16 @@ class Configuration(BaseModel, populate_by_name=True):
             toplevel=toplevel,
             package_paths=package or None,
             src_dirs=src_dir or None,
+            sdist=sdist,
+            src_from_git=src_from_git or None,
             package_omit=package_omit,
+            plugins=plugins,
+            allow_duplicates=allow_duplicates,
+            max_library_size=max_library_size,
+            max_file_size=max_file_size,
+            max_toplevel_size=max_toplevel_size,
+            max_stored_size=max_stored_size,
+            min_compression_ratio=min_compression_ratio,
         )
 
     @classmethod
@@ -151,16 +210,11 @@ class Configuration(BaseModel, populate_by_name=True):
         Find the default configuration file and read the relevant section from
         it.  Returns `None` if no file with the appropriate section is found.
         """
-        cwd = Path()
-        for d in (cwd, *cwd.resolve().parents):
-            found = [d / cf for cf in CONFIG_FILES if (d / cf).exists()]
-            if found:
-                for p in found:
-                    cfg = cls.from_file(p)
-                    if cfg is not None:
-                        return cfg
-                return None
-        return None
+        found = find_config_section()
+        if found is None:
+            return None
+        else:
+            return cls.from_config_data(*found)
 
     @classmethod
     def from_file(cls, path: Path) -> Configuration | None:
@@ -168,46 +222,32 @@ class Configuration(BaseModel, populate_by_name=True):
         Read the relevant section from the given configuration file.  Returns
         `None` if the section does not exist.
         """
-        if path.suffix == ".toml":
-            with path.open("rb") as fb:
-                tdata = toml_load(fb)
-            tool = tdata.get("tool")
-            if not isinstance(tool, dict):
-                return None
-            cfg = tool.get(CONFIG_SECTION)
-            if cfg is None:
-                return None
-            else:
-                try:
-                    config = cls.model_validate(cfg)
-                    config.resolve_paths(path)
-                except (UserInputError, ValidationError) as e:
-                    raise UserInputError(f"{path}: {e}")
-                return config
+        data = read_config_section(path)
+        if data is None:
+            return None
         else:
-            cdata = ConfigParser()
-            with path.open(encoding="utf-8") as fp:
-                cdata.read_file(fp)
-            if path.name == "setup.cfg":
-                section = f"tool:{CONFIG_SECTION}"
-            else:
-                section = CONFIG_SECTION
-            if cdata.has_section(section):
-                try:
-                    config = cls.model_validate(cdata[section])
-                    config.resolve_paths(path)
-                except (UserInputError, ValidationError) as e:
-                    raise UserInputError(f"{path}: {e}")
-                return config
-            else:
-                return None
+            return cls.from_config_data(path, data)
+
+    @classmethod
+    def from_config_data(cls, path: Path, data: Any) -> Configuration:
+        """
+        Validate the raw contents ``data`` of the relevant section of the
+        configuration file at ``path`` and resolve the paths therein relative
+        to the file
+        """
+        try:
+            config = cls.model_validate(data)
+            config.resolve_paths(path)
+        except (UserInputError, ValidationError) as e:
+            raise UserInputError(f"{path}: {e}")
+        return config
 
     def resolve_paths(self, configpath: Path) -> None:
         """
-        Resolve the paths in ``package_paths`` and ``src_dirs`` relative to the
-        directory containing ``configpath``.  If a resulting path does not
-        exist (or, for ``src_dirs``, if it is not a directory), a
-        `UserInputError` is raised.
+        Resolve the paths in ``package_paths``, ``src_dirs``, and ``sdist``
+        relative to the directory containing ``configpath``.  If a resulting
+        path does not exist (or, for ``src_dirs``, if it is not a directory, or,
+        for ``sdist``, if it is not a file), a `UserInputError` is raised.
         """
         base = configpath.resolve().parent
         if self.package_paths is not None:
@@ -228,6 +268,11 @@ class Configuration(BaseModel, populate_by_name=True):
                     raise UserInputError(f"src_dir: not a directory: {str(q)!r}")
                 src_dirs.append(q)
             self.src_dirs = src_dirs
+        if self.sdist is not None:
+            q = base / self.sdist
+            if not q.is_file():
+                raise UserInputError(f"sdist: not a file: {str(q)!r}")
+            self.sdist = q
 
     def update(self, cfg: Configuration) -> None:
         """
@@ -243,52 +288,38 @@ class Configuration(BaseModel, populate_by_name=True):
         ``ignore`` options.  This equals the set ``select`` (defaulting to all
         checks if `None`) minus the checks in ``ignore`` (if any).
         """
-        if self.select is None:
-            selected = set(Check)
-        else:
-            selected = self.select.copy()
-        if self.ignore is not None:
-            selected -= self.ignore
-        return selected
+        return get_selected_checks(self.select, self.ignore)
 
     def get_package_tree(self) -> Directory | None:
         """
         Return the combined file tree obtained by traversing all of the paths
-        in ``package_paths`` and ``src_dirs``.  If both fields are `None`,
-        return `None`.
+        in ``package_paths`` and ``src_dirs`` and reading the member list of
+        ``sdist``.  If all three fields are `None`, return `None`.
 
-        :raises UserInputError: if any two subtrees share a toplevel name
+        :raises UserInputError: if any two subtrees share a toplevel name or the
+            sdist cannot be read
         """
-        if self.package_paths is None and self.src_dirs is None:
-            return None
-        if self.package_omit is None:
-            exclude = TRAVERSAL_EXCLUSIONS
-        else:
-            exclude = self.package_omit
-        tree = Directory()
-        for p in self.package_paths or []:
-            subtree = Directory.from_local_tree(p, exclude=exclude)
-            ### TODO: Move the below logic to Directory?
-            for name, entry in subtree.entries.items():
-                if name in tree:
-                    raise UserInputError(
-                        f"`--package {p}` adds {name!r} to file tree, but it is"
-                        f" already present from prior --package option"
-                    )
-                tree.entries[name] = entry
-        for p in self.src_dirs or []:
-            subtree = Directory.from_local_tree(
-                p,
-                exclude=exclude,
-                include_root=False,
-            )
-            ### TODO: Move the below logic to Directory?
-            for name, entry in subtree.entries.items():
-                if name in tree:
-                    raise UserInputError(
-                        f"`--src-dir {p}` adds {name!r} to file tree, but it is"
-                        f" already present from prior --package or --src-dir"
-                        f" option"
-                    )
-                tree.entries[name] = entry
-        return tree
+        return get_package_tree(
+            self.package_paths,
+            self.src_dirs,
+            self.package_omit,
+            sdist=self.sdist,
+            toplevel=self.toplevel,
+            src_from_git=self.src_from_git,
+        )
+
+    def get_plugin_checks(self) -> list[PluginCheck]:
+        """
+        Load & return the plugin checks selected by ``plugins``
+
+        :raises UserInputError: if a plugin check cannot be loaded
+        """
+        return get_plugin_checks(self.plugins)
+
+    def get_allowed_duplicates(self) -> frozenset[str]:
+        """
+        Return the set of file hashes given by ``allow_duplicates``
+
+        :raises UserInputError: if a hash is not of the form ``{alg}={digest}``
+        """
+        return get_allowed_duplicates(self.allow_duplicates)
@@ -1,21 +1,169 @@
 from __future__ import annotations
 from collections import defaultdict
 from collections.abc import Iterable
+from contextlib import nullcontext
 import csv
 from functools import cached_property
-from io import TextIOWrapper
+from io import StringIO, TextIOWrapper
 import os
+from pathlib import Path
 import re
-from typing import TextIO
-from zipfile import ZipFile
+from typing import IO, TextIO
+from zipfile import BadZipFile, ZipFile
+import zlib
 import attr
 from wheel_filename import WheelFilename
 from .errors import WheelValidationError
 from .filetree import Directory, File
-from .util import find_wheel_dirs, is_data_dir, is_dist_info_dir
+from .util import (
+    INVALID_PATH_LINE_RGX,
+    find_wheel_dirs,
+    is_data_dir,
+    is_dist_info_dir,
+    stream_digest,
+)
+from .zipstream import ZipMember, read_zip_stream
 
 ROOT_IS_PURELIB_RGX = re.compile(r"Root-Is-Purelib\s*:\s*(.*?)\s*", flags=re.I)
 
+#: A regex matching the paths in the :file:`RECORD` of an installed
+#: distribution of files installed outside of the library directory
+INSTALLED_OUTSIDE_RGX = re.compile(r"^(?:/|\.\./)")
+
+#: A regex matching the paths of bytecode files in :file:`__pycache__`
+#: directories.  Installers list the bytecode that they generate in
+#: :file:`RECORD` without hashes.
+PYCACHE_RGX = re.compile(r"(?:^|/)__pycache__/[^/]*\.pyc$")
+
+#: The accepted values for the ``zip_listing`` arguments of
+#: `WheelContents.from_wheel()` & `WheelContents.from_stream()`, which control
+#: when a wheel's file tree is read from the ZIP central directory instead of
+#: from its :file:`RECORD`: never, only when there is no :file:`RECORD`, or
+#: always
+ZIP_LISTING_MODES = ("never", "fallback", "always")
+
+#: A regex matching the line terminators recognized by `csv`, captured so that
+#: they can be restored when a line has to be handed to `csv`
+LINE_SEP_RGX = re.compile(r"(\r\n|\r|\n)")
+
+
+def split_record(text: str) -> list[list[str]]:
+    """
+    Split the contents of a :file:`RECORD` file into rows of fields, with the
+    same results as `csv.reader`.  As paths in :file:`RECORD` files only need
+    to be quoted if they contain commas or double quotes, the text is split
+    into lines & fields in bulk with `str.split()`; only lines containing
+    double quotes (along with any following lines that belong to the same
+    quoted field) are passed to `csv`.
+    """
+    if '"' not in text:
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        if lines[-1] == "":
+            # The file ends with a line terminator (or is empty).
+            lines.pop()
+        return [ln.split(",") if ln else [] for ln in lines]
+    parts = LINE_SEP_RGX.split(text)
+    lines = parts[0::2]
+    seps = parts[1::2]
+    if lines[-1] == "":
+        lines.pop()
+    rows: list[list[str]] = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if '"' not in line:
+            rows.append(line.split(",") if line else [])
+            i += 1
+        else:
+            # A quoted field may contain line terminators, so keep adding
+            # lines until the quotes are balanced:
+            j = i + 1
+            quotes = line.count('"')
+            while quotes % 2 and j < len(lines):
+                quotes += lines[j].count('"')
+                j += 1
+            chunk = [
+                ln + (seps[k] if k < len(seps) else "")
+                for k, ln in enumerate(lines[i:j], start=i)
+            ]
+            rows.extend(csv.reader(chunk, delimiter=",", quotechar='"'))
+            i = j
+    return rows
+
+
+def read_root_is_purelib(lines: Iterable[str]) -> bool:
+    """
+    Return the value of the :mailheader:`Root-Is-Purelib` field in the given
+    lines of a :file:`WHEEL` file
+
+    :raises WheelValidationError: if the field is missing or invalid
+    """
+    for line in lines:
+        m = ROOT_IS_PURELIB_RGX.fullmatch(line)
+        if m:
+            rip = m.group(1)
+            if rip.lower() == "true":
+                return True
+            elif rip.lower() == "false":
+                return False
+            else:
+                raise WheelValidationError(
+                    f"Invalid Root-Is-Purelib value in WHEEL file: {rip!r}"
+                )
+    raise WheelValidationError("Root-Is-Purelib header not found in WHEEL file")
+
+
+def is_wheel_metadata(name: str) -> bool:
+    """
+    Test whether ``name`` is the path of a :file:`WHEEL` or :file:`RECORD`
+    file in a ``.dist-info`` directory at the root of a wheel
+    """
+    top, _, rest = name.partition("/")
+    return rest in ("WHEEL", "RECORD") and is_dist_info_dir(top)
+
+
+def is_installed_extra(row: list[str]) -> bool:
+    """
+    Returns `True` iff ``row`` is a row from the :file:`RECORD` of an installed
+    distribution for a file that did not come from the wheel, i.e., a file
+    installed outside of the library directory or bytecode generated by the
+    installer
+    """
+    return bool(
+        INSTALLED_OUTSIDE_RGX.search(row[0])
+        or (PYCACHE_RGX.search(row[0]) and (len(row) < 2 or not row[1]))
+    )
+
+
+def use_record(has_record: bool, zip_listing: str) -> bool:
+    """
+    Decide whether a wheel's file tree should be read from its :file:`RECORD`
+    (returning `True`) or from its ZIP central directory (returning `False`)
+    based on whether it has a :file:`RECORD` and on the ``zip_listing`` mode
+    (one of `ZIP_LISTING_MODES`)
+
+    :raises WheelValidationError: if the wheel has no :file:`RECORD` and
+        ``zip_listing`` is ``"never"``
+    """
+    if zip_listing == "always":
+        return False
+    elif has_record:
+        return True
+    elif zip_listing == "fallback":
+        return False
+    else:
+        raise WheelValidationError("No RECORD file in wheel")
+
+
+def signature_index() -> defaultdict[tuple[int | None, str | None], list[File]]:
+    """
+    Return an empty mapping from file signatures to lists of files.  This is a
+    module-level function rather than a lambda so that it can be pickled.
+    """
+    return defaultdict(list)
+
 
 @attr.s(auto_attribs=True)
 class WheelContents:
@@ -31,105 +179,235 @@ class WheelContents:
     #: A mapping from ``File.signature`` values to lists of the `File` objects
     #: with those values
     by_signature: defaultdict[tuple[int | None, str | None], list[File]] = attr.ib(
-        factory=lambda: defaultdict(list)
+        factory=signature_index
     )
     #: The wheel's file tree
     filetree: Directory = attr.ib(factory=Directory)
+    #: The entries of the wheel's ZIP central directory, in archive order, or
+    #: `None` if the contents were not read from a ZIP archive (e.g., when
+    #: read from an installed distribution)
+    archive: list[ZipMember] | None = attr.ib(default=None)
 
-    @cached_property
+    @property
     def purelib_tree(self) -> Directory:
         """
         The subtree of the wheel's file tree corresponding to the purelib
         section.  The returned `Directory`'s ``path`` is `None` if
         ``root_is_purelib`` is true; otherwise, the ``path`` is
         ``{self.data_dir}/purelib/``.
+
+        In the former case, the `Directory` is a live view of the wheel's
+        toplevel entries minus the ``.dist-info`` and ``.data`` directories,
+        so it always reflects the current contents of ``filetree``.
         """
         if self.root_is_purelib:
-            return Directory(
-                path=None,
-                entries={
-                    k: v
-                    for k, v in self.filetree.entries.items()
-                    if k not in (self.dist_info_dir, self.data_dir)
-                },
-            )
+            return self._library_root()
         else:
-            try:
-                purelib = self.filetree[self.data_dir]["purelib"]  # type: ignore
-            except (KeyError, TypeError):
-                return Directory(f"{self.data_dir}/purelib/")
-            else:
-                assert isinstance(purelib, Directory)
-                return purelib
+            return self._data_subdir("purelib")
 
-    @cached_property
+    @property
     def platlib_tree(self) -> Directory:
         """
         The subtree of the wheel's file tree corresponding to the platlib
         section.  The returned `Directory`'s ``path`` is `None` if
         ``root_is_purelib`` is false; otherwise, the ``path`` is
         ``{self.data_dir}/platlib/``.
+
+        In the former case, the `Directory` is a live view of the wheel's
+        toplevel entries minus the ``.dist-info`` and ``.data`` directories,
+        so it always reflects the current contents of ``filetree``.
         """
         if not self.root_is_purelib:
-            return Directory(
-                path=None,
-                entries={
-                    k: v
-                    for k, v in self.filetree.entries.items()
-                    if k not in (self.dist_info_dir, self.data_dir)
-                },
-            )
+            return self._library_root()
         else:
-            try:
-                platlib = self.filetree[self.data_dir]["platlib"]  # type: ignore
-            except (KeyError, TypeError):
-                return Directory(f"{self.data_dir}/platlib/")
-            else:
-                assert isinstance(platlib, Directory)
-                return platlib
+            return self._data_subdir("platlib")
+
+    def _library_root(self) -> Directory:
+        return Directory.view(self.filetree, (self.dist_info_dir, self.data_dir))
+
+    def _data_subdir(self, name: str) -> Directory:
+        try:
+            subdir = self.filetree[self.data_dir][name]  # type: ignore[index]
+        except (KeyError, TypeError):
+            return Directory(f"{self.data_dir}/{name}/")
+        else:
+            assert isinstance(subdir, Directory)
+            return subdir
+
+    @cached_property
+    def library_files(self) -> list[File]:
+        """
+        A list of all files in the purelib section followed by all files in
+        the platlib section
+        """
+        return [*self.purelib_tree.all_files(), *self.platlib_tree.all_files()]
+
+    @cached_property
+    def files_by_path(self) -> dict[str, File]:
+        """A mapping from the paths of all files in the wheel to their `File`\\s"""
+        return {f.path: f for f in self.filetree.all_files()}
 
     @classmethod
-    def from_wheel(cls, path: str | os.PathLike) -> WheelContents:
-        """Construct a `WheelContents` from the wheel at the given path"""
+    def from_wheel(
+        cls,
+        path: str | os.PathLike,
+        fileobj: IO[bytes] | None = None,
+        zip_listing: str = "never",
+        hash_collisions: bool = True,
+    ) -> WheelContents:
+        """
+        Construct a `WheelContents` from the wheel at the given path.  If
+        ``fileobj`` is given, the wheel is read from that seekable binary file
+        instead, and ``path`` is only used for the wheel's filename.
+
+        If ``zip_listing`` is ``"always"`` (or is ``"fallback"`` and the wheel
+        has no :file:`RECORD`), the file tree is built from the names & sizes
+        in the ZIP central directory instead of from the :file:`RECORD`,
+        without decompressing any members other than :file:`WHEEL`.  The
+        files in such a tree have no hashes.
+
+        If ``hash_collisions`` is true, files without hashes whose
+        uncompressed sizes & CRC-32s are shared with other such files are
+        decompressed & hashed so that W002 can compare them; see
+        `hash_crc_duplicates()`.
+        """
         whlname = WheelFilename.parse(path)
-        with open(path, "rb") as fp, ZipFile(fp) as zf:
+        with (
+            open(path, "rb") if fileobj is None else nullcontext(fileobj) as fp,
+            ZipFile(fp) as zf,
+        ):
+            namelist = zf.namelist()
             dist_info_dir, data_dir = find_wheel_dirs(
-                zf.namelist(),
+                namelist,
                 whlname.project,
                 whlname.version,
             )
             if data_dir is None:
                 data_dir = f"{whlname.project}-{whlname.version}.data"
-            wc = cls(dist_info_dir=dist_info_dir, data_dir=data_dir)
+            wc = cls(
+                dist_info_dir=dist_info_dir,
+                data_dir=data_dir,
+                archive=[
+                    ZipMember(
+                        name=zi.filename,
+                        size=zi.file_size,
+                        crc=zi.CRC,
+                        compress_size=zi.compress_size,
+                        compress_type=zi.compress_type,
+                    )
+                    for zi in zf.infolist()
+                ],
+            )
             try:
                 wheel_info = zf.getinfo(f"{dist_info_dir}/WHEEL")
             except KeyError:
                 raise WheelValidationError("No WHEEL file in wheel")
             with zf.open(wheel_info) as wf:
-                for line in TextIOWrapper(wf, "utf-8"):
-                    m = ROOT_IS_PURELIB_RGX.fullmatch(line)
-                    if m:
-                        rip = m.group(1)
-                        if rip.lower() == "true":
-                            wc.root_is_purelib = True
-                        elif rip.lower() == "false":
-                            wc.root_is_purelib = False
-                        else:
-                            raise WheelValidationError(
-                                f"Invalid Root-Is-Purelib value in WHEEL"
-                                f" file: {rip!r}"
-                            )
-                        break
-                else:
-                    raise WheelValidationError(
-                        "Root-Is-Purelib header not found in WHEEL file"
-                    )
-            try:
-                record_info = zf.getinfo(f"{dist_info_dir}/RECORD")
-            except KeyError:
-                raise WheelValidationError("No RECORD file in wheel")
-            with zf.open(record_info) as rf:
-                wc.add_record_file(TextIOWrapper(rf, "utf-8", newline=""))
+                wc.root_is_purelib = read_root_is_purelib(TextIOWrapper(wf, "utf-8"))
+            record_path = f"{dist_info_dir}/RECORD"
+            if use_record(record_path in namelist, zip_listing):
+                wc.add_record_text(zf.read(record_path).decode("utf-8"))
+            else:
+                assert wc.archive is not None
+                wc.add_zip_members(wc.archive)
+            if hash_collisions:
+                wc.hash_crc_duplicates(zf)
+        wc.validate_tree()
+        return wc
+
+    @classmethod
+    def from_stream(
+        cls,
+        fp: IO[bytes],
+        filename: str | os.PathLike | None = None,
+        zip_listing: str = "never",
+    ) -> WheelContents:
+        """
+        Construct a `WheelContents` from a wheel read sequentially from the
+        binary stream ``fp``, which need not be seekable (e.g., standard
+        input).  Only the :file:`WHEEL` & :file:`RECORD` files are kept in
+        memory; all other members are discarded as they are read.
+
+        If ``filename`` is given, the wheel's project & version are taken from
+        it as for `from_wheel()`; otherwise, they are taken from the name of
+        the wheel's ``.dist-info`` directory.
+
+        ``zip_listing`` has the same meaning as for `from_wheel()`.  As the
+        members' contents are no longer available once the central directory
+        has been read, files without hashes are not hashed; W002 compares them
+        by size & CRC-32 alone.
+        """
+        members, kept = read_zip_stream(fp, is_wheel_metadata)
+        namelist = [m.name for m in members]
+        if filename is not None:
+            whlname = WheelFilename.parse(filename)
+            project, version = whlname.project, whlname.version
+        else:
+            dist_info_dirs = {
+                top for n in namelist if is_dist_info_dir(top := n.split("/")[0])
+            }
+            if len(dist_info_dirs) == 1:
+                project, _, version = dist_info_dirs.pop()[
+                    : -len(".dist-info")
+                ].partition("-")
+            else:
+                # Let find_wheel_dirs() report the missing or extra
+                # directories:
+                project = version = ""
+        dist_info_dir, data_dir = find_wheel_dirs(namelist, project, version)
+        if data_dir is None:
+            data_dir = f"{project}-{version}.data"
+        wc = cls(dist_info_dir=dist_info_dir, data_dir=data_dir, archive=members)
+        try:
+            wheel_data = kept[f"{dist_info_dir}/WHEEL"]
+        except KeyError:
+            raise WheelValidationError("No WHEEL file in wheel")
+        wc.root_is_purelib = read_root_is_purelib(StringIO(wheel_data.decode("utf-8")))
+        record_data = kept.get(f"{dist_info_dir}/RECORD")
+        if use_record(record_data is not None, zip_listing):
+            assert record_data is not None
+            wc.add_record_text(record_data.decode("utf-8"))
+        else:
+            wc.add_zip_members(members)
+        wc.validate_tree()
+        return wc
+
+    @classmethod
+    def from_dist_info(cls, path: str | os.PathLike) -> WheelContents:
+        """
+        Construct a `WheelContents` from the :file:`WHEEL` & :file:`RECORD`
+        files in the ``*.dist-info`` directory at the given path, which may
+        belong to either an installed distribution (e.g., in a
+        :file:`site-packages` directory) or an unpacked wheel.  The paths in
+        the :file:`RECORD` are taken to be relative to the directory
+        containing ``path``.
+
+        Entries for files that were installed outside of that directory (e.g.,
+        scripts) are skipped, as are entries without hashes for bytecode files
+        in :file:`__pycache__` directories, which is how installers list the
+        bytecode that they generate.  Bytecode listed with a hash came from
+        the wheel itself.
+        """
+        path = Path(path)
+        dist_info_dir = path.name
+        if not is_dist_info_dir(dist_info_dir):
+            raise WheelValidationError(f"Not a .dist-info directory: {dist_info_dir!r}")
+        wc = cls(
+            dist_info_dir=dist_info_dir,
+            data_dir=dist_info_dir[: -len(".dist-info")] + ".data",
+        )
+        try:
+            with (path / "WHEEL").open(encoding="utf-8") as fp:
+                wc.root_is_purelib = read_root_is_purelib(fp)
+        except FileNotFoundError:
+            raise WheelValidationError("No WHEEL file in .dist-info directory")
+        try:
+            text = (path / "RECORD").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise WheelValidationError("No RECORD file in .dist-info directory")
+        wc.add_record_rows(
+            row for row in split_record(text) if not (row and is_installed_extra(row))
+        )
         wc.validate_tree()
         return wc
 
@@ -138,35 +416,103 @@ class WheelContents:
         Add the files & directories described by the given :file:`RECORD` file
         to the `WheelContents`
         """
-        self.add_record_rows(csv.reader(fp, delimiter=",", quotechar='"'))
+        self.add_record_text(fp.read())
+
+    def add_record_text(self, text: str) -> None:
+        """
+        Add the files & directories described by the given contents of a
+        :file:`RECORD` file to the `WheelContents`
+        """
+        self.add_record_rows(split_record(text))
 
     def add_record_rows(self, rows: Iterable[list[str]]) -> None:
         """
         Add the files & directories described by the rows of fields read from a
         wheel's :file:`RECORD` file to the `WheelContents`
+
+        The paths in the rows are validated all at once with a single regex
+        search; only if that finds a problem are they validated row by row in
+        order to report the first invalid row.
         """
+        rows = list(rows)
+        check_path = bool(
+            INVALID_PATH_LINE_RGX.search("\n".join(row[0] for row in rows if row))
+        )
         for row in rows:
             entry: File | Directory
             if row and row[0].endswith("/"):
                 entry = Directory(row[0])
             else:
-                entry = File.from_record_row(row)
-            self.add_entry(entry)
+                entry = File.from_record_row(row, check_path=check_path)
+            self._add_entry(entry)
+        self._clear_caches()
+
+    def add_zip_members(self, members: Iterable[ZipMember]) -> None:
+        """
+        Add the files & directories listed in a wheel's ZIP central directory
+        to the `WheelContents`.  The files are given the members' uncompressed
+        sizes and no hashes.
+        """
+        self.add_record_rows(
+            [m.name] if m.name.endswith("/") else [m.name, "", str(m.size)]
+            for m in members
+        )
+
+    def crc_duplicates(self) -> list[list[tuple[File, ZipMember]]]:
+        """
+        Group the files in the wheel that have no hashes along with their
+        entries in ``archive`` by the entries' uncompressed sizes & CRC-32s,
+        and return the groups with more than one file, each in file tree order.
+        Returns an empty list if ``archive`` is `None`.
+        """
+        if self.archive is None:
+            return []
+        members = {m.name: m for m in self.archive}
+        groups: defaultdict[tuple[int, int], list[tuple[File, ZipMember]]] = (
+            defaultdict(list)
+        )
+        for f in self.filetree.all_files():
+            if f.hashsum is None and (m := members.get(f.path)) is not None:
+                groups[(m.size, m.crc)].append((f, m))
+        return [g for g in groups.values() if len(g) > 1]
+
+    def hash_crc_duplicates(self, zf: ZipFile) -> None:
+        """
+        Decompress & hash the members of ``zf`` in the groups returned by
+        `crc_duplicates()`, setting the ``digest`` of their entries in
+        ``archive``.  Only files whose sizes & CRC-32s collide are read, so
+        this costs nothing for wheels whose :file:`RECORD`\\s have hashes.
+        """
+        digests: dict[str, str] = {}
+        for group in self.crc_duplicates():
+            for _, m in group:
+                try:
+                    with zf.open(m.name) as fp:
+                        digests[m.name] = stream_digest(fp)
+                except (BadZipFile, zlib.error) as e:
+                    raise WheelValidationError(f"Could not read {m.name!r}: {e}")
+        if digests:
+            assert self.archive is not None
+            self.archive = [
+                attr.evolve(m, digest=digests[m.name]) if m.name in digests else m
+                for m in self.archive
+            ]
 
     def add_entry(self, entry: File | Directory) -> None:
         """Add a `File` or `Directory` to the `WheelContents`' file tree"""
+        self._add_entry(entry)
+        self._clear_caches()
+
+    def _add_entry(self, entry: File | Directory) -> None:
+        # Add an entry without invalidating the cached properties, so that
+        # bulk insertions only have to invalidate them once at the end
         self.filetree.add_entry(entry)
         if isinstance(entry, File):
             self.by_signature[entry.signature].append(entry)
-        # Invalidate cached properties:
-        try:
-            del self.purelib_tree
-        except AttributeError:
-            pass
-        try:
-            del self.platlib_tree
-        except AttributeError:
-            pass
+
+    def _clear_caches(self) -> None:
+        self.__dict__.pop("library_files", None)
+        self.__dict__.pop("files_by_path", None)
 
     def validate_tree(self) -> None:
         """
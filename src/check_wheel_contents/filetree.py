@@ -1,18 +1,31 @@
 from __future__ import annotations
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, MutableMapping
 import errno
-from keyword import iskeyword
+from functools import cached_property
 import os
-from os.path import splitext
 from pathlib import Path
 import attr
 from .errors import WheelValidationError
-from .util import is_data_dir, is_dist_info_dir, pymodule_basename, validate_path
+from .util import (
+    BYTECODE_SUFFIXES,
+    INVALID_PATH_RGX,
+    classify_basename,
+    is_data_dir,
+    is_dist_info_dir,
+    is_module_name,
+    validate_path,
+)
 
 
 @attr.s(auto_attribs=True, frozen=True)
 class File:
-    """Representation of a file in a file tree"""
+    """
+    Representation of a file in a file tree
+
+    The classifications of the file's path (``libparts``, ``libpath``,
+    ``extension``, and whether it has a module extension) are computed on
+    first access and then cached on the instance.
+    """
 
     #: The components of the file's path within the file tree
     parts: tuple[str, ...]
@@ -23,10 +36,11 @@ class File:
     hashsum: str | None
 
     @classmethod
-    def from_record_row(cls, row: list[str]) -> File:
+    def from_record_row(cls, row: list[str], check_path: bool = True) -> File:
         """
         Construct a `File` object from a row of fields in a wheel's
-        :file:`RECORD` file
+        :file:`RECORD` file.  If ``check_path`` is false, the path is assumed
+        to have already been validated.
         """
         try:
             path, hashsum, size_str = row
@@ -39,7 +53,8 @@ class File:
             raise ValueError(
                 f"Invalid file path passed to File.from_record_row(): {path!r}"
             )
-        validate_path(path)
+        if check_path and INVALID_PATH_RGX.search(path):
+            validate_path(path)
         return cls(
             parts=tuple(path.split("/")),
             size=size,
@@ -62,7 +77,7 @@ class File:
         """A tuple of the file's ``size`` and ``hashsum`` fields"""
         return (self.size, self.hashsum)
 
-    @property
+    @cached_property
     def libparts(self) -> tuple[str, ...] | None:
         """
         The path components of the file relative to the root of the purelib or
@@ -79,7 +94,7 @@ class File:
         else:
             return self.parts
 
-    @property
+    @cached_property
     def libpath(self) -> str | None:
         """
         The file's path relative to the root of the purelib or platlib folder,
@@ -92,17 +107,31 @@ class File:
         else:
             return None
 
+    @cached_property
+    def _classification(self) -> tuple[str, str | None]:
+        # The file's extension and its basename minus any Python module
+        # extension
+        return classify_basename(self.parts[-1])
+
     @property
     def extension(self) -> str:
         """The file's filename extension"""
-        return splitext(self.parts[-1])[1]
+        return self._classification[0]
 
     def has_module_ext(self) -> bool:
         """
         Returns `True` iff the file has a file extension indicating it is a
         Python module (either source or binary extension)
         """
-        return pymodule_basename(self.parts[-1]) is not None
+        return self._classification[1] is not None
+
+    @property
+    def module_basename(self) -> str | None:
+        """
+        The file's basename with its Python module extension removed, or
+        `None` if the file does not have a Python module extension
+        """
+        return self._classification[1]
 
     def is_valid_module_path(self) -> bool:
         """
@@ -113,11 +142,87 @@ class File:
         """
         if self.libparts is None:
             return False
-        *pkgs, basename = self.libparts
-        base = pymodule_basename(basename)
+        base = self.module_basename
         if base is None:
             return False
-        return all(p.isidentifier() and not iskeyword(p) for p in (*pkgs, base))
+        return all(map(is_module_name, self.libparts[:-1])) and is_module_name(base)
+
+
+@attr.s(auto_attribs=True)
+class TreeStats:
+    """Aggregate statistics about the files in a file tree"""
+
+    #: The number of files
+    files: int = 0
+    #: The number of files with Python module extensions
+    modules: int = 0
+    #: The number of Python bytecode (``*.pyc`` and ``*.pyo``) files
+    bytecode: int = 0
+    #: The total size of all files with known sizes
+    size: int = 0
+    #: The size of the largest file with a known size
+    largest: int = 0
+
+    def add_file(self, f: File) -> None:
+        """Update the statistics to include the file ``f``"""
+        self.files += 1
+        if f.has_module_ext():
+            self.modules += 1
+        elif f.extension in BYTECODE_SUFFIXES:
+            self.bytecode += 1
+        if f.size is not None:
+            self.size += f.size
+            self.largest = max(self.largest, f.size)
+
+    def add_stats(self, other: TreeStats) -> None:
+        """Update the statistics to include those of another tree"""
+        self.files += other.files
+        self.modules += other.modules
+        self.bytecode += other.bytecode
+        self.size += other.size
+        self.largest = max(self.largest, other.largest)
+
+
+@attr.s(auto_attribs=True, eq=False, repr=False)
+class EntriesView(MutableMapping[str, "File | Directory"]):
+    """
+    A live view of a mapping of directory entries that hides the entries with
+    certain names.  Changes to the underlying mapping are immediately visible
+    through the view, and entries added through the view are added to the
+    underlying mapping.
+    """
+
+    #: The underlying mapping
+    entries: MutableMapping[str, File | Directory]
+    #: The names of the entries to hide
+    exclude: frozenset[str]
+
+    def __getitem__(self, key: str) -> File | Directory:
+        if key in self.exclude:
+            raise KeyError(key)
+        return self.entries[key]
+
+    def __setitem__(self, key: str, value: File | Directory) -> None:
+        if key in self.exclude:
+            raise ValueError(f"Cannot add excluded entry {key!r} through view")
+        self.entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.exclude:
+            raise KeyError(key)
+        del self.entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key not in self.exclude and key in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k in self.entries if k not in self.exclude)
+
+    def __len__(self) -> int:
+        return len(self.entries) - sum(1 for k in self.exclude if k in self.entries)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 @attr.s(auto_attribs=True)
@@ -129,7 +234,14 @@ class Directory:
     #: this directory is the root of the tree
     path: str | None = attr.ib(default=None)
     #: Entries in the directory, as a mapping from basenames to entries
-    entries: dict[str, File | Directory] = attr.Factory(dict)
+    entries: MutableMapping[str, File | Directory] = attr.Factory(dict)
+    _stats: TreeStats = attr.ib(factory=TreeStats, init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        # The statistics of a view are computed on access, so there's nothing
+        # to store for them here:
+        if self.entries and not isinstance(self.entries, EntriesView):
+            self.update_stats()
 
     @path.validator
     def _validate_path(self, _attribute: attr.Attribute, value: str | None) -> None:
@@ -169,10 +281,59 @@ class Directory:
         ### TODO: Cache this?
         return {k: v for k, v in self.entries.items() if isinstance(v, File)}
 
+    @property
+    def stats(self) -> TreeStats:
+        """
+        Aggregate statistics about all of the files in the file tree rooted at
+        the directory.
+
+        The statistics are updated incrementally by `add_entry()`, which
+        updates every directory between the one it is called on and the new
+        entry.  If ``entries`` is modified by other means, `update_stats()`
+        must be called afterwards on the modified directory and its ancestors.
+        For a `view()`, the statistics are recomputed from its entries on each
+        access, so they are always up to date.
+        """
+        if isinstance(self.entries, EntriesView):
+            stats = TreeStats()
+            self._add_entry_stats(stats)
+            return stats
+        return self._stats
+
+    def update_stats(self, recursive: bool = False) -> None:
+        """
+        Recompute ``stats`` from the directory's entries.  If ``recursive`` is
+        false, the statistics of the subdirectories are assumed to be up to
+        date; otherwise, they are recomputed as well.
+        """
+        if recursive:
+            for sd in self.subdirectories.values():
+                sd.update_stats(recursive=True)
+        self._stats = TreeStats()
+        self._add_entry_stats(self._stats)
+
+    def _add_entry_stats(self, stats: TreeStats) -> None:
+        for e in self.entries.values():
+            if isinstance(e, Directory):
+                stats.add_stats(e.stats)
+            else:
+                stats.add_file(e)
+
     def __bool__(self) -> bool:
         """A `Directory` is true iff it is nonempty."""
         return bool(self.entries)
 
+    @classmethod
+    def view(cls, root: Directory, exclude: Iterable[str]) -> Directory:
+        """
+        Return a `Directory` with the same ``path`` as ``root`` whose entries
+        are a live view of ``root``'s entries minus those whose names are in
+        ``exclude``
+        """
+        return cls(
+            path=root.path, entries=EntriesView(root.entries, frozenset(exclude))
+        )
+
     def __getitem__(self, value: str) -> File | Directory:
         """Retrieve an entry from the directory by basename"""
         return self.entries[value]
@@ -199,21 +360,24 @@ class Directory:
                 f"Path {entry.path!r} is not a descendant of {self.path!r}"
             )
         current: Directory = self
+        path_dirs = [self]
         *dirs, basename = parts[len(myparts) :]
         for i, p in enumerate(dirs):
-            this_path = "/".join(dirs[: i + 1])
-            if p in current.entries:
-                q = current.entries[p]
-                if isinstance(q, Directory):
-                    current = q
-                else:
-                    raise WheelValidationError(
-                        f"Conflicting occurrences of path {this_path!r}"
-                    )
+            q = current.entries.get(p)
+            if isinstance(q, Directory):
+                current = q
+                path_dirs.append(q)
+            elif q is not None:
+                this_path = "/".join(dirs[: i + 1])
+                raise WheelValidationError(
+                    f"Conflicting occurrences of path {this_path!r}"
+                )
             else:
+                this_path = "/".join(dirs[: i + 1])
                 sd = Directory(this_path + "/")
                 current.entries[p] = sd
                 current = sd
+                path_dirs.append(sd)
         if basename in current.entries:
             if not (
                 isinstance(entry, Directory)
@@ -224,6 +388,37 @@ class Directory:
                 )
         else:
             current.entries[basename] = entry
+            if isinstance(entry, File):
+                for d in path_dirs:
+                    d._stats.add_file(entry)
+
+    def module_files(self) -> Iterator[tuple[File, bool]]:
+        """
+        Return a generator of ``(file, importable)`` pairs for all `File`
+        objects in the file tree rooted at the directory that have Python
+        module extensions, in the same order as `all_files()`.  ``importable``
+        is true iff the names of all of the file's ancestor directories below
+        this directory and the file's basename (minus the module extension) are
+        valid module names.
+
+        The validity of each directory's name is checked only once, no matter
+        how many files it contains.
+        """
+        stack: list[tuple[Iterator[tuple[str, File | Directory]], bool]] = [
+            (iter(self.entries.items()), True)
+        ]
+        while stack:
+            entries, valid = stack[-1]
+            for name, e in entries:
+                if isinstance(e, Directory):
+                    stack.append(
+                        (iter(e.entries.items()), valid and is_module_name(name))
+                    )
+                    break
+                elif (base := e.module_basename) is not None:
+                    yield (e, valid and is_module_name(base))
+            else:
+                stack.pop()
 
     def all_files(self) -> Iterator[File]:
         """
@@ -302,6 +497,9 @@ class Directory:
                             d.add_entry(File(parts, None, None))
 
             add_tree(d1, root)
+            # add_tree() adds entries to each subdirectory directly, so the
+            # statistics of the directories above them need recomputing:
+            dir_root.update_stats(recursive=True)
         else:
             dir_root.add_entry(File((root.name,), None, None))
         return dir_root
@@ -0,0 +1,91 @@
+"""
+Building the expected package tree from the files tracked by Git
+
+Instead of walking the filesystem, which visits untracked build artifacts and
+relies on exclusion patterns to prune them, the tree is constructed from the
+output of a single :command:`git ls-files` invocation per path.
+"""
+
+from __future__ import annotations
+import errno
+import os
+from pathlib import Path
+import subprocess
+from .errors import UserInputError
+from .filetree import Directory, File
+
+
+def git_ls_files(dirpath: Path, *pathspecs: str) -> list[str]:
+    """
+    Return the paths, relative to ``dirpath``, of the files tracked by Git
+    within ``dirpath`` (or, if given, matching ``pathspecs``)
+
+    :raises UserInputError: if Git is not installed or ``dirpath`` is not in a
+        Git repository
+    """
+    try:
+        r = subprocess.run(
+            ["git", "ls-files", "-z", "--", *(pathspecs or ["."])],
+            cwd=dirpath,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except FileNotFoundError:
+        raise UserInputError("--src-from-git: git command not found")
+    except subprocess.CalledProcessError as e:
+        msg = os.fsdecode(e.stderr).strip()
+        raise UserInputError(f"{dirpath}: could not list files tracked by git: {msg}")
+    # Paths with merge conflicts are listed once per stage:
+    return list(dict.fromkeys(os.fsdecode(p) for p in r.stdout.split(b"\0") if p))
+
+
+def git_tree(
+    root: Path,
+    exclude: list[str] | None = None,
+    include_root: bool = True,
+) -> Directory:
+    """
+    Construct a file tree mirroring the files tracked by Git at ``root``.  The
+    arguments and return value are the same as for
+    `Directory.from_local_tree()`, and the result is the same, except that
+    untracked files and directories containing no tracked files are omitted.
+
+    :raises FileNotFoundError: if ``root`` does not exist
+    :raises UserInputError: if Git is not installed or ``root`` is not in a Git
+        repository
+    """
+    if exclude is None:
+        exclude = []
+    if not root.exists():
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(root))
+    root = root.resolve()
+    tree = Directory()
+    if not root.is_dir():
+        if git_ls_files(root.parent, root.name):
+            tree.add_entry(File((root.name,), None, None))
+        return tree
+    prefix = (root.name,) if include_root else ()
+    # A cache of whether each directory (by its path relative to ``root``) is
+    # excluded, so that each directory is matched against the patterns only
+    # once:
+    excluded: dict[tuple[str, ...], bool] = {(): False}
+
+    def is_excluded(parts: tuple[str, ...]) -> bool:
+        try:
+            return excluded[parts]
+        except KeyError:
+            p = root.joinpath(*parts)
+            result = is_excluded(parts[:-1]) or any(p.match(e) for e in exclude)
+            excluded[parts] = result
+            return result
+
+    if include_root:
+        tree.add_entry(Directory(root.name + "/"))
+    for path in git_ls_files(root):
+        parts = tuple(path.split("/"))
+        if not is_excluded(parts[:-1]) and not any(
+            root.joinpath(*parts).match(e) for e in exclude
+        ):
+            tree.add_entry(File(prefix + parts, None, None))
+    return tree
@@ -0,0 +1,194 @@
+"""
+Indices over the contents of all of the wheels checked in a single run
+
+Some mistakes can only be seen by comparing wheels with each other, e.g., a
+file vendored into one project's wheel that is also shipped by another
+project built at the same time.  Rather than comparing every pair of wheels,
+the contents of each wheel are added to an index as the wheel is checked, and
+the wheel is compared against the index in a single pass over its files.
+
+`DuplicateIndex` compares each wheel against the wheels checked before it as
+the run progresses.  `ReleaseIndex` compares the wheels for the same release
+(project & version) with each other, which requires all of the wheels to have
+been added first.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import os
+import attr
+from packaging.utils import canonicalize_name, canonicalize_version
+from .checks import Check, FailedCheck
+from .contents import WheelContents
+
+#: The type of the ``(size, hashsum)`` signatures of files
+Signature = tuple[int | None, str | None]
+
+
+def project_name(contents: WheelContents) -> str:
+    """
+    Return the normalized name of the project that a wheel belongs to, as
+    determined from the name of its ``.dist-info`` directory
+    """
+    return canonicalize_name(contents.dist_info_dir.partition("-")[0])
+
+
+def release_key(contents: WheelContents) -> tuple[str, str]:
+    """
+    Return the normalized project name & version of the release that a wheel
+    belongs to, as determined from the name of its ``.dist-info`` directory.
+    Unlike the wheel's filename, this is also available for installed
+    distributions & unpacked wheels.
+    """
+    name, _, version = contents.dist_info_dir[: -len(".dist-info")].partition("-")
+    return (canonicalize_name(name), canonicalize_version(version.replace("_", "-")))
+
+
+@attr.s(auto_attribs=True)
+class DuplicateIndex:
+    """
+    An index of the signatures of the library files in all of the wheels seen
+    so far, used by check W301 to detect files that are duplicated between
+    wheels for different projects
+
+    Only exact duplicates (files with the same size & hash) are detected.  For
+    each signature, only the first file with that signature from each project
+    is recorded, so the index grows with the number of distinct files rather
+    than with the number of wheels.
+    """
+
+    #: A predicate for signatures that are allowed to be duplicated (usually
+    #: `WheelChecker.is_allowed_duplicate()`)
+    allowed: Callable[[Signature], bool]
+    #: A mapping from signatures to mappings from project names to the wheel
+    #: & path of the first file seen with that signature in that project
+    signatures: dict[Signature, dict[str, tuple[str, str]]] = attr.Factory(dict)
+
+    def add(self, wheel: str, contents: WheelContents) -> list[FailedCheck]:
+        """
+        Add the library files of the wheel at ``wheel`` to the index and return
+        a W301 failure for each signature shared with a library file from a
+        wheel for a different project that was added earlier.  The arguments
+        of each failure are the paths of the files in the wheel followed by
+        the files in the other wheels in ``{wheel}:{path}`` form.
+        """
+        project = project_name(contents)
+        failures = []
+        for sig, files in contents.by_signature.items():
+            if self.allowed(sig):
+                continue
+            paths = [f.path for f in files if f.libparts is not None]
+            if not paths:
+                continue
+            seen = self.signatures.setdefault(sig, {})
+            others = [f"{w}:{p}" for proj, (w, p) in seen.items() if proj != project]
+            if others:
+                failures.append(FailedCheck(Check.W301, paths + others))
+            seen.setdefault(project, (wheel, paths[0]))
+        return failures
+
+
+@attr.s(auto_attribs=True)
+class ReleaseGroup:
+    """
+    The index of the library modules & Python source files in the wheels for
+    a single release of a project
+    """
+
+    #: The wheels in the group, as passed to `ReleaseIndex.add()`
+    wheels: list[str] = attr.Factory(list)
+    #: A mapping from module names (the module's path relative to the library
+    #: root, minus any Python module extension) to a pair of the path of the
+    #: first file seen for that module and the set of indices into ``wheels``
+    #: of the wheels that contain the module
+    modules: dict[str, tuple[str, set[int]]] = attr.Factory(dict)
+    #: A mapping from the library paths of ``*.py`` files to mappings from
+    #: signatures to mappings from the indices into ``wheels`` of the wheels
+    #: containing the file with that signature to the file's full path
+    sources: dict[str, dict[Signature, dict[int, str]]] = attr.Factory(dict)
+
+    def add(self, wheel: str, contents: WheelContents) -> int:
+        """
+        Add the library files of a wheel to the group and return the wheel's
+        index into ``wheels``
+        """
+        i = len(self.wheels)
+        self.wheels.append(wheel)
+        for tree in (contents.purelib_tree, contents.platlib_tree):
+            for f, _ in tree.module_files():
+                assert f.libparts is not None and f.module_basename is not None
+                modname = "/".join((*f.libparts[:-1], f.module_basename))
+                self.modules.setdefault(modname, (f.path, set()))[1].add(i)
+                if f.extension == ".py":
+                    assert f.libpath is not None
+                    sigs = self.sources.setdefault(f.libpath, {})
+                    sigs.setdefault(f.signature, {})[i] = f.path
+        return i
+
+    def missing_modules(self, i: int) -> list[str]:
+        """
+        Return the paths of the modules in other wheels in the group that are
+        missing from wheel ``i``
+        """
+        return [path for path, present in self.modules.values() if i not in present]
+
+    def differing_sources(self, i: int) -> list[str]:
+        """
+        Return the paths of the ``*.py`` files in wheel ``i`` whose contents
+        differ from those of the same files in the majority of the other wheels
+        in the group (ties being broken in favor of the wheel added first)
+        """
+        paths = []
+        for sigs in self.sources.values():
+            if len(sigs) > 1:
+                common = max(sigs.values(), key=len)
+                if i not in common:
+                    for present in sigs.values():
+                        if i in present:
+                            paths.append(present[i])
+        return paths
+
+
+@attr.s(auto_attribs=True)
+class ReleaseIndex:
+    """
+    An index of the wheels checked in a run grouped by project & version, used
+    by checks W302 & W303 to compare the wheels for the same release (e.g.,
+    the wheels for different platforms built from the same source) with each
+    other.  Each wheel is added with `add()` as it is read, and once all of the
+    wheels have been added, the failures for each wheel are computed from the
+    index with `check()`, without comparing any pair of wheels directly.
+    """
+
+    #: The checks to perform (a subset of W302 & W303)
+    checks: frozenset[Check]
+    #: A mapping from normalized ``(project, version)`` pairs to the groups of
+    #: wheels for those releases
+    groups: dict[tuple[str, str], ReleaseGroup] = attr.Factory(dict)
+    #: A mapping from wheels passed to `add()` to their groups & indices
+    #: within those groups
+    positions: dict[str, tuple[ReleaseGroup, int]] = attr.Factory(dict)
+
+    def add(self, wheel: str | os.PathLike[str], contents: WheelContents) -> None:
+        """
+        Add the wheel at ``wheel`` with the given contents to the index.  The
+        wheel's project & version are taken from its ``.dist-info`` directory.
+        """
+        group = self.groups.setdefault(release_key(contents), ReleaseGroup())
+        self.positions[str(wheel)] = (group, group.add(str(wheel), contents))
+
+    def check(self, wheel: str | os.PathLike[str]) -> list[FailedCheck]:
+        """
+        Return the W302 & W303 failures for a wheel previously passed to
+        `add()`.  A wheel that was never added has no failures.
+        """
+        try:
+            group, i = self.positions[str(wheel)]
+        except KeyError:
+            return []
+        failures = []
+        if Check.W302 in self.checks and (missing := group.missing_modules(i)):
+            failures.append(FailedCheck(Check.W302, missing))
+        if Check.W303 in self.checks and (differing := group.differing_sources(i)):
+            failures.append(FailedCheck(Check.W303, differing))
+        return failures
@@ -0,0 +1,578 @@
+"""
+Lightweight configuration handling that does not depend on pydantic
+
+Reading a configuration file requires validating arbitrary user-supplied data,
+which is done by the pydantic-based `~check_wheel_contents.config.Configuration`
+class.  When no configuration file section needs to be validated (e.g., when
+``--no-config`` is given or no configuration file is found), the values passed
+on the command line are already of the correct types, and so they are instead
+stored in a `LightConfiguration`, which avoids the cost of importing pydantic.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Sequence
+from configparser import ConfigParser
+import os
+from pathlib import Path
+import re
+import sys
+from typing import Any, cast
+import attr
+from .checks import Check, PluginCheck, parse_check_prefix
+from .errors import UserInputError
+from .filetree import Directory
+from .util import comma_split, parse_size
+
+if sys.version_info[:2] >= (3, 11):
+    from tomllib import load as toml_load
+else:
+    from tomli import load as toml_load
+
+#: The filenames that configuration is read from by default, in descending
+#: order of preference
+CONFIG_FILES = [
+    "pyproject.toml",
+    "tox.ini",
+    "setup.cfg",
+    "check-wheel-contents.cfg",
+    ".check-wheel-contents.cfg",
+]
+
+#: The name of the configuration section from which the configuration is
+#: retrieved for most configuration formats
+CONFIG_SECTION = "check-wheel-contents"
+
+#: A regex matching the ``{alg}={digest}`` form of hashes used in
+#: :file:`RECORD` files
+HASH_RGX = re.compile(r"[A-Za-z0-9_]+=[-_A-Za-z0-9]+")
+
+#: The default set of exclusion patterns for traversing ``--package`` and
+#: ``--src-dir`` directories
+TRAVERSAL_EXCLUSIONS = [".*", "CVS", "RCS", "*.pyc", "*.pyo", "*.egg-info"]
+
+
+def read_config_section(path: Path) -> Any:
+    """
+    Read the raw, unvalidated contents of the relevant section from the given
+    configuration file.  Returns `None` if the section does not exist.
+    """
+    if path.suffix == ".toml":
+        with path.open("rb") as fb:
+            tdata = toml_load(fb)
+        tool = tdata.get("tool")
+        if not isinstance(tool, dict):
+            return None
+        return tool.get(CONFIG_SECTION)
+    else:
+        cdata = ConfigParser()
+        with path.open(encoding="utf-8") as fp:
+            cdata.read_file(fp)
+        if path.name == "setup.cfg":
+            section = f"tool:{CONFIG_SECTION}"
+        else:
+            section = CONFIG_SECTION
+        if cdata.has_section(section):
+            return cdata[section]
+        else:
+            return None
+
+
+def find_config_section() -> tuple[Path, Any] | None:
+    """
+    Find the default configuration file and read the raw contents of the
+    relevant section from it.  Returns a pair of the file's path and the
+    section contents, or `None` if no file with the appropriate section is
+    found.
+    """
+    cwd = Path()
+    for d in (cwd, *cwd.resolve().parents):
+        found = [d / cf for cf in CONFIG_FILES if (d / cf).exists()]
+        if found:
+            for p in found:
+                data = read_config_section(p)
+                if data is not None:
+                    return (p, data)
+            return None
+    return None
+
+
+def load_config_section(configpath: str | None) -> tuple[Path, Any] | None:
+    """
+    Read the raw contents of the relevant section from the configuration file
+    at ``configpath`` or, if it is `None`, from the default configuration
+    file.  Returns a pair of the file's path and the section contents, or
+    `None` if there is no section to validate.
+    """
+    if configpath is None:
+        return find_config_section()
+    path = Path(configpath)
+    data = read_config_section(path)
+    if data is None:
+        return None
+    else:
+        return (path, data)
+
+
+def get_selected_checks(
+    select: set[Check] | None, ignore: set[Check] | None
+) -> set[Check]:
+    """
+    Return the final set of selected checks according to the ``select`` and
+    ``ignore`` options.  This equals the set ``select`` (defaulting to all
+    checks if `None`) minus the checks in ``ignore`` (if any).
+    """
+    if select is None:
+        selected = set(Check)
+    else:
+        selected = select.copy()
+    if ignore is not None:
+        selected -= ignore
+    return selected
+
+
+def get_package_tree(
+    package_paths: list[Path] | None,
+    src_dirs: list[Path] | None,
+    package_omit: list[str] | None,
+    sdist: Path | None = None,
+    toplevel: list[str] | None = None,
+    src_from_git: bool | None = None,
+) -> Directory | None:
+    """
+    Return the combined file tree obtained by traversing all of the paths in
+    ``package_paths`` and ``src_dirs`` and reading the member list of the
+    ``sdist`` archive (restricted to the names in ``toplevel``, if given).  If
+    all of ``package_paths``, ``src_dirs``, and ``sdist`` are `None`, return
+    `None`.
+
+    If ``src_from_git`` is true, ``package_paths`` and ``src_dirs`` are
+    traversed by listing the files tracked by Git in them rather than by
+    walking the filesystem.
+
+    :raises UserInputError: if any two subtrees share a toplevel name or the
+        sdist cannot be read
+    """
+    if package_paths is None and src_dirs is None and sdist is None:
+        return None
+    if package_omit is None:
+        exclude = TRAVERSAL_EXCLUSIONS
+    else:
+        exclude = package_omit
+    from_local_tree: Callable[..., Directory]
+    if src_from_git:
+        from .gittree import git_tree
+
+        from_local_tree = git_tree
+    else:
+        from_local_tree = Directory.from_local_tree
+    tree = Directory()
+    for p in package_paths or []:
+        subtree = from_local_tree(p, exclude=exclude)
+        ### TODO: Move the below logic to Directory?
+        for name, entry in subtree.entries.items():
+            if name in tree:
+                raise UserInputError(
+                    f"`--package {p}` adds {name!r} to file tree, but it is"
+                    f" already present from prior --package option"
+                )
+            tree.entries[name] = entry
+    for p in src_dirs or []:
+        subtree = from_local_tree(p, exclude=exclude, include_root=False)
+        ### TODO: Move the below logic to Directory?
+        for name, entry in subtree.entries.items():
+            if name in tree:
+                raise UserInputError(
+                    f"`--src-dir {p}` adds {name!r} to file tree, but it is"
+                    f" already present from prior --package or --src-dir"
+                    f" option"
+                )
+            tree.entries[name] = entry
+    if sdist is not None:
+        from .sdist import sdist_tree
+
+        subtree = sdist_tree(sdist, exclude=exclude, toplevel=toplevel)
+        for name, entry in subtree.entries.items():
+            if name in tree:
+                raise UserInputError(
+                    f"`--sdist {sdist}` adds {name!r} to file tree, but it is"
+                    f" already present from prior --package or --src-dir"
+                    f" option"
+                )
+            tree.entries[name] = entry
+    tree.update_stats()
+    return tree
+
+
+def get_plugin_checks(plugins: list[str] | None) -> list[PluginCheck]:
+    """
+    Load & return the plugin checks whose IDs match the prefixes in
+    ``plugins``.  The entry point machinery is only imported if ``plugins`` is
+    nonempty.
+
+    :raises UserInputError: if a plugin check cannot be loaded
+    """
+    if not plugins:
+        return []
+    from .plugins import load_plugins
+
+    return load_plugins(plugins)
+
+
+def get_allowed_duplicates(hashes: list[str] | None) -> frozenset[str]:
+    """
+    Validate & return the set of file hashes given by ``allow_duplicates``
+
+    :raises UserInputError: if a hash is not of the form ``{alg}={digest}``
+    """
+    if not hashes:
+        return frozenset()
+    for h in hashes:
+        if HASH_RGX.fullmatch(h) is None:
+            raise UserInputError(
+                f"allow_duplicates: invalid hash (expected ALG=DIGEST): {h!r}"
+            )
+    return frozenset(hashes)
+
+
+def _pydantic_convert(field: str, value: Any) -> Any:
+    """
+    Convert a value for ``field`` that the converters below do not handle by
+    validating it with `~check_wheel_contents.config.Configuration` instead,
+    importing pydantic only now.  Unusual inputs are thus accepted or rejected
+    exactly as by `~check_wheel_contents.config.Configuration`, with the same
+    `~pydantic.ValidationError` messages.
+    """
+    from .config import Configuration
+
+    return getattr(Configuration.model_validate({field: value}), field)
+
+
+def _convert_comma_list(value: Any, field: str) -> list[Any] | None:
+    """
+    Convert strings to lists by splitting on commas and other sequences to
+    lists.  `None` is passed through unchanged.
+    """
+    if value is None:
+        return None
+    elif isinstance(value, str):
+        return comma_split(value)
+    elif isinstance(value, (Sequence, set, frozenset)):
+        return list(value)
+    else:
+        return cast("list[Any] | None", _pydantic_convert(field, value))
+
+
+def _convert_check_set(value: Any, field: str) -> set[Check] | None:
+    """
+    Convert the input to a `set` with any strings converted from check names &
+    check name prefixes to `Check` objects
+    """
+    if value is None:
+        return None
+    elif isinstance(value, (set, frozenset)):
+        if all(isinstance(c, Check) for c in value):
+            return set(value)
+    elif isinstance(value, (str, Sequence)):
+        values = comma_split(value) if isinstance(value, str) else value
+        if all(isinstance(c, (Check, str)) for c in values):
+            try:
+                return set().union(
+                    *(
+                        {c} if isinstance(c, Check) else parse_check_prefix(c)
+                        for c in values
+                    )
+                )
+            except UserInputError:
+                pass
+    return cast("set[Check] | None", _pydantic_convert(field, value))
+
+
+def _convert_str_list(value: Any, field: str) -> list[str] | None:
+    values = _convert_comma_list(value, field)
+    if values is not None and not all(isinstance(v, str) for v in values):
+        return cast("list[str] | None", _pydantic_convert(field, value))
+    return values
+
+
+def _convert_path_list(value: Any, field: str) -> list[Path] | None:
+    values = _convert_comma_list(value, field)
+    if values is None:
+        return None
+    elif all(isinstance(v, (str, os.PathLike)) for v in values):
+        return [Path(v) for v in values]
+    else:
+        return cast("list[Path] | None", _pydantic_convert(field, value))
+
+
+def _convert_size(value: Any, field: str) -> int | None:
+    """
+    Convert a size given as either a nonnegative integer number of bytes or a
+    string accepted by `parse_size()` to an integer number of bytes.  `None` is
+    passed through unchanged.
+    """
+    if value is None:
+        return None
+    elif isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    elif isinstance(value, str):
+        try:
+            return parse_size(value)
+        except UserInputError:
+            pass
+    return cast("int | None", _pydantic_convert(field, value))
+
+
+def _convert_ratio(value: Any, field: str) -> float | None:
+    """
+    Convert a positive number or a string representation thereof to a `float`.
+    `None` is passed through unchanged.
+    """
+    if value is None:
+        return None
+    elif isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            ratio = float(value)
+        except ValueError:
+            pass
+        else:
+            if ratio > 0:
+                return ratio
+    return cast("float | None", _pydantic_convert(field, value))
+
+
+def _convert_select(value: Any) -> set[Check] | None:
+    return _convert_check_set(value, "select")
+
+
+def _convert_ignore(value: Any) -> set[Check] | None:
+    return _convert_check_set(value, "ignore")
+
+
+def _convert_toplevel(value: Any) -> list[str] | None:
+    """
+    Strip trailing forward slashes from the elements of a list, if defined
+    """
+    toplevel = _convert_str_list(value, "toplevel")
+    if toplevel is not None:
+        toplevel = [tl.rstrip("/") for tl in toplevel]
+    return toplevel
+
+
+def _convert_package_paths(value: Any) -> list[Path] | None:
+    return _convert_path_list(value, "package_paths")
+
+
+def _convert_src_dirs(value: Any) -> list[Path] | None:
+    return _convert_path_list(value, "src_dirs")
+
+
+def _convert_sdist(value: Any) -> Path | None:
+    if value is None:
+        return None
+    elif isinstance(value, (str, os.PathLike)):
+        return Path(value)
+    else:
+        return cast("Path | None", _pydantic_convert("sdist", value))
+
+
+def _convert_src_from_git(value: Any) -> bool | None:
+    if value is None or isinstance(value, bool):
+        return value
+    else:
+        return cast("bool | None", _pydantic_convert("src_from_git", value))
+
+
+def _convert_package_omit(value: Any) -> list[str] | None:
+    return _convert_str_list(value, "package_omit")
+
+
+def _convert_plugins(value: Any) -> list[str] | None:
+    return _convert_str_list(value, "plugins")
+
+
+def _convert_allow_duplicates(value: Any) -> list[str] | None:
+    return _convert_str_list(value, "allow_duplicates")
+
+
+def _convert_max_library_size(value: Any) -> int | None:
+    return _convert_size(value, "max_library_size")
+
+
+def _convert_max_file_size(value: Any) -> int | None:
+    return _convert_size(value, "max_file_size")
+
+
+def _convert_max_toplevel_size(value: Any) -> int | None:
+    return _convert_size(value, "max_toplevel_size")
+
+
+def _convert_max_stored_size(value: Any) -> int | None:
+    return _convert_size(value, "max_stored_size")
+
+
+def _convert_min_compression_ratio(value: Any) -> float | None:
+    return _convert_ratio(value, "min_compression_ratio")
+
+
+@attr.s(auto_attribs=True, slots=True)
+class LightConfiguration:
+    """
+    A container for a `WheelChecker`'s raw configuration values, with the same
+    fields and conversion rules as
+    `~check_wheel_contents.config.Configuration`, but implemented without
+    pydantic.  Values that the lightweight converters do not handle (including
+    all invalid values) are passed to pydantic, so that errors are identical.
+    """
+
+    #: The set of selected checks, or `None` if not specified
+    select: set[Check] | None = attr.ib(default=None, converter=_convert_select)
+    #: The set of ignored checks, or `None` if not specified
+    ignore: set[Check] | None = attr.ib(default=None, converter=_convert_ignore)
+    #: The list of toplevel names to check for with the W2 checks, or `None` if
+    #: not specified
+    toplevel: list[str] | None = attr.ib(default=None, converter=_convert_toplevel)
+    #: The list of paths specified with ``--package``, or `None` if not
+    #: specified
+    package_paths: list[Path] | None = attr.ib(
+        default=None, converter=_convert_package_paths
+    )
+    #: The list of paths specified with ``--src-dir``, or `None` if not
+    #: specified
+    src_dirs: list[Path] | None = attr.ib(default=None, converter=_convert_src_dirs)
+    #: The path specified with ``--sdist``, or `None` if not specified
+    sdist: Path | None = attr.ib(default=None, converter=_convert_sdist)
+    #: Whether to traverse ``package_paths`` and ``src_dirs`` by listing the
+    #: files tracked by Git, or `None` if not specified
+    src_from_git: bool | None = attr.ib(default=None, converter=_convert_src_from_git)
+    #: The set of exclusion patterns for traversing ``package_paths``,
+    #: ``src_dirs``, and ``sdist``, or `None` if not specified
+    package_omit: list[str] | None = attr.ib(
+        default=None, converter=_convert_package_omit
+    )
+    #: The list of plugin check IDs & ID prefixes to enable, or `None` if not
+    #: specified
+    plugins: list[str] | None = attr.ib(default=None, converter=_convert_plugins)
+    #: The list of file hashes for which duplicates are allowed by W002 & W301,
+    #: or `None` if not specified
+    allow_duplicates: list[str] | None = attr.ib(
+        default=None, converter=_convert_allow_duplicates
+    )
+    #: The maximum total size in bytes of the wheel's library for W501, or
+    #: `None` if not specified
+    max_library_size: int | None = attr.ib(
+        default=None, converter=_convert_max_library_size
+    )
+    #: The maximum size in bytes of a single file in the wheel for W502, or
+    #: `None` if not specified
+    max_file_size: int | None = attr.ib(default=None, converter=_convert_max_file_size)
+    #: The maximum size in bytes of a toplevel library entry for W503, or `None`
+    #: if not specified
+    max_toplevel_size: int | None = attr.ib(
+        default=None, converter=_convert_max_toplevel_size
+    )
+    #: The maximum size in bytes of an uncompressed member of the wheel for
+    #: W504, or `None` if not specified
+    max_stored_size: int | None = attr.ib(
+        default=None, converter=_convert_max_stored_size
+    )
+    #: The minimum ratio of the wheel's uncompressed size to its compressed
+    #: size for W505, or `None` if not specified
+    min_compression_ratio: float | None = attr.ib(
+        default=None, converter=_convert_min_compression_ratio
+    )
+
+    @classmethod
+    def from_command_options(
+        cls,
+        select: set[Check] | None = None,
+        ignore: set[Check] | None = None,
+        toplevel: list[str] | None = None,
+        package: tuple[str, ...] = (),
+        src_dir: tuple[str, ...] = (),
+        sdist: str | None = None,
+        src_from_git: bool = False,
+        package_omit: list[str] | None = None,
+        plugins: list[str] | None = None,
+        allow_duplicates: list[str] | None = None,
+        max_library_size: int | None = None,
+        max_file_size: int | None = None,
+        max_toplevel_size: int | None = None,
+        max_stored_size: int | None = None,
+        min_compression_ratio: float | None = None,
+    ) -> LightConfiguration:
+        """
+        Construct a `LightConfiguration` instance from option values passed in
+        on the command line.  If either ``package`` or ``src_dir`` is an empty
+        tuple or ``src_from_git`` is `False` (indicating that the corresponding
+        option was not given on the command line), it is replaced by `None`.
+        """
+        return cls(
+            select=select,
+            ignore=ignore,
+            toplevel=toplevel,
+            package_paths=package or None,
+            src_dirs=src_dir or None,
+            sdist=sdist,
+            src_from_git=src_from_git or None,
+            package_omit=package_omit,
+            plugins=plugins,
+            allow_duplicates=allow_duplicates,
+            max_library_size=max_library_size,
+            max_file_size=max_file_size,
+            max_toplevel_size=max_toplevel_size,
+            max_stored_size=max_stored_size,
+            min_compression_ratio=min_compression_ratio,
+        )
+
+    def update(self, cfg: Any) -> None:
+        """
+        Update this `LightConfiguration` instance by copying over all
+        non-`None` fields from ``cfg``, which may be either a
+        `LightConfiguration` or a `~check_wheel_contents.config.Configuration`
+        """
+        for field in attr.fields(LightConfiguration):
+            value = getattr(cfg, field.name)
+            if value is not None:
+                setattr(self, field.name, value)
+
+    def get_selected_checks(self) -> set[Check]:
+        """
+        Return the final set of selected checks according to the ``select`` and
+        ``ignore`` options.  This equals the set ``select`` (defaulting to all
+        checks if `None`) minus the checks in ``ignore`` (if any).
+        """
+        return get_selected_checks(self.select, self.ignore)
+
+    def get_package_tree(self) -> Directory | None:
+        """
+        Return the combined file tree obtained by traversing all of the paths
+        in ``package_paths`` and ``src_dirs`` and reading the member list of
+        ``sdist``.  If all three fields are `None`, return `None`.
+
+        :raises UserInputError: if any two subtrees share a toplevel name or the
+            sdist cannot be read
+        """
+        return get_package_tree(
+            self.package_paths,
+            self.src_dirs,
+            self.package_omit,
+            sdist=self.sdist,
+            toplevel=self.toplevel,
+            src_from_git=self.src_from_git,
+        )
+
+    def get_plugin_checks(self) -> list[PluginCheck]:
+        """
+        Load & return the plugin checks selected by ``plugins``
+
+        :raises UserInputError: if a plugin check cannot be loaded
+        """
+        return get_plugin_checks(self.plugins)
+
+    def get_allowed_duplicates(self) -> frozenset[str]:
+        """
+        Return the set of file hashes given by ``allow_duplicates``
+
+        :raises UserInputError: if a hash is not of the form ``{alg}={digest}``
+        """
+        return get_allowed_duplicates(self.allow_duplicates)
@@ -0,0 +1,57 @@
+"""
+Loading of third-party checks registered as entry points
+
+A package can provide additional checks by registering `PluginCheck` instances
+as entry points in the ``check_wheel_contents.checks`` group, e.g.:
+
+.. code:: toml
+
+    [project.entry-points."check_wheel_contents.checks"]
+    X001 = "mypackage.checks:license_check"
+
+Plugin checks are only enabled when selected with ``--plugins`` (or the
+``plugins`` configuration option), and only the entry points for selected
+checks are imported.  Enabled plugin checks are run by `WheelChecker` in the
+same pass over a wheel's `WheelContents` as the builtin checks.
+"""
+
+from __future__ import annotations
+from importlib.metadata import entry_points
+from .checks import Check, PluginCheck
+from .errors import UserInputError
+
+#: The entry point group in which plugin checks are registered
+ENTRY_POINT_GROUP = "check_wheel_contents.checks"
+
+
+def load_plugins(prefixes: list[str]) -> list[PluginCheck]:
+    """
+    Load the plugin checks whose IDs start with any of the given prefixes and
+    return them sorted by ID.  Entry points for checks that do not match any
+    prefix are not loaded.
+
+    :raises UserInputError:
+        if a prefix does not match any installed plugin check, if a plugin
+        check has the same ID as a builtin check, or if an entry point does not
+        refer to a `PluginCheck` with the same ID as the entry point's name
+    """
+    eps = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    wanted = set()
+    for pre in prefixes:
+        matches = {name for name in eps if name.startswith(pre)}
+        if not matches:
+            raise UserInputError(f"Unknown/invalid plugin check prefix: {pre!r}")
+        wanted |= matches
+    plugins = []
+    for name in sorted(wanted):
+        if name in Check.__members__:
+            raise UserInputError(f"Plugin check {name} conflicts with builtin check")
+        ep = eps[name]
+        check = ep.load()
+        if not isinstance(check, PluginCheck) or check.name != name:
+            raise UserInputError(
+                f"Entry point {name} = {ep.value!r} is not a plugin check"
+                f" named {name}"
+            )
+        plugins.append(check)
+    return plugins
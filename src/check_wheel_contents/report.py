@@ -0,0 +1,224 @@
+"""
+Output formats for the results of checking wheels
+
+Each `Reporter` is handed a `WheelReport` as soon as a wheel has been checked
+and immediately writes out the corresponding record, so that results can be
+consumed incrementally even in very large runs.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import json
+from typing import Any
+import attr
+from . import __url__, __version__
+from .checks import Check, FailedCheck, PluginCheck
+
+#: The type of the callbacks used to emit output.  The callback is called with
+#: a line of text and a `bool` indicating whether the text should go to stderr
+#: (`True`) or stdout (`False`).
+Echo = Callable[[str, bool], None]
+
+#: The version of the SARIF format emitted by `SARIFReporter`
+SARIF_VERSION = "2.1.0"
+
+#: The schema URI for the SARIF format emitted by `SARIFReporter`
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+@attr.s(auto_attribs=True)
+class WheelReport:
+    """The outcome of checking a single wheel"""
+
+    #: The path to the wheel, as given by the user
+    wheel: str
+    #: The failed checks, or `None` if the wheel could not be checked
+    failures: list[FailedCheck] | None = None
+    #: A description of why the wheel could not be checked, if it could not
+    error: str | None = None
+    #: The number of seconds spent reading & checking the wheel
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the wheel was checked and passed all of the checks"""
+        return self.error is None and not self.failures
+
+    def as_json(self) -> dict[str, Any]:
+        """Return a JSONable representation of the report"""
+        return {
+            "wheel": self.wheel,
+            "ok": self.ok,
+            "error": self.error,
+            "failures": [
+                {
+                    "check": f.check.name,
+                    "message": f.check.value,
+                    "paths": f.args,
+                    "details": f.details,
+                    "omitted": f.omitted,
+                    "note": f.note,
+                }
+                for f in self.failures or []
+            ],
+            "elapsed": self.elapsed,
+        }
+
+
+@attr.s(auto_attribs=True)
+class Reporter:
+    """Base class for output formats"""
+
+    #: The callback to pass lines of output to
+    echo: Echo
+    #: The plugin checks enabled for the run, for formats that describe the
+    #: checks up front
+    plugins: list[PluginCheck] = attr.Factory(list)
+
+    def start(self) -> None:
+        """Called before any wheels are reported"""
+        pass
+
+    def report(self, result: WheelReport) -> None:
+        """Output the result of checking a single wheel"""
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        """Called after all wheels have been reported"""
+        pass
+
+
+class TextReporter(Reporter):
+    """
+    The default human-readable output format, with failures printed to stdout
+    and unreadable wheels reported on stderr
+    """
+
+    def report(self, result: WheelReport) -> None:
+        if result.error is not None:
+            self.echo(f"{result.wheel}: {result.error}", True)
+        elif result.failures:
+            for f in result.failures:
+                self.echo(f.show(result.wheel), False)
+        else:
+            self.echo(f"{result.wheel}: OK", False)
+
+
+class JSONLinesReporter(Reporter):
+    """Outputs one JSON object per wheel, one per line"""
+
+    def report(self, result: WheelReport) -> None:
+        self.echo(json.dumps(result.as_json()), False)
+
+
+@attr.s(auto_attribs=True)
+class JSONReporter(Reporter):
+    """
+    Outputs a JSON array of objects, one per wheel.  The elements of the array
+    are written out one per line as soon as they are available.
+    """
+
+    first: bool = attr.ib(default=True, init=False)
+
+    def start(self) -> None:
+        self.echo("[", False)
+
+    def report(self, result: WheelReport) -> None:
+        sep = "" if self.first else ","
+        self.first = False
+        self.echo(sep + json.dumps(result.as_json()), False)
+
+    def finish(self) -> None:
+        self.echo("]", False)
+
+
+@attr.s(auto_attribs=True)
+class SARIFReporter(Reporter):
+    """
+    Outputs a SARIF log containing a single run in which each failed check is
+    a result.  The run's rules are the builtin checks followed by the enabled
+    plugin checks.  Wheels that could not be checked are reported as results
+    without a ``ruleId``.  Results are written out one per line as soon as
+    they are available.
+    """
+
+    first: bool = attr.ib(default=True, init=False)
+
+    def start(self) -> None:
+        driver = {
+            "name": "check-wheel-contents",
+            "version": __version__,
+            "informationUri": __url__,
+            "rules": [
+                {
+                    "id": c.name,
+                    "shortDescription": {"text": c.value},
+                    "helpUri": f"{__url__}#checks",
+                }
+                for c in Check
+            ]
+            + [
+                {
+                    "id": p.name,
+                    "shortDescription": {"text": p.message},
+                }
+                for p in self.plugins
+            ],
+        }
+        log = {
+            "version": SARIF_VERSION,
+            "$schema": SARIF_SCHEMA,
+            "runs": [{"tool": {"driver": driver}, "results": []}],
+        }
+        # Leave the (final) "results" array open so that results can be
+        # streamed into it:
+        self.echo(json.dumps(log)[: -len("]}]}")], False)
+
+    def report(self, result: WheelReport) -> None:
+        location = {"physicalLocation": {"artifactLocation": {"uri": result.wheel}}}
+        results: list[dict[str, Any]] = []
+        if result.error is not None:
+            results.append(
+                {
+                    "level": "error",
+                    "message": {"text": result.error},
+                    "locations": [location],
+                    "properties": {"elapsed": result.elapsed},
+                }
+            )
+        for f in result.failures or []:
+            text = f.describe()
+            shown = f.shown_args()
+            if shown:
+                text += ": " + ", ".join(shown)
+            results.append(
+                {
+                    "ruleId": f.check.name,
+                    "level": "error",
+                    "message": {"text": text},
+                    "locations": [location],
+                    "properties": {
+                        "paths": f.args,
+                        "details": f.details,
+                        "omitted": f.omitted,
+                        "note": f.note,
+                        "elapsed": result.elapsed,
+                    },
+                }
+            )
+        for r in results:
+            sep = "" if self.first else ","
+            self.first = False
+            self.echo(sep + json.dumps(r), False)
+
+    def finish(self) -> None:
+        self.echo("]}]}", False)
+
+
+#: A mapping from the names accepted by ``--format`` to `Reporter` classes
+REPORTERS: dict[str, type[Reporter]] = {
+    "text": TextReporter,
+    "json": JSONReporter,
+    "jsonl": JSONLinesReporter,
+    "sarif": SARIFReporter,
+}
@@ -0,0 +1,290 @@
+from __future__ import annotations
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+import os
+from pathlib import Path
+import sys
+import tarfile
+from time import perf_counter
+from typing import IO
+import zipfile
+from wheel_filename import ParseError
+from .bundle import is_bundle, iter_bundle
+from .checker import WheelChecker
+from .checks import Needs
+from .contents import WheelContents
+from .errors import WheelValidationError
+from .index import DuplicateIndex, ReleaseIndex
+from .report import Reporter, WheelReport
+
+#: The type of the functions that read the contents of a wheel
+Reader = Callable[[], WheelContents]
+
+
+def read_contents(
+    path: str | os.PathLike[str],
+    zip_listing: str = "never",
+    hash_collisions: bool = True,
+) -> WheelContents:
+    """
+    Read the contents of the wheel at ``path``.  If ``path`` is a directory, it
+    is taken to be the ``*.dist-info`` directory of an installed distribution
+    or unpacked wheel, and the contents are read from its :file:`RECORD`.
+
+    ``zip_listing`` & ``hash_collisions`` are passed to
+    `WheelContents.from_wheel()`.
+    """
+    if os.path.isdir(path):
+        return WheelContents.from_dist_info(path)
+    else:
+        return WheelContents.from_wheel(
+            path, zip_listing=zip_listing, hash_collisions=hash_collisions
+        )
+
+
+def read_stdin(zip_listing: str = "never") -> WheelContents:
+    """Read the contents of a wheel streamed on standard input"""
+    return WheelContents.from_stream(sys.stdin.buffer, zip_listing=zip_listing)
+
+
+def read_spooled(
+    name: str,
+    fp: IO[bytes],
+    zip_listing: str = "never",
+    hash_collisions: bool = True,
+) -> WheelContents:
+    """
+    Read the contents of the wheel with filename ``name`` from the file ``fp``
+    (as returned by `iter_bundle()`) and close it
+    """
+    with fp:
+        return WheelContents.from_wheel(
+            name,
+            fileobj=fp,
+            zip_listing=zip_listing,
+            hash_collisions=hash_collisions,
+        )
+
+
+def unreadable_bundle(e: Exception) -> WheelContents:
+    """Raise a `WheelValidationError` for a bundle that could not be read"""
+    raise WheelValidationError(f"could not read bundle: {e}")
+
+
+def empty_bundle() -> WheelContents:
+    """Raise a `WheelValidationError` for a bundle that contains no wheels"""
+    raise WheelValidationError("no wheels found in bundle")
+
+
+def iter_readers(
+    wheelpaths: Iterable[str | os.PathLike[str]],
+    cwd: Path | None,
+    zip_listing: str = "never",
+    hash_collisions: bool = True,
+) -> Iterator[tuple[str | os.PathLike[str], Reader]]:
+    """
+    Yield each path in ``wheelpaths`` along with a function for reading the
+    contents of the wheel at that path.  A bundle of wheels (see
+    `is_bundle()`) is replaced by the wheels inside it, shown as
+    ``{bundle}:{member}``; each wheel is copied out of the bundle when it is
+    reached, so that the bundle is read in a single pass.  A bundle that
+    contains no wheels (e.g., an sdist) is reported as an invalid wheel.  A path of ``-``
+    stands for a wheel streamed on standard input.
+
+    ``zip_listing`` & ``hash_collisions`` are passed to the `WheelContents`
+    constructors; see `WheelContents.from_wheel()`.
+    """
+    for w in wheelpaths:
+        p = w if cwd is None else cwd / w
+        if os.fspath(w) == "-":
+            yield (w, partial(read_stdin, zip_listing))
+        elif is_bundle(p):
+            found = False
+            try:
+                for name, fp in iter_bundle(p):
+                    found = True
+                    yield (
+                        f"{w}:{name}",
+                        partial(read_spooled, name, fp, zip_listing, hash_collisions),
+                    )
+            except (tarfile.TarError, zipfile.BadZipFile) as e:
+                yield (w, partial(unreadable_bundle, e))
+            else:
+                if not found:
+                    yield (w, empty_bundle)
+        else:
+            yield (w, partial(read_contents, p, zip_listing, hash_collisions))
+
+
+def read_ahead(
+    executor: ThreadPoolExecutor,
+    items: Iterable[tuple[str | os.PathLike[str], Reader]],
+    depth: int,
+) -> Generator[tuple[str | os.PathLike[str], Reader], None, None]:
+    """
+    Run the reader for each item of ``items`` in ``executor``, keeping up to
+    ``depth`` reads in progress ahead of the item being yielded, and yield
+    each path along with a function for retrieving the result.
+
+    If the generator is closed early, it waits for the reads still pending
+    to finish rather than cancelling them, as a reader that never runs never
+    closes its file (see `read_spooled()`).
+    """
+    pending: deque[tuple[str | os.PathLike[str], Future[WheelContents]]] = deque()
+    try:
+        for w, reader in items:
+            pending.append((w, executor.submit(reader)))
+            if len(pending) >= depth:
+                w, future = pending.popleft()
+                yield (w, future.result)
+        while pending:
+            w, future = pending.popleft()
+            yield (w, future.result)
+    finally:
+        wait([future for _, future in pending])
+
+
+def check_wheel(
+    checker: WheelChecker,
+    path: str | os.PathLike[str],
+    cwd: Path | None = None,
+    fail_fast: bool = False,
+    index: DuplicateIndex | None = None,
+    releases: ReleaseIndex | None = None,
+    reader: Reader | None = None,
+) -> WheelReport:
+    """
+    Check the wheel at ``path`` with ``checker`` and return a `WheelReport`
+    describing the outcome.  If ``cwd`` is given, a relative ``path`` is
+    resolved relative to it, though the report still shows the path as given.
+    If ``fail_fast`` is true, checking stops at the first failing check.
+
+    If ``reader`` is given, the wheel's contents are obtained by calling it
+    rather than with `read_contents()`, which only hashes files with
+    colliding CRC-32s if a check selected in ``checker`` needs them.
+
+    If ``index`` is given, the wheel is also compared against the other wheels
+    in the index for check W301 and then added to it.  If ``releases`` is
+    given, the wheel is added to it for later comparison with the other wheels
+    for the same release.
+    """
+    start = perf_counter()
+    report = WheelReport(wheel=str(path))
+    try:
+        if reader is None:
+            whlcon = read_contents(
+                path if cwd is None else cwd / path,
+                hash_collisions=Needs.MEMBER_HASHES in checker.plan().needs,
+            )
+        else:
+            whlcon = reader()
+    except ParseError:
+        report.error = "wheel has invalid filename"
+    except WheelValidationError as e:
+        report.error = f"invalid wheel: {e}"
+    else:
+        failures = checker.check_contents(whlcon, first_failure_only=fail_fast)
+        if index is not None and not (failures and fail_fast):
+            failures.extend(index.add(str(path), whlcon))
+            failures.sort(key=lambda f: f.check.name)
+        if releases is not None:
+            releases.add(path, whlcon)
+        report.failures = failures
+    report.elapsed = perf_counter() - start
+    return report
+
+
+def check_wheels(
+    checker: WheelChecker,
+    wheelpaths: Iterable[str | os.PathLike[str]],
+    reporter: Reporter,
+    cwd: Path | None = None,
+    fail_fast: bool = False,
+    cross_project: bool = False,
+    matrix: bool = False,
+    jobs: int = 1,
+    zip_listing: str = "never",
+) -> bool:
+    """
+    Check each of the wheels at ``wheelpaths`` with ``checker``, passing the
+    result for each wheel to ``reporter`` as soon as it is available.  If
+    ``cwd`` is given, relative wheel paths are resolved relative to it, though
+    the paths are still shown as given.  Returns `True` iff all of the wheels
+    passed.
+
+    Bundles of wheels among ``wheelpaths`` are replaced by the wheels inside
+    them; see `iter_readers()`.
+
+    If ``fail_fast`` is true, each wheel is only checked up to its first
+    failing check, and no further wheels are checked after the first wheel
+    that fails.
+
+    If ``cross_project`` is true and check W301 is selected, each wheel is
+    compared against the wheels checked before it for files duplicated
+    between different projects.
+
+    If ``matrix`` is true and check W302 or W303 is selected, the wheels for
+    each release (project & version) are also compared with each other.  As
+    this requires all of the wheels to have been read, the results are only
+    passed to ``reporter`` once every wheel has been checked.
+
+    If ``jobs`` is greater than 1, up to ``jobs`` wheels are read in a thread
+    pool ahead of the wheel being checked, so that reading the wheels overlaps
+    with checking them.  The wheels are still checked & reported in order.
+
+    ``zip_listing`` controls when the wheels' file trees are read from their
+    ZIP central directories instead of their :file:`RECORD`\\s; see
+    `WheelContents.from_wheel()`.
+    """
+    ok = True
+    index = checker.new_duplicate_index() if cross_project else None
+    releases = checker.new_release_index() if matrix else None
+    held: list[WheelReport] = []
+    executor: ThreadPoolExecutor | None = None
+    ahead: Generator[tuple[str | os.PathLike[str], Reader], None, None] | None = None
+    # Colliding files are only decompressed & hashed if a check will use the
+    # hashes:
+    hash_collisions = Needs.MEMBER_HASHES in checker.plan().needs
+    items = iter_readers(wheelpaths, cwd, zip_listing, hash_collisions)
+    if jobs > 1:
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        items = ahead = read_ahead(executor, items, jobs)
+    reporter.start()
+    try:
+        for w, reader in items:
+            report = check_wheel(
+                checker,
+                w,
+                cwd=cwd,
+                fail_fast=fail_fast,
+                index=index,
+                releases=releases,
+                reader=reader,
+            )
+            if releases is None:
+                reporter.report(report)
+            else:
+                held.append(report)
+            if not report.ok:
+                ok = False
+                if fail_fast:
+                    break
+    finally:
+        if ahead is not None:
+            # Let the reads in progress finish & close their files before the
+            # executor is shut down:
+            ahead.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if releases is not None:
+        for report in held:
+            if report.failures is not None and not (report.failures and fail_fast):
+                report.failures.extend(releases.check(report.wheel))
+                report.failures.sort(key=lambda f: f.check.name)
+                if report.failures:
+                    ok = False
+            reporter.report(report)
+    reporter.finish()
+    return ok
@@ -0,0 +1,145 @@
+"""
+Building the expected package tree from the member list of an sdist
+
+An sdist is a tar or zip archive whose members are all inside a single
+toplevel directory (:file:`{project}-{version}/`).  Only the archive's member
+list is read: for zip files, that is the central directory, and for tar files,
+the member headers, which `tarfile` reads by skipping over (but not
+extracting) the member bodies.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+import os
+from pathlib import PurePosixPath
+import tarfile
+import zipfile
+from .errors import UserInputError, WheelValidationError
+from .filetree import Directory, File
+
+#: The directory within an sdist's toplevel directory that is used as the
+#: package tree if present
+SRC_DIR = "src"
+
+
+def iter_members(path: str | os.PathLike[str]) -> Iterator[tuple[str, bool]]:
+    """
+    Yield a ``(name, is_dir)`` pair for each regular file & directory in the
+    tar or zip archive at ``path``.  Names use ``/`` as a separator and do not
+    end with one.
+
+    :raises UserInputError: if the archive cannot be read
+    """
+    try:
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zf:
+                for zi in zf.infolist():
+                    yield (zi.filename.rstrip("/"), zi.is_dir())
+        else:
+            # Stream mode reads the headers in order without seeking, skipping
+            # the member bodies as it goes.
+            with tarfile.open(path, mode="r|*") as tf:
+                for ti in tf:
+                    if ti.isdir() or ti.isfile():
+                        yield (ti.name.rstrip("/"), ti.isdir())
+    except (OSError, tarfile.TarError, zipfile.BadZipFile) as e:
+        raise UserInputError(f"{os.fsdecode(path)}: could not read sdist: {e}")
+
+
+def normalize_member(name: str) -> tuple[str, ...] | None:
+    """
+    Split an archive member name into path components, discarding empty and
+    ``.`` components.  Returns `None` for absolute names and names containing
+    ``..``.
+    """
+    if name.startswith("/"):
+        return None
+    parts = tuple(p for p in name.split("/") if p not in ("", "."))
+    if ".." in parts:
+        return None
+    return parts
+
+
+def sdist_tree(
+    path: str | os.PathLike[str],
+    exclude: list[str],
+    toplevel: list[str] | None = None,
+) -> Directory:
+    """
+    Construct the expected package tree from the member list of the sdist at
+    ``path``.
+
+    The tree consists of the contents of the sdist's :file:`src/` directory
+    or, if there is no such directory, the contents of the sdist's toplevel
+    directory.  If ``toplevel`` is not `None`, only the entries at the root of
+    the tree whose names are in ``toplevel`` are kept; it is required if the
+    sdist does not have a :file:`src/` directory, as the toplevel directory
+    of a flat-layout sdist also contains files that are not installed, like
+    :file:`setup.py`, :file:`README`, and tests.  Files & directories matching any of
+    the patterns in ``exclude`` are omitted along with their contents; the
+    patterns are matched against paths relative to the sdist's toplevel
+    directory.  The result is the same as that of
+    ``Directory.from_local_tree(..., include_root=False)`` on the
+    corresponding directory of the unpacked sdist.
+
+    :raises UserInputError: if the archive cannot be read or does not have a
+        single toplevel directory, or if it does not have a :file:`src/`
+        directory and ``toplevel`` is `None`
+    """
+    # Tar files may contain multiple members with the same name, in which case
+    # the last one wins:
+    members: dict[tuple[str, ...], bool] = {}
+    roots: set[str] = set()
+    for name, is_dir in iter_members(path):
+        parts = normalize_member(name)
+        if not parts:
+            continue
+        roots.add(parts[0])
+        if len(parts) > 1:
+            members[parts[1:]] = is_dir
+    if len(roots) != 1:
+        raise UserInputError(
+            f"{os.fsdecode(path)}: sdist does not have a single toplevel directory"
+        )
+    if any(parts[0] == SRC_DIR and len(parts) > 1 for parts in members):
+        prefix = 1
+    elif toplevel is None:
+        raise UserInputError(
+            f"{os.fsdecode(path)}: sdist does not have a {SRC_DIR}/ directory;"
+            " use --toplevel to specify the packages & modules to check"
+        )
+    else:
+        prefix = 0
+    # A cache of whether each directory (by its path relative to the sdist's
+    # toplevel directory) is excluded, so that each directory is matched
+    # against the patterns only once:
+    excluded: dict[tuple[str, ...], bool] = {(): False}
+
+    def is_excluded(parts: tuple[str, ...]) -> bool:
+        try:
+            return excluded[parts]
+        except KeyError:
+            pp = PurePosixPath(*parts)
+            result = is_excluded(parts[:-1]) or any(pp.match(e) for e in exclude)
+            excluded[parts] = result
+            return result
+
+    tree = Directory()
+    for parts, is_dir in members.items():
+        if prefix and parts[0] != SRC_DIR:
+            continue
+        relparts = parts[prefix:]
+        if not relparts or (toplevel is not None and relparts[0] not in toplevel):
+            continue
+        if is_excluded(parts):
+            continue
+        entry: File | Directory
+        if is_dir:
+            entry = Directory("/".join(relparts) + "/")
+        else:
+            entry = File(relparts, None, None)
+        try:
+            tree.add_entry(entry)
+        except WheelValidationError as e:
+            raise UserInputError(f"{os.fsdecode(path)}: invalid sdist: {e}")
+    return tree
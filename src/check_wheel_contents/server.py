@@ -0,0 +1,385 @@
+"""
+Support for running ``check-wheel-contents`` as a long-lived server
+
+A server started with ``--serve SOCKET`` listens on a Unix domain socket and
+keeps configured `WheelChecker` instances (including their parsed
+configuration and package trees) around between requests.  A client started
+with ``--connect SOCKET`` parses its command-line arguments locally, forwards
+the resulting options to the server, and prints the results.
+
+The protocol consists of newline-terminated JSON objects.  The client sends a
+single request object with the following fields:
+
+``cwd``
+    The client's current working directory, against which relative wheel
+    paths are resolved
+
+``options``
+    The keyword arguments to pass to `WheelChecker.configure_options()`, as
+    produced by `encode_options()`
+
+``wheels``
+    A list of paths to wheels to check
+
+``format``
+    The name of the output format to use (a key of `REPORTERS`); defaults to
+    ``"text"``
+
+``fail_fast``
+    Whether to stop checking at the first failure; defaults to `False`
+
+``cross_project``
+    Whether to compare each wheel with the wheels for other projects checked
+    before it; defaults to `False`
+
+``matrix``
+    Whether to compare the wheels for the same release with each other;
+    defaults to `False`
+
+``zip_listing``
+    When to build the wheels' file lists from their ZIP central directories
+    instead of their :file:`RECORD`\\s (one of `ZIP_LISTING_MODES`); defaults to
+    ``"never"``
+
+The server then responds with a sequence of objects, each of which has exactly
+one of the following fields:
+
+``stdout``
+    A line of output to print to standard output
+
+``stderr``
+    A line of output to print to standard error
+
+``error``
+    An error message describing why the request could not be processed; this
+    is followed by an ``exit`` message
+
+``exit``
+    The exit status for the client; this is always the last message
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+import json
+import os
+from pathlib import Path
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from types import FrameType
+from typing import Any
+from .checker import NO_CONFIG, WheelChecker
+from .checks import Check
+from .contents import ZIP_LISTING_MODES
+from .errors import UserInputError
+from .lightconfig import find_config_section
+from .report import REPORTERS, Echo
+from .runner import check_wheels
+
+#: Whether the current platform supports Unix domain sockets
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+#: The default maximum number of configured `WheelChecker`\s kept by a
+#: `CheckServer`
+MAX_CACHED_CHECKERS = 32
+
+
+def encode_options(
+    configpath: Any = NO_CONFIG,
+    select: set[Check] | None = None,
+    ignore: set[Check] | None = None,
+    toplevel: list[str] | None = None,
+    package: tuple[str, ...] = (),
+    src_dir: tuple[str, ...] = (),
+    sdist: str | None = None,
+    src_from_git: bool = False,
+    package_omit: list[str] | None = None,
+    plugins: list[str] | None = None,
+    allow_duplicates: list[str] | None = None,
+    max_library_size: int | None = None,
+    max_file_size: int | None = None,
+    max_toplevel_size: int | None = None,
+    max_stored_size: int | None = None,
+    min_compression_ratio: float | None = None,
+) -> dict[str, Any]:
+    """
+    Convert the arguments to `WheelChecker.configure_options()` into a
+    JSON-serializable `dict` that does not depend on the current working
+    directory.  If ``configpath`` is `None`, the default configuration file is
+    located and its absolute path is used.  `NO_CONFIG` is encoded as `None`.
+    """
+    if configpath is None:
+        found = find_config_section()
+        configpath = NO_CONFIG if found is None else found[0]
+    config: str | None
+    if configpath is NO_CONFIG:
+        config = None
+        mtime = None
+    else:
+        config = os.path.abspath(configpath)
+        mtime = os.stat(config).st_mtime_ns
+    return {
+        "configpath": config,
+        "config_mtime": mtime,
+        "select": None if select is None else sorted(c.name for c in select),
+        "ignore": None if ignore is None else sorted(c.name for c in ignore),
+        "toplevel": toplevel,
+        "package": [os.path.abspath(p) for p in package],
+        "src_dir": [os.path.abspath(p) for p in src_dir],
+        "sdist": None if sdist is None else os.path.abspath(sdist),
+        "src_from_git": src_from_git,
+        "package_omit": package_omit,
+        "plugins": plugins,
+        "allow_duplicates": allow_duplicates,
+        "max_library_size": max_library_size,
+        "max_file_size": max_file_size,
+        "max_toplevel_size": max_toplevel_size,
+        "max_stored_size": max_stored_size,
+        "min_compression_ratio": min_compression_ratio,
+    }
+
+
+def decode_options(options: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert the output of `encode_options()` back into keyword arguments for
+    `WheelChecker.configure_options()`
+    """
+    select = options["select"]
+    ignore = options["ignore"]
+    return {
+        "configpath": (
+            NO_CONFIG if options["configpath"] is None else options["configpath"]
+        ),
+        "select": None if select is None else {Check[c] for c in select},
+        "ignore": None if ignore is None else {Check[c] for c in ignore},
+        "toplevel": options["toplevel"],
+        "package": tuple(options["package"]),
+        "src_dir": tuple(options["src_dir"]),
+        "sdist": options["sdist"],
+        "src_from_git": options["src_from_git"],
+        "package_omit": options["package_omit"],
+        "plugins": options["plugins"],
+        "allow_duplicates": options["allow_duplicates"],
+        "max_library_size": options["max_library_size"],
+        "max_file_size": options["max_file_size"],
+        "max_toplevel_size": options["max_toplevel_size"],
+        "max_stored_size": options["max_stored_size"],
+        "min_compression_ratio": options["min_compression_ratio"],
+    }
+
+
+def source_stamp(options: dict[str, Any]) -> list[int]:
+    """
+    Return the modification times of the directories in the ``package`` and
+    ``src_dir`` trees in ``options`` (as returned by `encode_options()`), of
+    the ``sdist``, and (when ``src_from_git`` is set) of the Git index files
+    of the repositories containing the trees.  As the package tree only
+    consists of file & directory names, it can only change when one of these
+    times does.
+    """
+    stamp: list[int] = []
+    roots = [*options["package"], *options["src_dir"]]
+    for root in roots:
+        for dirpath, _, _ in os.walk(root):
+            stamp.append(os.stat(dirpath).st_mtime_ns)
+    if options["src_from_git"]:
+        for root in roots:
+            for d in Path(root).resolve().parents:
+                index = d / ".git" / "index"
+                if index.exists():
+                    stamp.append(index.stat().st_mtime_ns)
+                    break
+    if options["sdist"] is not None:
+        stamp.append(os.stat(options["sdist"]).st_mtime_ns)
+    return stamp
+
+
+class CheckServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    A server that checks wheels on behalf of clients, caching a configured
+    `WheelChecker` for each of the ``max_checkers`` most recently used sets of
+    options
+    """
+
+    #: Wait for in-progress requests to finish when closing the server
+    block_on_close = True
+    daemon_threads = False
+
+    def __init__(
+        self, socket_path: str, jobs: int, max_checkers: int = MAX_CACHED_CHECKERS
+    ) -> None:
+        super().__init__(socket_path, CheckRequestHandler)
+        #: Limits the number of requests whose checks run at once
+        self.slots = threading.BoundedSemaphore(jobs)
+        #: The maximum number of entries in ``checkers``
+        self.max_checkers = max_checkers
+        #: A mapping from serialized options & source stamps to configured
+        #: `WheelChecker`\s, in order from least to most recently used
+        self.checkers: OrderedDict[str, WheelChecker] = OrderedDict()
+        self.checkers_lock = threading.Lock()
+
+    def get_checker(self, options: dict[str, Any]) -> WheelChecker:
+        """
+        Return a `WheelChecker` configured with the given options (as returned
+        by `encode_options()`), reusing a previously-configured instance if
+        possible.  Instances are only reused while their package trees are
+        up to date according to `source_stamp()`.
+
+        New instances are configured without holding ``checkers_lock``, so
+        that building a package tree does not hold up other requests; if two
+        requests configure a `WheelChecker` for the same options at once, the
+        first one to finish is kept.
+
+        :raises UserInputError: if the options are invalid
+        """
+        try:
+            stamp = source_stamp(options)
+        except OSError as e:
+            raise UserInputError(str(e))
+        key = json.dumps([options, stamp], sort_keys=True)
+        with self.checkers_lock:
+            checker = self.checkers.get(key)
+            if checker is not None:
+                self.checkers.move_to_end(key)
+                return checker
+        checker = WheelChecker()
+        checker.configure_options(**decode_options(options))
+        with self.checkers_lock:
+            checker = self.checkers.setdefault(key, checker)
+            self.checkers.move_to_end(key)
+            while len(self.checkers) > self.max_checkers:
+                self.checkers.popitem(last=False)
+        return checker
+
+
+class CheckRequestHandler(socketserver.StreamRequestHandler):
+    """Handler for a single client connection to a `CheckServer`"""
+
+    server: CheckServer
+
+    def send(self, **msg: Any) -> None:
+        self.wfile.write(json.dumps(msg).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            # The client disconnected without sending a request (e.g., it was
+            # only checking whether the server is running)
+            return
+        try:
+            request = json.loads(line)
+            cwd = Path(request["cwd"])
+            options = request["options"]
+            wheels = request["wheels"]
+            reporter_cls = REPORTERS[request.get("format", "text")]
+            fail_fast = bool(request.get("fail_fast", False))
+            cross_project = bool(request.get("cross_project", False))
+            matrix = bool(request.get("matrix", False))
+            zip_listing = request.get("zip_listing", "never")
+            if zip_listing not in ZIP_LISTING_MODES:
+                raise ValueError(f"invalid zip_listing: {zip_listing!r}")
+        except (ValueError, KeyError, TypeError) as e:
+            self.send(error=f"Invalid request: {e}")
+            self.send(exit=2)
+            return
+        try:
+            checker = self.server.get_checker(options)
+        except (UserInputError, KeyError, TypeError) as e:
+            self.send(error=str(e))
+            self.send(exit=2)
+            return
+
+        def echo(line: str, err: bool) -> None:
+            if err:
+                self.send(stderr=line)
+            else:
+                self.send(stdout=line)
+
+        with self.server.slots:
+            try:
+                ok = check_wheels(
+                    checker,
+                    wheels,
+                    reporter_cls(echo, checker.plugins),
+                    cwd=cwd,
+                    fail_fast=fail_fast,
+                    cross_project=cross_project,
+                    matrix=matrix,
+                    zip_listing=zip_listing,
+                )
+            except OSError as e:
+                self.send(error=str(e))
+                self.send(exit=1)
+                return
+        self.send(exit=0 if ok else 1)
+
+
+def serve(socket_path: str, jobs: int) -> None:
+    """
+    Listen for check requests on the Unix domain socket at ``socket_path``,
+    running the checks for at most ``jobs`` requests at once, until a
+    :const:`~signal.SIGINT` or :const:`~signal.SIGTERM` is received.  Requests
+    that are in progress when the signal arrives are allowed to finish.
+    """
+    if os.path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            try:
+                s.connect(socket_path)
+            except OSError:
+                # Stale socket left behind by a server that didn't exit
+                # cleanly
+                os.unlink(socket_path)
+            else:
+                raise UserInputError(f"{socket_path}: server is already running")
+    server = CheckServer(socket_path, jobs)
+    stop = threading.Event()
+
+    def on_signal(_signum: int, _frame: FrameType | None) -> None:
+        stop.set()
+
+    handlers = {
+        sig: signal.signal(sig, on_signal) for sig in (signal.SIGINT, signal.SIGTERM)
+    }
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    print(f"Listening on {socket_path}", file=sys.stderr)
+    try:
+        stop.wait()
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+        os.unlink(socket_path)
+        for sig, h in handlers.items():
+            signal.signal(sig, h)
+
+
+def send_request(socket_path: str, request: dict[str, Any], echo: Echo) -> int:
+    """
+    Send ``request`` to the server listening at ``socket_path``, pass its
+    output to ``echo``, and return the exit status that it reports
+
+    :raises UserInputError: if the server reports an error with the request
+    :raises OSError: if communication with the server fails
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(socket_path)
+        s.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        error: str | None = None
+        with s.makefile("rb") as fp:
+            for line in fp:
+                msg = json.loads(line)
+                if "stdout" in msg:
+                    echo(msg["stdout"], False)
+                elif "stderr" in msg:
+                    echo(msg["stderr"], True)
+                elif "error" in msg:
+                    error = msg["error"]
+                elif "exit" in msg:
+                    if error is not None:
+                        raise UserInputError(error)
+                    return int(msg["exit"])
+    raise ConnectionError("Server closed connection without reporting exit status")
@@ -1,10 +1,13 @@
 from __future__ import annotations
 import base64
+from functools import lru_cache
 import hashlib
 from keyword import iskeyword
+from os.path import splitext
 import re
+from typing import IO
 from packaging.utils import canonicalize_name, canonicalize_version
-from .errors import WheelValidationError
+from .errors import UserInputError, WheelValidationError
 
 # <https://discuss.python.org/t/identifying-parsing-binary-extension-filenames/>
 MODULE_EXT_RGX = re.compile(r"(?<=.)\.(?:py|pyd|so|[-A-Za-z0-9_]+\.(?:pyd|so))\Z")
@@ -17,6 +20,53 @@ DATA_DIR_RGX = re.compile(
     r"[A-Za-z0-9](?:[A-Za-z0-9._]*[A-Za-z0-9])?-[A-Za-z0-9_.!+]+\.data"
 )
 
+#: The file extensions of Python bytecode files
+BYTECODE_SUFFIXES = (".pyc", ".pyo")
+
+#: The maximum number of distinct names whose classifications are cached by
+#: `classify_basename()`, `is_dist_info_dir()`, `is_data_dir()`, and
+#: `is_module_name()`
+NAME_CACHE_SIZE = 8192
+
+
+#: A regex matching a file size with an optional unit suffix
+SIZE_RGX = re.compile(
+    r"\s*(\d+(?:\.\d*)?|\.\d+)\s*(?:([KMGT])(?:i?B)?|B)?\s*", flags=re.I
+)
+
+#: The multipliers for the unit suffixes accepted by `parse_size()`
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(s: str) -> int:
+    """
+    Parse a file size given as a number of bytes optionally followed by a unit
+    of ``K``, ``M``, ``G``, or ``T`` (case insensitive, optionally followed by
+    ``B`` or ``iB``), each of which is a power of 1024.  A bare ``B`` unit is
+    also accepted.
+
+    :raises UserInputError: if ``s`` is not a valid size
+    """
+    m = SIZE_RGX.fullmatch(s)
+    if m is None:
+        raise UserInputError(f"Invalid size: {s!r}")
+    number, unit = m.groups()
+    multiplier = 1 if unit is None else SIZE_UNITS[unit.upper()]
+    return int(float(number) * multiplier)
+
+
+def format_size(size: int) -> str:
+    """
+    Format a number of bytes for display, using the largest binary unit in
+    which the size is at least 1
+    """
+    if size < SIZE_UNITS["K"]:
+        return f"{size} B"
+    for unit in "TGMK":
+        if size >= SIZE_UNITS[unit]:
+            return f"{size / SIZE_UNITS[unit]:.1f} {unit}iB"
+    raise AssertionError("Unreachable")  # pragma: no cover
+
 
 def comma_split(s: str) -> list[str]:
     """
@@ -33,6 +83,17 @@ def bytes_signature(b: bytes) -> tuple[int, str]:
     )
 
 
+def stream_digest(fp: IO[bytes]) -> str:
+    """
+    Return the SHA256 hash of the remaining contents of ``fp`` in the
+    ``sha256={digest}`` form used by :file:`RECORD` files, reading it in chunks
+    """
+    h = hashlib.sha256()
+    for chunk in iter(lambda: fp.read(65536), b""):
+        h.update(chunk)
+    return "sha256=" + urlsafe_b64encode_nopad(h.digest())
+
+
 def urlsafe_b64encode_nopad(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).rstrip(b"=").decode("us-ascii")
 
@@ -50,14 +111,36 @@ def pymodule_basename(filename: str) -> str | None:
         return None
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def classify_basename(filename: str) -> tuple[str, str | None]:
+    """
+    Return a pair of the file extension of ``filename`` (as returned by
+    `os.path.splitext()`) and the result of calling `pymodule_basename()` on
+    it.  Results are cached, as the same basenames (``__init__.py``,
+    ``py.typed``, etc.) recur many times within & across wheels.
+    """
+    return (splitext(filename)[1], pymodule_basename(filename))
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def is_dist_info_dir(name: str) -> bool:
     return DIST_INFO_DIR_RGX.fullmatch(name) is not None
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def is_data_dir(name: str) -> bool:
     return DATA_DIR_RGX.fullmatch(name) is not None
 
 
+#: A regex matching exactly those paths that are rejected by `validate_path()`
+INVALID_PATH_RGX = re.compile(r"\A(?:/|\Z)|//|(?:\A|/)\.\.?(?:/|\Z)")
+
+#: A regex that, when applied to a newline-separated list of paths, matches if
+#: any of the paths would be rejected by `validate_path()`.  (It may also match
+#: valid paths that contain newlines.)
+INVALID_PATH_LINE_RGX = re.compile(r"^(?:/|$)|//|(?:^|/)\.\.?(?:/|$)", flags=re.M)
+
+
 def validate_path(path: str) -> None:
     if path.startswith("/"):
         raise WheelValidationError(f"Absolute path in RECORD: {path!r}")
@@ -70,11 +153,19 @@ def validate_path(path: str) -> None:
         raise WheelValidationError(f"Non-normalized path in RECORD: {path!r}")
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def is_module_name(name: str) -> bool:
+    """
+    Returns `True` iff ``name`` can be used as the name of a Python module or
+    package component, i.e., iff it is a non-keyword Python identifier
+    """
+    return name.isidentifier() and not iskeyword(name)
+
+
 def is_stubs_dir(name: str) -> bool:
     if not name.endswith("-stubs"):
         return False
-    basename = name[:-6]
-    return basename.isidentifier() and not iskeyword(basename)
+    return is_module_name(name[:-6])
 
 
 def find_wheel_dirs(
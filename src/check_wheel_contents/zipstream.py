@@ -0,0 +1,342 @@
+"""
+Reading a ZIP archive sequentially from a non-seekable stream
+
+`zipfile.ZipFile` needs a seekable file, as it starts by reading the central
+directory at the end of the archive.  When reading from a pipe, the archive is
+instead parsed from the front: each local file header is read in turn, the
+member's body is either decompressed & kept (for the few members the caller
+asks for) or read & discarded in fixed-size chunks, and when the central
+directory arrives, its entries are reconciled with the local headers seen.
+Memory use is thus bounded by the sizes of the kept members and of the list
+of names, regardless of the size of the archive.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import struct
+from typing import IO
+import zlib
+import attr
+from .errors import WheelValidationError
+
+#: The size of the chunks in which member bodies are read
+CHUNK_SIZE = 1 << 16
+
+LOCAL_HEADER_SIG = b"PK\x03\x04"
+CENTRAL_HEADER_SIG = b"PK\x01\x02"
+END_OF_CENTRAL_DIR_SIG = b"PK\x05\x06"
+ZIP64_END_OF_CENTRAL_DIR_SIG = b"PK\x06\x06"
+ZIP64_LOCATOR_SIG = b"PK\x06\x07"
+DATA_DESCRIPTOR_SIG = b"PK\x07\x08"
+
+#: The signatures of the records that can follow a member's data descriptor
+NEXT_RECORD_SIGS = (LOCAL_HEADER_SIG, CENTRAL_HEADER_SIG)
+
+#: The fields of a local file header after the signature: version needed,
+#: flags, compression method, modification time & date, CRC-32, compressed
+#: size, uncompressed size, filename length, and extra field length
+LOCAL_HEADER = struct.Struct("<5H3L2H")
+
+#: The fields of a central directory file header after the signature: version
+#: made by, version needed, flags, compression method, modification time &
+#: date, CRC-32, compressed size, uncompressed size, filename length, extra
+#: field length, comment length, disk number, internal attributes, external
+#: attributes, and local header offset
+CENTRAL_HEADER = struct.Struct("<6H3L5H2L")
+
+#: The fields of the end of central directory record after the signature,
+#: ending with the comment length
+END_OF_CENTRAL_DIR = struct.Struct("<4H2LH")
+
+#: The ID of the extra field holding ZIP64 sizes
+ZIP64_EXTRA_ID = 0x0001
+
+#: General purpose flag bits
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+#: Compression methods
+STORED = 0
+DEFLATED = 8
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ZipMember:
+    """An entry in the central directory of a ZIP archive"""
+
+    #: The member's name (ending in ``/`` for directories)
+    name: str
+    #: The member's uncompressed size
+    size: int
+    #: The CRC-32 of the member's uncompressed contents
+    crc: int
+    #: The member's compressed size, if known
+    compress_size: int | None = None
+    #: The member's compression method (e.g., `STORED` or `DEFLATED`), if
+    #: known
+    compress_type: int | None = None
+    #: The member's hash in ``{alg}={digest}`` form, if it was computed while
+    #: reading the wheel (see `WheelContents.hash_crc_duplicates()`)
+    digest: str | None = None
+
+
+class StreamReader:
+    """A reader of exact numbers of bytes from a stream, with pushback"""
+
+    def __init__(self, fp: IO[bytes]) -> None:
+        self.fp = fp
+        self.buf = b""
+
+    def read(self, n: int) -> bytes:
+        """
+        Read exactly ``n`` bytes
+
+        :raises WheelValidationError: if the stream ends first
+        """
+        data = self.buf[:n]
+        self.buf = self.buf[n:]
+        while len(data) < n:
+            more = self.fp.read(n - len(data))
+            if not more:
+                raise WheelValidationError("ZIP stream is truncated")
+            data += more
+        return data
+
+    def chunk(self, limit: int = CHUNK_SIZE) -> bytes:
+        """
+        Read up to ``limit`` bytes, returning an empty `bytes` only at the end
+        of the stream
+        """
+        if self.buf:
+            data = self.buf[:limit]
+            self.buf = self.buf[limit:]
+            return data
+        return self.fp.read(min(limit, CHUNK_SIZE))
+
+    def skip(self, n: int) -> None:
+        """
+        Read & discard exactly ``n`` bytes in chunks
+
+        :raises WheelValidationError: if the stream ends first
+        """
+        while n > 0:
+            data = self.chunk(n)
+            if not data:
+                raise WheelValidationError("ZIP stream is truncated")
+            n -= len(data)
+
+    def unread(self, data: bytes) -> None:
+        """Push ``data`` back onto the front of the stream"""
+        self.buf = data + self.buf
+
+
+def decode_name(raw: bytes, flags: int) -> str:
+    """Decode a member name the same way as `zipfile`"""
+    return raw.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+
+
+def zip64_sizes(extra: bytes, size: int, csize: int) -> tuple[int, int, bool]:
+    """
+    Replace the ``size`` and/or ``csize`` values that are set to
+    ``0xFFFFFFFF`` with the values from the ZIP64 extra field in ``extra``, and
+    return them along with whether a ZIP64 field was present
+    """
+    i = 0
+    while i + 4 <= len(extra):
+        hid, hlen = struct.unpack_from("<2H", extra, i)
+        if hid == ZIP64_EXTRA_ID:
+            values = list(struct.unpack_from(f"<{hlen // 8}Q", extra, i + 4))
+            if size == 0xFFFFFFFF and values:
+                size = values.pop(0)
+            if csize == 0xFFFFFFFF and values:
+                csize = values.pop(0)
+            return (size, csize, True)
+        i += 4 + hlen
+    return (size, csize, False)
+
+
+def inflate(reader: StreamReader, keep: bool) -> bytes:
+    """
+    Decompress a deflated member body of unknown length from ``reader``,
+    pushing back any data read past its end.  The decompressed data is only
+    accumulated if ``keep`` is true; otherwise, it is discarded as it is
+    produced, so that memory use is bounded by `CHUNK_SIZE`.
+    """
+    d = zlib.decompressobj(-15)
+    out: list[bytes] = []
+    while True:
+        data = reader.chunk()
+        if not data:
+            raise WheelValidationError("ZIP stream is truncated")
+        while data:
+            try:
+                piece = d.decompress(data, CHUNK_SIZE)
+            except zlib.error as e:
+                raise WheelValidationError(f"Invalid deflated data in ZIP stream: {e}")
+            if keep:
+                out.append(piece)
+            if d.eof:
+                reader.unread(d.unused_data)
+                return b"".join(out)
+            data = d.unconsumed_tail
+
+
+def read_stored(reader: StreamReader, keep: bool, is_zip64: bool) -> tuple[bytes, int]:
+    """
+    Read a stored member body of unknown length from ``reader`` by scanning for
+    the data descriptor that follows it, i.e., for a data descriptor signature
+    followed by the CRC-32 of the bytes before it, by compressed &
+    uncompressed sizes both equal to the number of bytes before it, and then
+    by the signature of the next local file header or of the central
+    directory.  Returns the body (if ``keep`` is true; otherwise, an empty `bytes`) and the CRC-32
+    from the data descriptor.  The data descriptor is consumed.
+    """
+    desclen = 24 if is_zip64 else 16
+    fmt = "<LQQ" if is_zip64 else "<LLL"
+    out: list[bytes] = []
+    window = b""
+    consumed = 0
+    # The CRC-32 of the bytes before the window:
+    crc_so_far = 0
+    while True:
+        more = reader.chunk()
+        if not more:
+            raise WheelValidationError("ZIP stream is truncated")
+        window += more
+        # The number of bytes at the start of the window that are certainly
+        # part of the body:
+        cut = max(0, len(window) - desclen - 3)
+        i = window.find(DATA_DESCRIPTOR_SIG)
+        while i != -1:
+            if len(window) - i < desclen + 4:
+                cut = min(cut, i)
+                break
+            crc, csize, size = struct.unpack_from(fmt, window, i + 4)
+            if (
+                csize == size == consumed + i
+                and window[i + desclen : i + desclen + 4] in NEXT_RECORD_SIGS
+                and crc == zlib.crc32(window[:i], crc_so_far)
+            ):
+                if keep:
+                    out.append(window[:i])
+                reader.unread(window[i + desclen :])
+                return (b"".join(out), crc)
+            i = window.find(DATA_DESCRIPTOR_SIG, i + 1)
+        if keep:
+            out.append(window[:cut])
+        crc_so_far = zlib.crc32(window[:cut], crc_so_far)
+        consumed += cut
+        window = window[cut:]
+
+
+def read_zip_stream(
+    fp: IO[bytes], keep: Callable[[str], bool]
+) -> tuple[list[ZipMember], dict[str, bytes]]:
+    """
+    Read a ZIP archive sequentially from ``fp`` and return the entries of its
+    central directory along with a `dict` mapping the names of the members for
+    which ``keep`` returns true to their decompressed contents.  The bodies of
+    all other members are discarded as they are read.
+
+    :raises WheelValidationError: if the archive is invalid or truncated, if a
+        kept member uses an unsupported compression method or fails its CRC
+        check, or if the central directory does not match the local file
+        headers
+    """
+    reader = StreamReader(fp)
+    local_names: list[str] = []
+    kept: dict[str, bytes] = {}
+    members: list[ZipMember] = []
+    while True:
+        sig = reader.read(4)
+        if sig == LOCAL_HEADER_SIG:
+            _, flags, method, _, _, crc, csize, size, nlen, elen = LOCAL_HEADER.unpack(
+                reader.read(LOCAL_HEADER.size)
+            )
+            name = decode_name(reader.read(nlen), flags)
+            size, csize, is_zip64 = zip64_sizes(reader.read(elen), size, csize)
+            local_names.append(name)
+            wanted = keep(name)
+            if flags & FLAG_DATA_DESCRIPTOR and method == STORED and csize == 0:
+                # The sizes (and CRC) follow the body, and so the end of the
+                # body has to be found by looking for them:
+                data, crc = read_stored(reader, wanted, is_zip64)
+            elif flags & FLAG_DATA_DESCRIPTOR and (method == DEFLATED or csize == 0):
+                # The end of a deflated body is found by decompressing it:
+                if method != DEFLATED:
+                    raise WheelValidationError(
+                        f"Cannot find end of member {name!r} in ZIP stream:"
+                        f" compression method {method} used with data descriptor"
+                    )
+                data = inflate(reader, wanted)
+                desc = reader.read(4)
+                if desc == DATA_DESCRIPTOR_SIG:
+                    desc = reader.read(4)
+                (crc,) = struct.unpack("<L", desc)
+                reader.skip(16 if is_zip64 else 8)
+            else:
+                if wanted:
+                    raw = reader.read(csize)
+                    if method == STORED:
+                        data = raw
+                    elif method == DEFLATED:
+                        try:
+                            data = zlib.decompress(raw, -15)
+                        except zlib.error as e:
+                            raise WheelValidationError(
+                                f"Invalid deflated data for {name!r} in ZIP"
+                                f" stream: {e}"
+                            )
+                    else:
+                        raise WheelValidationError(
+                            f"Unsupported compression method {method} for"
+                            f" {name!r} in ZIP stream"
+                        )
+                else:
+                    reader.skip(csize)
+                if flags & FLAG_DATA_DESCRIPTOR:
+                    desc = reader.read(4)
+                    reader.skip(
+                        (12 if desc == DATA_DESCRIPTOR_SIG else 8)
+                        + (8 if is_zip64 else 0)
+                    )
+            if wanted:
+                if zlib.crc32(data) != crc:
+                    raise WheelValidationError(
+                        f"CRC check failed for {name!r} in ZIP stream"
+                    )
+                kept[name] = data
+        elif sig == CENTRAL_HEADER_SIG:
+            fields = CENTRAL_HEADER.unpack(reader.read(CENTRAL_HEADER.size))
+            flags, method = fields[2:4]
+            crc, csize, size, nlen, elen, clen = fields[6:12]
+            name = decode_name(reader.read(nlen), flags)
+            size, csize, _ = zip64_sizes(reader.read(elen), size, csize)
+            reader.skip(clen)
+            members.append(
+                ZipMember(
+                    name=name,
+                    size=size,
+                    crc=crc,
+                    compress_size=csize,
+                    compress_type=method,
+                )
+            )
+        elif sig == ZIP64_END_OF_CENTRAL_DIR_SIG:
+            (reclen,) = struct.unpack("<Q", reader.read(8))
+            reader.skip(reclen)
+        elif sig == ZIP64_LOCATOR_SIG:
+            reader.skip(16)
+        elif sig == END_OF_CENTRAL_DIR_SIG:
+            *_, clen = END_OF_CENTRAL_DIR.unpack(reader.read(END_OF_CENTRAL_DIR.size))
+            reader.skip(clen)
+            break
+        else:
+            raise WheelValidationError(
+                f"Invalid ZIP stream: unexpected signature {sig!r}"
+            )
+    if sorted(local_names) != sorted(m.name for m in members):
+        raise WheelValidationError(
+            "ZIP stream's central directory does not match its local file headers"
+        )
+    return (members, kept)
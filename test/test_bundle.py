@@ -0,0 +1,114 @@
+from __future__ import annotations
+from pathlib import Path
+import re
+import tarfile
+from zipfile import ZipFile
+from click.testing import CliRunner
+import pytest
+from pytest_mock import MockerFixture
+from check_wheel_contents.__main__ import main
+import check_wheel_contents.bundle
+from check_wheel_contents.bundle import is_bundle, iter_bundle
+
+WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
+
+WHEELS = [
+    "NLPTriples-0.1.7-py3-none-any.whl",
+    "physlearn-1.2.2-py3-none-any.whl",
+    "whatodo-0.1.0a4-py3-none-any.whl",
+]
+
+
+def make_bundle(path: Path) -> None:
+    if path.suffix == ".zip":
+        with ZipFile(path, "w") as zf:
+            zf.writestr("README.txt", "Not a wheel\n")
+            for name in WHEELS:
+                zf.write(WHEEL_DIR / name, f"wheelhouse/{name}")
+    else:
+        with tarfile.open(path, "w" if path.suffix == ".tar" else "w:gz") as tf:
+            tf.add(WHEEL_DIR / "NLPTriples-0.1.7-py3-none-any.json", "README.json")
+            for name in WHEELS:
+                tf.add(WHEEL_DIR / name, f"wheelhouse/{name}")
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("wheels.tar.gz", True),
+        ("wheels.TGZ", True),
+        ("wheels.tar", True),
+        ("wheels.zip", True),
+        ("foo-1.0-py3-none-any.whl", False),
+        ("foo-1.0.dist-info", False),
+    ],
+)
+def test_is_bundle(name: str, expected: bool) -> None:
+    assert is_bundle(name) is expected
+
+
+@pytest.mark.parametrize("bundle", ["wheels.tar.gz", "wheels.tar", "wheels.zip"])
+def test_iter_bundle(tmp_path: Path, bundle: str) -> None:
+    path = tmp_path / bundle
+    make_bundle(path)
+    members = []
+    for name, fp in iter_bundle(path, max_size=1024):
+        with fp:
+            assert fp.read() == (WHEEL_DIR / Path(name).name).read_bytes()
+        members.append(name)
+    assert members == [f"wheelhouse/{name}" for name in WHEELS]
+
+
+@pytest.mark.parametrize("bundle", ["wheels.tar.gz", "wheels.zip"])
+@pytest.mark.parametrize("jobs", ["1", "4"])
+def test_main_bundle(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, bundle: str, jobs: str
+) -> None:
+    make_bundle(tmp_path / bundle)
+    monkeypatch.chdir(WHEEL_DIR)
+    r = CliRunner().invoke(main, ["--no-config", "-j", jobs, *WHEELS])
+    assert r.exit_code == 1
+    expected = re.sub(
+        r"^(\S+\.whl):", rf"{tmp_path / bundle}:wheelhouse/\1:", r.stdout, flags=re.M
+    )
+    r = CliRunner().invoke(main, ["--no-config", "-j", jobs, str(tmp_path / bundle)])
+    assert r.exit_code == 1
+    assert r.stdout == expected
+
+
+@pytest.mark.parametrize("bundle", ["wheels.tar.gz", "wheels.zip"])
+def test_main_bundle_fail_fast_closes_files(
+    mocker: MockerFixture, tmp_path: Path, bundle: str
+) -> None:
+    make_bundle(tmp_path / bundle)
+    spy = mocker.spy(check_wheel_contents.bundle, "spool")
+    r = CliRunner().invoke(
+        main, ["--no-config", "--fail-fast", "-j", "4", str(tmp_path / bundle)]
+    )
+    assert r.exit_code == 1
+    assert "whatodo" not in r.stdout
+    assert spy.spy_return_list
+    assert all(fp.closed for fp in spy.spy_return_list)
+
+
+def test_main_bad_bundle(tmp_path: Path) -> None:
+    path = tmp_path / "wheels.tar.gz"
+    path.write_bytes(b"This is not a tarball.\n")
+    r = CliRunner().invoke(main, ["--no-config", str(path)])
+    assert r.exit_code == 1
+    assert r.stderr.startswith(f"{path}: invalid wheel: could not read bundle: ")
+
+
+@pytest.mark.parametrize("sdist", ["foo-1.0.tar.gz", "foo-1.0.zip"])
+def test_main_sdist(tmp_path: Path, sdist: str) -> None:
+    path = tmp_path / sdist
+    if path.suffix == ".zip":
+        with ZipFile(path, "w") as zf:
+            zf.writestr("foo-1.0/setup.py", "")
+    else:
+        with tarfile.open(path, "w:gz") as tf:
+            tf.add(WHEEL_DIR / "NLPTriples-0.1.7-py3-none-any.json", "foo-1.0/setup.py")
+    r = CliRunner().invoke(main, ["--no-config", str(path)])
+    assert r.exit_code == 1
+    assert r.stdout == ""
+    assert r.stderr == f"{path}: invalid wheel: no wheels found in bundle\n"
@@ -1,13 +1,24 @@
 from __future__ import annotations
+from operator import attrgetter
 from pathlib import Path
+import subprocess
+import sys
 from typing import Any
 import attr
 import pytest
 from pytest_mock import MockerFixture
-from check_wheel_contents.checker import NO_CONFIG, WheelChecker
-from check_wheel_contents.checks import Check
-from check_wheel_contents.config import Configuration
+from check_wheel_contents.checker import (
+    CHEAPEST_FIRST,
+    CHECK_SPECS,
+    NO_CONFIG,
+    WheelChecker,
+)
+from check_wheel_contents.checks import Check, Needs
 from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.lightconfig import LightConfiguration
+
+#: The checks that are run by `WheelChecker.check_contents()`
+PER_WHEEL_CHECKS = [c for c in Check if Needs.OTHER_WHEELS not in CHECK_SPECS[c].needs]
 
 
 def test_defaults() -> None:
@@ -16,65 +27,84 @@ def test_defaults() -> None:
         "selected": set(Check),
         "toplevel": None,
         "pkgtree": None,
+        "plugins": [],
+        "allowed_duplicates": frozenset(),
+        "max_library_size": None,
+        "max_file_size": None,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": None,
     }
 
 
 @pytest.mark.parametrize(
     "kwargs,cfg",
     [
-        ({}, Configuration()),
+        ({}, LightConfiguration()),
         (
             {
                 "configpath": "custom.cfg",
                 "select": {Check.W001, Check.W002, Check.W003, Check.W004},
             },
-            Configuration(
+            LightConfiguration(
                 select={Check.W001, Check.W002, Check.W003, Check.W004},
                 ignore={Check.W001, Check.W002},
             ),
         ),
         (
             {"configpath": None},
-            Configuration(select={Check.W001, Check.W002}),
+            LightConfiguration(select={Check.W001, Check.W002}),
         ),
         (
             {"configpath": None, "select": {Check.W003, Check.W004}},
-            Configuration(select={Check.W003, Check.W004}),
+            LightConfiguration(select={Check.W003, Check.W004}),
         ),
         (
             {"configpath": NO_CONFIG},
-            Configuration(),
+            LightConfiguration(),
         ),
         (
             {"toplevel": ["foo.py", "bar/"]},
-            Configuration(toplevel=["foo.py", "bar"]),
+            LightConfiguration(toplevel=["foo.py", "bar"]),
         ),
         (
             {"package": (), "src_dir": ()},
-            Configuration(),
+            LightConfiguration(),
         ),
         (
             {"package": ("bar/",)},
-            Configuration(package_paths=[Path("bar")]),
+            LightConfiguration(package_paths=[Path("bar")]),
         ),
         (
             {"src_dir": ("src/",)},
-            Configuration(src_dirs=[Path("src")]),
+            LightConfiguration(src_dirs=[Path("src")]),
         ),
         (
             {"package": ("foo.py", "bar"), "src_dir": ("src",)},
-            Configuration(
+            LightConfiguration(
                 package_paths=[Path("foo.py"), Path("bar")],
                 src_dirs=[Path("src")],
             ),
         ),
+        (
+            {"sdist": "dist/foo-1.0.tar.gz"},
+            LightConfiguration(sdist=Path("dist/foo-1.0.tar.gz")),
+        ),
+        (
+            {"max_library_size": 1 << 20, "max_file_size": 1024},
+            LightConfiguration(max_library_size=1 << 20, max_file_size=1024),
+        ),
+        (
+            {"max_stored_size": 1 << 16, "min_compression_ratio": 1.5},
+            LightConfiguration(max_stored_size=1 << 16, min_compression_ratio=1.5),
+        ),
         (
             {
                 "package": ("foo.py", "bar"),
                 "src_dir": ("src",),
                 "package_omit": ["__init__.py"],
             },
-            Configuration(
+            LightConfiguration(
                 package_paths=[Path("foo.py"), Path("bar")],
                 src_dirs=[Path("src")],
                 package_omit=["__init__.py"],
@@ -86,7 +116,7 @@ def test_configure_options(
     mocker: MockerFixture,
     monkeypatch: pytest.MonkeyPatch,
     kwargs: dict[str, Any],
-    cfg: Configuration,
+    cfg: LightConfiguration,
     tmp_path: Path,
 ) -> None:
     (tmp_path / "check-wheel-contents.cfg").write_text(
@@ -100,6 +130,21 @@ def test_configure_options(
     apply_mock.assert_called_once_with(cfg)
 
 
+def test_configure_options_no_pydantic(tmp_path: Path) -> None:
+    """
+    Test that pydantic is not imported when there is no configuration file
+    section to validate
+    """
+    script = (
+        "import sys\n"
+        "from check_wheel_contents.checker import NO_CONFIG, WheelChecker\n"
+        "WheelChecker().configure_options(configpath=NO_CONFIG, select=None)\n"
+        "WheelChecker().configure_options(configpath=None, toplevel=['foo'])\n"
+        "assert 'pydantic' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=str(tmp_path), check=True)
+
+
 def test_apply_config_calls(mocker: MockerFixture) -> None:
     pkgtree = Directory(
         path=None,
@@ -109,6 +154,13 @@ def test_apply_config_calls(mocker: MockerFixture) -> None:
         **{
             "get_selected_checks.return_value": mocker.sentinel.SELECTED,
             "get_package_tree.return_value": pkgtree,
+            "get_plugin_checks.return_value": [],
+            "get_allowed_duplicates.return_value": frozenset(),
+            "max_library_size": None,
+            "max_file_size": 1024,
+            "max_toplevel_size": None,
+            "max_stored_size": None,
+            "min_compression_ratio": None,
         },
     )
     cfg.toplevel = ["TOPLEVEL"]
@@ -118,6 +170,13 @@ def test_apply_config_calls(mocker: MockerFixture) -> None:
         "selected": mocker.sentinel.SELECTED,
         "toplevel": ["TOPLEVEL"],
         "pkgtree": pkgtree,
+        "plugins": [],
+        "allowed_duplicates": frozenset(),
+        "max_library_size": None,
+        "max_file_size": 1024,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": None,
     }
 
 
@@ -135,6 +194,13 @@ def test_apply_config_toplevel_pkgtree_mismatch_warning(
         **{
             "get_selected_checks.return_value": mocker.sentinel.SELECTED,
             "get_package_tree.return_value": pkgtree,
+            "get_plugin_checks.return_value": [],
+            "get_allowed_duplicates.return_value": frozenset(),
+            "max_library_size": None,
+            "max_file_size": None,
+            "max_toplevel_size": None,
+            "max_stored_size": None,
+            "min_compression_ratio": None,
         },
     )
     cfg.toplevel = ["bar.py", "foo"]
@@ -144,6 +210,13 @@ def test_apply_config_toplevel_pkgtree_mismatch_warning(
         "selected": mocker.sentinel.SELECTED,
         "toplevel": ["bar.py", "foo"],
         "pkgtree": pkgtree,
+        "plugins": [],
+        "allowed_duplicates": frozenset(),
+        "max_library_size": None,
+        "max_file_size": None,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": None,
     }
     captured = capsys.readouterr()
     assert captured.out == ""
@@ -190,6 +263,13 @@ def test_apply_config_no_warning(
         **{
             "get_selected_checks.return_value": mocker.sentinel.SELECTED,
             "get_package_tree.return_value": pkgtree,
+            "get_plugin_checks.return_value": [],
+            "get_allowed_duplicates.return_value": frozenset(),
+            "max_library_size": None,
+            "max_file_size": None,
+            "max_toplevel_size": None,
+            "max_stored_size": None,
+            "min_compression_ratio": None,
         },
     )
     cfg.toplevel = toplevel
@@ -199,6 +279,13 @@ def test_apply_config_no_warning(
         "selected": mocker.sentinel.SELECTED,
         "toplevel": toplevel,
         "pkgtree": pkgtree,
+        "plugins": [],
+        "allowed_duplicates": frozenset(),
+        "max_library_size": None,
+        "max_file_size": None,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": None,
     }
     captured = capsys.readouterr()
     assert captured.out == ""
@@ -224,7 +311,7 @@ def test_configure_options_error(value: Any) -> None:
 def test_check_contents(mocker: MockerFixture) -> None:
     checker = WheelChecker()
     check_mocks = {}
-    for c in Check:
+    for c in PER_WHEEL_CHECKS:
         check_mocks[c] = mocker.patch.object(
             checker,
             "check_" + c.name,
@@ -242,3 +329,86 @@ def test_check_contents(mocker: MockerFixture) -> None:
             m.assert_called_once_with(mocker.sentinel.CONTENTS)
         else:
             m.assert_not_called()
+
+
+def test_cheapest_first_covers_all_checks() -> None:
+    assert sorted(CHEAPEST_FIRST, key=attrgetter("name")) == list(Check)
+
+
+def test_check_contents_first_failure_only(mocker: MockerFixture) -> None:
+    checker = WheelChecker()
+    check_mocks = {}
+    for c in PER_WHEEL_CHECKS:
+        check_mocks[c] = mocker.patch.object(
+            checker,
+            "check_" + c.name,
+            return_value=(
+                [getattr(mocker.sentinel, c.name)]
+                if c in (Check.W001, Check.W003)
+                else []
+            ),
+        )
+    checker.selected = {Check.W001, Check.W003, Check.W004, Check.W008}
+    assert checker.check_contents(
+        mocker.sentinel.CONTENTS, first_failure_only=True
+    ) == [mocker.sentinel.W003]
+    for c, m in check_mocks.items():
+        if c in (Check.W003, Check.W008):
+            m.assert_called_once_with(mocker.sentinel.CONTENTS)
+        else:
+            m.assert_not_called()
+
+
+def test_check_specs_cover_all_checks() -> None:
+    assert list(CHECK_SPECS) == list(Check)
+    assert all(c is spec.check for c, spec in CHECK_SPECS.items())
+
+
+def test_plan() -> None:
+    checker = WheelChecker()
+    checker.selected = {Check.W101, Check.W001, Check.W008, Check.W002}
+    plan = checker.plan()
+    assert [s.check for s in plan.steps] == [
+        Check.W008,
+        Check.W002,
+        Check.W001,
+        Check.W101,
+    ]
+    assert plan.needs == {
+        Needs.TOPLEVEL,
+        Needs.SIGNATURES,
+        Needs.ALL_FILES,
+        Needs.LIBRARY_FILES,
+        Needs.PACKAGE_TREE,
+        Needs.ARCHIVE,
+        Needs.MEMBER_HASHES,
+    }
+    assert plan.cost == 171
+    assert plan.describe() == [
+        "W008 (cost 1; needs toplevel entries)",
+        "W002 (cost 20; needs ZIP archive, hashes of colliding ZIP members,"
+        " signatures)",
+        "W001 (cost 50; needs all files)",
+        "W101 (cost 100; needs library files, package tree)",
+    ]
+
+
+def test_get_pkgtree_paths(mocker: MockerFixture) -> None:
+    checker = WheelChecker()
+    assert checker.get_pkgtree_paths() is None
+    checker.pkgtree = Directory(
+        path=None,
+        entries={
+            "foo.py": File(("foo.py",), None, None),
+            "bar": Directory(
+                path="bar/",
+                entries={"__init__.py": File(("bar", "__init__.py"), None, None)},
+            ),
+        },
+    )
+    spy = mocker.spy(checker.pkgtree, "all_files")
+    assert checker.get_pkgtree_paths() == frozenset({"foo.py", "bar/__init__.py"})
+    assert checker.get_pkgtree_paths() == frozenset({"foo.py", "bar/__init__.py"})
+    assert spy.call_count == 1
+    checker.pkgtree = Directory()
+    assert checker.get_pkgtree_paths() == frozenset()
@@ -1,23 +1,45 @@
 from __future__ import annotations
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
 import pytest
 from check_wheel_contents.checker import COMMON_NAMES, WheelChecker
 from check_wheel_contents.checks import Check, FailedCheck
 from check_wheel_contents.contents import WheelContents
 from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.zipstream import ZipMember
 
 DUMMY_HASH = "sha256=NVefY26xjCmYCQCnZaKUTNc5WaqZHDKxVde8l72cVOk"
 DUMMY_SIZE = "69105"
 
 
-def wheel_from_paths(paths: Iterable[str]) -> WheelContents:
+def wheel_from_paths(
+    paths: Iterable[str] | Mapping[str, int | None],
+    members: list[ZipMember] | None = None,
+) -> WheelContents:
+    """
+    Construct a `WheelContents` whose :file:`RECORD` lists the given paths
+    plus :file:`METADATA` (unless already given).  If ``paths`` is a mapping,
+    its values are the files' sizes, with `None` meaning no size or hash, and
+    an added :file:`METADATA` has no size; otherwise, every file gets a dummy
+    size.  ``members`` becomes the ``archive``.
+    """
     whlcon = WheelContents(
         dist_info_dir="foo-1.0.dist-info",
         data_dir="foo-1.0.data",
         root_is_purelib=True,
+        archive=members,
     )
-    whlcon.add_record_rows([[p, DUMMY_HASH, DUMMY_SIZE] for p in paths])
-    whlcon.add_record_rows([["foo-1.0.dist-info/METADATA", DUMMY_HASH, DUMMY_SIZE]])
+    if isinstance(paths, Mapping):
+        rows = [
+            [p, "", ""] if size is None else [p, DUMMY_HASH, str(size)]
+            for p, size in paths.items()
+        ]
+        metadata = ["foo-1.0.dist-info/METADATA", "", ""]
+    else:
+        rows = [[p, DUMMY_HASH, DUMMY_SIZE] for p in paths]
+        metadata = ["foo-1.0.dist-info/METADATA", DUMMY_HASH, DUMMY_SIZE]
+    if all(r[0] != metadata[0] for r in rows):
+        rows.append(metadata)
+    whlcon.add_record_rows(rows)
     whlcon.validate_tree()
     return whlcon
 
@@ -314,6 +336,17 @@ def test_check_W001(paths: list[str], failures: list[FailedCheck]) -> None:
                 )
             ],
         ),
+        (
+            # Files without hashes (as when listed from the ZIP central
+            # directory) are not duplicates just because of their sizes:
+            [
+                ["foo-1.0.dist-info/METADATA", "", "950"],
+                ["foo/__init__.py", "", "0"],
+                ["foo/__main__.py", "", "1000"],
+                ["foo/bar.py", "", "1000"],
+            ],
+            [],
+        ),
     ],
 )
 def test_check_W002(rows: list[list[str]], failures: list[FailedCheck]) -> None:
@@ -328,6 +361,81 @@ def test_check_W002(rows: list[list[str]], failures: list[FailedCheck]) -> None:
     assert checker.check_W002(whlcon) == failures
 
 
+@pytest.mark.parametrize(
+    "members,failures",
+    [
+        (
+            [
+                ZipMember(name="foo/a.py", size=10, crc=1),
+                ZipMember(name="foo/b.py", size=10, crc=1),
+                ZipMember(name="foo/c.py", size=10, crc=2),
+                ZipMember(name="foo/d.py", size=11, crc=1),
+            ],
+            [FailedCheck(Check.W002, ["foo/a.py", "foo/b.py"])],
+        ),
+        (
+            # The hashes computed for colliding files take precedence:
+            [
+                ZipMember(name="foo/a.py", size=10, crc=1, digest="sha256=x"),
+                ZipMember(name="foo/b.py", size=10, crc=1, digest="sha256=y"),
+                ZipMember(name="foo/c.py", size=10, crc=1, digest="sha256=x"),
+                ZipMember(name="foo/d.py", size=10, crc=1, digest="sha256=y"),
+            ],
+            [
+                FailedCheck(Check.W002, ["foo/a.py", "foo/c.py"]),
+                FailedCheck(Check.W002, ["foo/b.py", "foo/d.py"]),
+            ],
+        ),
+        (
+            [
+                ZipMember(name="foo/a.py", size=0, crc=0),
+                ZipMember(name="foo/b.py", size=0, crc=0),
+                ZipMember(name="foo/c.py", size=1, crc=0x32D70693),
+                ZipMember(name="foo/d.py", size=1, crc=0x32D70693),
+            ],
+            [],
+        ),
+        (
+            [
+                ZipMember(name="foo/a.py", size=1, crc=5, digest=DUMMY_HASH),
+                ZipMember(name="foo/b.py", size=1, crc=5, digest=DUMMY_HASH),
+            ],
+            [],
+        ),
+    ],
+)
+def test_check_W002_hashless(
+    members: list[ZipMember], failures: list[FailedCheck]
+) -> None:
+    whlcon = WheelContents(
+        dist_info_dir="foo-1.0.dist-info",
+        data_dir="foo-1.0.data",
+        archive=members,
+    )
+    whlcon.add_zip_members(members)
+    checker = WheelChecker()
+    checker.allowed_duplicates = frozenset({DUMMY_HASH})
+    assert checker.check_W002(whlcon) == failures
+
+
+def test_check_W002_allowed_duplicates() -> None:
+    whlcon = wheel_from_paths(["foo/__init__.py", "foo/bar.py", "foo/baz.py"])
+    checker = WheelChecker()
+    assert checker.check_W002(whlcon) == [
+        FailedCheck(
+            Check.W002,
+            [
+                "foo/__init__.py",
+                "foo/bar.py",
+                "foo/baz.py",
+                "foo-1.0.dist-info/METADATA",
+            ],
+        )
+    ]
+    checker.allowed_duplicates = frozenset({DUMMY_HASH})
+    assert checker.check_W002(whlcon) == []
+
+
 @pytest.mark.parametrize(
     "paths,failures",
     [
@@ -928,3 +1036,283 @@ def test_check_W202(
     checker = WheelChecker()
     checker.configure_options(toplevel=toplevel)
     assert checker.check_W202(wheel_from_paths(paths)) == failures
+
+
+ARCHIVE_SIZES = {
+    "foo/__init__.py": 0,
+    "foo/bar.py": 100,
+    "foo-1.0.dist-info/METADATA": 50,
+    "foo-1.0.dist-info/RECORD": None,
+}
+
+ARCHIVE_MEMBERS = [
+    ZipMember(name="foo/__init__.py", size=0, crc=0),
+    ZipMember(name="foo/bar.py", size=100, crc=0),
+    ZipMember(name="foo-1.0.dist-info/METADATA", size=50, crc=0),
+    ZipMember(name="foo-1.0.dist-info/RECORD", size=321, crc=0),
+]
+
+
+@pytest.mark.parametrize(
+    "members,failures",
+    [
+        (ARCHIVE_MEMBERS, []),
+        ([ZipMember(name="foo/", size=0, crc=0), *ARCHIVE_MEMBERS], []),
+        (
+            [
+                *ARCHIVE_MEMBERS,
+                ZipMember(name="foo-1.0.dist-info/RECORD.jws", size=10, crc=0),
+            ],
+            [],
+        ),
+        (
+            [
+                *ARCHIVE_MEMBERS,
+                ZipMember(name="foo/_secret.py", size=10, crc=0),
+                ZipMember(name="RECORD.jws", size=10, crc=0),
+            ],
+            [FailedCheck(Check.W401, ["foo/_secret.py", "RECORD.jws"])],
+        ),
+    ],
+)
+def test_check_W401(members: list[ZipMember], failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    whlcon = wheel_from_paths(ARCHIVE_SIZES, members)
+    assert checker.check_W401(whlcon) == failures
+
+
+@pytest.mark.parametrize(
+    "members,failures",
+    [
+        (ARCHIVE_MEMBERS, []),
+        (
+            ARCHIVE_MEMBERS[1:3],
+            [FailedCheck(Check.W402, ["foo/__init__.py", "foo-1.0.dist-info/RECORD"])],
+        ),
+    ],
+)
+def test_check_W402(members: list[ZipMember], failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    whlcon = wheel_from_paths(ARCHIVE_SIZES, members)
+    assert checker.check_W402(whlcon) == failures
+
+
+@pytest.mark.parametrize(
+    "members,failures",
+    [
+        (ARCHIVE_MEMBERS, []),
+        (
+            [
+                ZipMember(name="foo/__init__.py", size=1, crc=0),
+                ZipMember(name="foo/bar.py", size=99, crc=0),
+                ZipMember(name="foo/baz.py", size=3, crc=0),
+            ],
+            [FailedCheck(Check.W403, ["foo/__init__.py", "foo/bar.py"])],
+        ),
+    ],
+)
+def test_check_W403(members: list[ZipMember], failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    whlcon = wheel_from_paths(ARCHIVE_SIZES, members)
+    assert checker.check_W403(whlcon) == failures
+
+
+def test_check_W4_no_archive() -> None:
+    checker = WheelChecker()
+    whlcon = wheel_from_paths(["foo.py"])
+    assert checker.check_W401(whlcon) == []
+    assert checker.check_W402(whlcon) == []
+    assert checker.check_W403(whlcon) == []
+
+
+FILE_SIZES = {
+    "foo/__init__.py": 0,
+    "foo/core.so": 3000,
+    "foo/data.bin": 5000,
+    "bar.py": 700,
+    "baz.pth": None,
+    "foo-1.0.data/platlib/qux.so": 2000,
+    "foo-1.0.data/scripts/big": 9000,
+    "foo-1.0.dist-info/METADATA": 100,
+}
+
+
+@pytest.mark.parametrize(
+    "limit,failures",
+    [
+        (None, []),
+        (10700, []),
+        (
+            10000,
+            [
+                FailedCheck(
+                    Check.W501,
+                    ["foo/", "foo-1.0.data/platlib/qux.so", "bar.py"],
+                    details=["7.8 KiB", "2.0 KiB", "700 B"],
+                )
+            ],
+        ),
+    ],
+)
+def test_check_W501(limit: int | None, failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    checker.configure_options(max_library_size=limit)
+    assert checker.check_W501(wheel_from_paths(FILE_SIZES)) == failures
+
+
+@pytest.mark.parametrize(
+    "limit,failures",
+    [
+        (None, []),
+        (9000, []),
+        (
+            4096,
+            [
+                FailedCheck(
+                    Check.W502,
+                    ["foo-1.0.data/scripts/big", "foo/data.bin"],
+                    details=["8.8 KiB", "4.9 KiB"],
+                )
+            ],
+        ),
+    ],
+)
+def test_check_W502(limit: int | None, failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    checker.configure_options(max_file_size=limit)
+    assert checker.check_W502(wheel_from_paths(FILE_SIZES)) == failures
+
+
+@pytest.mark.parametrize(
+    "limit,failures",
+    [
+        (None, []),
+        (8000, []),
+        (2000, [FailedCheck(Check.W503, ["foo/"], details=["7.8 KiB"])]),
+        (
+            500,
+            [
+                FailedCheck(
+                    Check.W503,
+                    ["foo/", "foo-1.0.data/platlib/qux.so", "bar.py"],
+                    details=["7.8 KiB", "2.0 KiB", "700 B"],
+                )
+            ],
+        ),
+    ],
+)
+def test_check_W503(limit: int | None, failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    checker.configure_options(max_toplevel_size=limit)
+    assert checker.check_W503(wheel_from_paths(FILE_SIZES)) == failures
+
+
+def test_check_W502_many_offenders() -> None:
+    sizes = {f"foo/mod{i:02d}.py": 1000 + i for i in range(12)}
+    checker = WheelChecker()
+    checker.configure_options(max_file_size=100)
+    assert checker.check_W502(wheel_from_paths(sizes)) == [
+        FailedCheck(
+            Check.W502,
+            [f"foo/mod{i:02d}.py" for i in range(11, 1, -1)],
+            details=[f"{1000 + i} B" for i in range(11, 1, -1)],
+            omitted=2,
+        )
+    ]
+
+
+COMPRESSED_MEMBERS = [
+    ZipMember(name="foo/", size=0, crc=0, compress_size=0, compress_type=0),
+    ZipMember(name="foo/__init__.py", size=0, crc=0, compress_size=0, compress_type=0),
+    ZipMember(
+        name="foo/core.py", size=9000, crc=0, compress_size=3000, compress_type=8
+    ),
+    ZipMember(
+        name="foo/data.bin", size=5000, crc=0, compress_size=5000, compress_type=0
+    ),
+    ZipMember(
+        name="foo/big.png", size=2000, crc=0, compress_size=1900, compress_type=8
+    ),
+    ZipMember(name="foo/icon.png", size=700, crc=0, compress_size=700, compress_type=0),
+]
+
+
+@pytest.mark.parametrize(
+    "limit,failures",
+    [
+        (None, []),
+        (5000, []),
+        (
+            500,
+            [
+                FailedCheck(
+                    Check.W504,
+                    ["foo/data.bin", "foo/icon.png"],
+                    details=["4.9 KiB", "700 B"],
+                )
+            ],
+        ),
+    ],
+)
+def test_check_W504(limit: int | None, failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    checker.configure_options(max_stored_size=limit)
+    assert checker.check_W504(wheel_from_paths([], COMPRESSED_MEMBERS)) == failures
+
+
+@pytest.mark.parametrize(
+    "ratio,failures",
+    [
+        (None, []),
+        # 16700 bytes uncompressed, 10600 bytes compressed
+        (1.5, []),
+        (
+            1.6,
+            [
+                FailedCheck(
+                    Check.W505,
+                    ["foo/data.bin", "foo/big.png", "foo/icon.png"],
+                    details=["4.9 KiB", "1.9 KiB", "700 B"],
+                    note="overall ratio 1.58",
+                )
+            ],
+        ),
+    ],
+)
+def test_check_W505(ratio: float | None, failures: list[FailedCheck]) -> None:
+    checker = WheelChecker()
+    checker.configure_options(min_compression_ratio=ratio)
+    assert checker.check_W505(wheel_from_paths([], COMPRESSED_MEMBERS)) == failures
+
+
+def test_check_W505_empty_files() -> None:
+    # No nonempty file is below the minimum ratio, but the empty files, each
+    # compressed to 2 bytes, drag the overall ratio down:
+    members = [
+        ZipMember(name="foo/a.py", size=100, crc=0, compress_size=50, compress_type=8),
+        *(
+            ZipMember(
+                name=f"foo/empty{i}.py", size=0, crc=0, compress_size=2, compress_type=8
+            )
+            for i in range(20)
+        ),
+    ]
+    checker = WheelChecker()
+    checker.configure_options(min_compression_ratio=1.5)
+    assert checker.check_W505(wheel_from_paths([], members)) == [
+        FailedCheck(Check.W505, [], note="overall ratio 1.11")
+    ]
+    assert checker.check_W505(wheel_from_paths([], members))[0].show() == (
+        "W505: Wheel compression ratio is below minimum (overall ratio 1.11)"
+    )
+
+
+def test_check_W50_compression_unknown() -> None:
+    checker = WheelChecker()
+    checker.configure_options(max_stored_size=0, min_compression_ratio=2)
+    whlcon = wheel_from_paths(["foo.py"])
+    assert checker.check_W504(whlcon) == []
+    assert checker.check_W505(whlcon) == []
+    whlcon = wheel_from_paths(["foo.py"], [ZipMember(name="foo.py", size=100, crc=0)])
+    assert checker.check_W504(whlcon) == []
+    assert checker.check_W505(whlcon) == []
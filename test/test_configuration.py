@@ -12,6 +12,7 @@ from check_wheel_contents.checks import Check
 from check_wheel_contents.config import TRAVERSAL_EXCLUSIONS, Configuration
 from check_wheel_contents.errors import UserInputError
 from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.lightconfig import LightConfiguration
 
 DATA_DIR = Path(__file__).with_name("data")
 PROJECT_TREE = DATA_DIR / "project-tree"
@@ -284,6 +285,26 @@ def test_from_file_bad_tool_section() -> None:
     assert str(excinfo.value).startswith(f"{path}: ")
 
 
+CONFIG_CLASSES: list[type[Configuration | LightConfiguration]] = [
+    Configuration,
+    LightConfiguration,
+]
+
+#: The names of the `LightConfiguration` fields for the `Configuration` aliases
+LIGHT_FIELDS = {"package": "package_paths", "src_dir": "src_dirs"}
+
+
+def validate(
+    cls: type[Configuration | LightConfiguration], data: dict[str, Any]
+) -> Configuration | LightConfiguration:
+    if cls is Configuration:
+        return Configuration.model_validate(data)
+    else:
+        return LightConfiguration(
+            **{LIGHT_FIELDS.get(k, k): v for k, v in data.items()}
+        )
+
+
 @pytest.mark.parametrize(
     "data,expected",
     [
@@ -295,8 +316,13 @@ def test_from_file_bad_tool_section() -> None:
         ({"package_omit": ["foo, bar,"]}, ["foo, bar,"]),
     ],
 )
-def test_convert_comma_list(data: dict[str, Any], expected: list[str] | None) -> None:
-    cfg = Configuration.model_validate(data)
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
+def test_convert_comma_list(
+    cls: type[Configuration | LightConfiguration],
+    data: dict[str, Any],
+    expected: list[str] | None,
+) -> None:
+    cfg = validate(cls, data)
     assert cfg.package_omit == expected
 
 
@@ -321,9 +347,12 @@ def test_convert_comma_list(data: dict[str, Any], expected: list[str] | None) ->
         ["foo", None],
     ],
 )
-def test_convert_comma_list_error(field: str, value: Any) -> None:
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
+def test_convert_comma_list_error(
+    cls: type[Configuration | LightConfiguration], field: str, value: Any
+) -> None:
     with pytest.raises(ValidationError):
-        Configuration.model_validate({field: value})
+        validate(cls, {field: value})
 
 
 @pytest.mark.parametrize(
@@ -336,8 +365,13 @@ def test_convert_comma_list_error(field: str, value: Any) -> None:
         ({"select": ["W001", "W002"]}, {Check.W001, Check.W002}),
     ],
 )
-def test_convert_check_set(data: dict[str, Any], expected: set[Check] | None) -> None:
-    cfg = Configuration.model_validate(data)
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
+def test_convert_check_set(
+    cls: type[Configuration | LightConfiguration],
+    data: dict[str, Any],
+    expected: set[Check] | None,
+) -> None:
+    cfg = validate(cls, data)
     assert cfg.select == expected
 
 
@@ -350,9 +384,15 @@ def test_convert_check_set(data: dict[str, Any], expected: set[Check] | None) ->
         (["W9", ""], "W9"),
     ],
 )
-def test_convert_check_set_error(field: str, value: list[str], badbit: str) -> None:
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
+def test_convert_check_set_error(
+    cls: type[Configuration | LightConfiguration],
+    field: str,
+    value: list[str],
+    badbit: str,
+) -> None:
     with pytest.raises(ValidationError) as excinfo:
-        Configuration.model_validate({field: value})
+        validate(cls, {field: value})
     assert f"Unknown/invalid check prefix: {badbit!r}" in str(excinfo.value)
 
 
@@ -431,6 +471,21 @@ def test_resolve_paths_require_dir_not_a_dir(
     )
 
 
+def test_resolve_paths_sdist(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    create_file(tmp_path / "path/dist/foo-1.0.tar.gz")
+    (tmp_path / "path/src").mkdir()
+    monkeypatch.chdir(tmp_path)
+    cfg = Configuration(sdist="dist/foo-1.0.tar.gz")
+    cfg.resolve_paths(Path("path/foo.cfg"))
+    assert cfg.sdist == tmp_path / "path" / "dist" / "foo-1.0.tar.gz"
+    cfg = Configuration(sdist="src")
+    with pytest.raises(UserInputError) as excinfo:
+        cfg.resolve_paths(Path("path/foo.cfg"))
+    assert str(excinfo.value) == "sdist: not a file: {!r}".format(
+        str(tmp_path / "path" / "src")
+    )
+
+
 @pytest.mark.parametrize(
     "toplevel_in,toplevel_out",
     [
@@ -485,7 +540,16 @@ def test_from_command_options(
         "toplevel": toplevel_out,
         "package_paths": package_out,
         "src_dirs": src_dir_out,
+        "sdist": None,
+        "src_from_git": None,
         "package_omit": package_omit_out,
+        "plugins": None,
+        "allow_duplicates": None,
+        "max_library_size": None,
+        "max_file_size": None,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": None,
     }
 
 
@@ -497,7 +561,16 @@ def test_from_command_options_default() -> None:
         "toplevel": None,
         "package_paths": None,
         "src_dirs": None,
+        "sdist": None,
+        "src_from_git": None,
         "package_omit": None,
+        "plugins": None,
+        "allow_duplicates": None,
+        "max_library_size": None,
+        "max_file_size": None,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": None,
     }
 
 
@@ -882,15 +955,18 @@ def test_get_package_tree_package_path_and_src_dir(
     )
 
 
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
 def test_get_package_tree_package_paths_conflict(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    cls: type[Configuration | LightConfiguration],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
 ) -> None:
     create_file(tmp_path / "bar/__init__.py")
     create_file(tmp_path / "bar/quux.py")
     create_file(tmp_path / "bar/glarch.py")
     create_file(tmp_path / "src/bar/gnusto.py")
     monkeypatch.chdir(tmp_path)
-    cfg = Configuration(package_paths=[Path("bar"), Path("src/bar")])
+    cfg = cls(package_paths=[Path("bar"), Path("src/bar")])
     with pytest.raises(UserInputError) as excinfo:
         cfg.get_package_tree()
     assert str(excinfo.value) == (
@@ -899,15 +975,18 @@ def test_get_package_tree_package_paths_conflict(
     )
 
 
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
 def test_get_package_tree_src_dirs_conflict(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    cls: type[Configuration | LightConfiguration],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
 ) -> None:
     create_file(tmp_path / "source/bar/__init__.py")
     create_file(tmp_path / "source/bar/quux.py")
     create_file(tmp_path / "source/bar/glarch.py")
     create_file(tmp_path / "src/bar/gnusto.py")
     monkeypatch.chdir(tmp_path)
-    cfg = Configuration(src_dirs=[Path("source"), Path("src")])
+    cfg = cls(src_dirs=[Path("source"), Path("src")])
     with pytest.raises(UserInputError) as excinfo:
         cfg.get_package_tree()
     assert str(excinfo.value) == (
@@ -916,15 +995,18 @@ def test_get_package_tree_src_dirs_conflict(
     )
 
 
+@pytest.mark.parametrize("cls", CONFIG_CLASSES)
 def test_get_package_tree_package_path_src_dir_conflict(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    cls: type[Configuration | LightConfiguration],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
 ) -> None:
     create_file(tmp_path / "bar/__init__.py")
     create_file(tmp_path / "bar/quux.py")
     create_file(tmp_path / "bar/glarch.py")
     create_file(tmp_path / "src/bar/gnusto.py")
     monkeypatch.chdir(tmp_path)
-    cfg = Configuration(package_paths=[Path("bar")], src_dirs=[Path("src")])
+    cfg = cls(package_paths=[Path("bar")], src_dirs=[Path("src")])
     with pytest.raises(UserInputError) as excinfo:
         cfg.get_package_tree()
     assert str(excinfo.value) == (
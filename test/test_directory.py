@@ -2,8 +2,10 @@ from __future__ import annotations
 import os
 from pathlib import Path
 import pytest
+from pytest_mock import MockerFixture
+from check_wheel_contents import filetree
 from check_wheel_contents.errors import WheelValidationError
-from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.filetree import Directory, File, TreeStats
 
 PROJECT_TREE = Path(__file__).with_name("data") / "project-tree"
 
@@ -329,6 +331,16 @@ def test_from_local_tree() -> None:
     )
 
 
+def test_from_local_tree_stats() -> None:
+    tree = Directory.from_local_tree(PROJECT_TREE)
+    assert tree.stats == TreeStats(files=5, modules=2, bytecode=2, size=0)
+    ptree = tree["project-tree"]
+    assert isinstance(ptree, Directory)
+    bar = ptree["bar"]
+    assert isinstance(bar, Directory)
+    assert bar.stats == TreeStats(files=2, modules=1, bytecode=1, size=0)
+
+
 def test_from_local_tree_no_include_root() -> None:
     assert Directory.from_local_tree(PROJECT_TREE, include_root=False) == Directory(
         path=None,
@@ -524,3 +536,114 @@ def test_from_local_tree_file_excluded() -> None:
         path=None,
         entries={"foo.pyc": File(("foo.pyc",), None, None)},
     )
+
+
+def test_view() -> None:
+    root = Directory()
+    root.add_entry(File.from_record_row(["foo.py", "", ""]))
+    root.add_entry(File.from_record_row(["foo-1.0.dist-info/RECORD", "", ""]))
+    view = Directory.view(root, ["foo-1.0.dist-info", "foo-1.0.data"])
+    assert view == Directory(entries={"foo.py": root["foo.py"]})
+    assert len(view.entries) == 1
+    assert "foo-1.0.dist-info" not in view
+    with pytest.raises(KeyError):
+        view["foo-1.0.dist-info"]
+    # Changes to the underlying directory show up in the view:
+    root.add_entry(File.from_record_row(["bar/baz.py", "", ""]))
+    root.add_entry(File.from_record_row(["foo-1.0.data/data/x", "", ""]))
+    assert list(view.entries) == ["foo.py", "bar"]
+    assert [f.path for f in view.all_files()] == ["foo.py", "bar/baz.py"]
+    # Entries added through the view go to the underlying directory:
+    view.add_entry(File.from_record_row(["quux.py", "", ""]))
+    assert "quux.py" in root
+    with pytest.raises(ValueError):
+        view.add_entry(File.from_record_row(["foo-1.0.data", "", ""]))
+    del view.entries["quux.py"]
+    assert "quux.py" not in root
+
+
+def test_module_files(mocker: MockerFixture) -> None:
+    root = Directory()
+    for path in [
+        "foo/__init__.py",
+        "foo/data.txt",
+        "foo/bar-baz/__init__.py",
+        "foo/bar-baz/qux/mod.py",
+        "foo/class.py",
+        "foo/ok.cpython-38-x86_64-linux-gnu.so",
+        "not-a-module.py",
+        "README.rst",
+    ]:
+        root.add_entry(File.from_record_row([path, "", ""]))
+    spy = mocker.spy(filetree, "is_module_name")
+    assert [(f.path, ok) for f, ok in root.module_files()] == [
+        ("foo/__init__.py", True),
+        ("foo/bar-baz/__init__.py", False),
+        ("foo/bar-baz/qux/mod.py", False),
+        ("foo/class.py", False),
+        ("foo/ok.cpython-38-x86_64-linux-gnu.so", True),
+        ("not-a-module.py", False),
+    ]
+    # Each directory name is checked at most once, and the names of
+    # directories inside invalid directories are not checked at all:
+    dirnames = [
+        c.args[0] for c in spy.call_args_list if c.args[0] in ("foo", "bar-baz", "qux")
+    ]
+    assert dirnames == ["foo", "bar-baz"]
+    foo = root["foo"]
+    assert isinstance(foo, Directory)
+    assert [f.path for f, _ in foo.module_files()] == [
+        "foo/__init__.py",
+        "foo/bar-baz/__init__.py",
+        "foo/bar-baz/qux/mod.py",
+        "foo/class.py",
+        "foo/ok.cpython-38-x86_64-linux-gnu.so",
+    ]
+
+
+def test_stats() -> None:
+    root = Directory()
+    assert root.stats == TreeStats()
+    for path, size in [
+        ("foo/__init__.py", 10),
+        ("foo/__pycache__/__init__.cpython-38.pyc", 20),
+        ("foo/data/data.txt", None),
+        ("foo/_ext.cpython-38-x86_64-linux-gnu.so", 300),
+        ("README", 4000),
+    ]:
+        root.add_entry(File.from_record_row([path, "", str(size or "")]))
+    root.add_entry(Directory("foo/empty/"))
+    assert root.stats == TreeStats(
+        files=5, modules=2, bytecode=1, size=4330, largest=4000
+    )
+    foo = root["foo"]
+    assert isinstance(foo, Directory)
+    assert foo.stats == TreeStats(files=4, modules=2, bytecode=1, size=330, largest=300)
+    assert foo["data"].stats == TreeStats(files=1)  # type: ignore[union-attr]
+    assert foo["empty"].stats == TreeStats()  # type: ignore[union-attr]
+    # Adding through a subdirectory only updates it and its descendants:
+    foo.add_entry(File.from_record_row(["foo/data/more.py", "", "5"]))
+    assert foo.stats == TreeStats(files=5, modules=3, bytecode=1, size=335, largest=300)
+    assert root.stats.files == 5
+    root.update_stats()
+    assert root.stats == TreeStats(
+        files=6, modules=3, bytecode=1, size=4335, largest=4000
+    )
+    # Directories constructed with entries compute their stats:
+    d = Directory(entries={"foo": foo, "x.py": File(("x.py",), 1, None)})
+    assert d.stats == TreeStats(files=6, modules=4, bytecode=1, size=336, largest=300)
+
+
+def test_view_stats() -> None:
+    root = Directory()
+    root.add_entry(File.from_record_row(["foo.py", "", "1"]))
+    root.add_entry(File.from_record_row(["foo-1.0.dist-info/RECORD", "", "10"]))
+    view = Directory.view(root, ["foo-1.0.dist-info"])
+    assert view.stats == TreeStats(files=1, modules=1, size=1, largest=1)
+    root.add_entry(File.from_record_row(["bar/baz.pyc", "", "100"]))
+    assert view.stats == TreeStats(
+        files=2, modules=1, bytecode=1, size=101, largest=100
+    )
+    assert root.stats == TreeStats(
+        files=3, modules=1, bytecode=1, size=111, largest=100
+    )
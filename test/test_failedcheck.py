@@ -1,4 +1,6 @@
 from __future__ import annotations
+import pickle
+import pytest
 from check_wheel_contents.checks import Check, FailedCheck
 
 
@@ -21,9 +23,34 @@ def test_show_args_filename() -> None:
     )
 
 
+def test_show_details_omitted() -> None:
+    fc = FailedCheck(
+        Check.W502, ["foo/big.so", "foo/data.bin"], ["1.2 MiB", "900 B"], omitted=3
+    )
+    assert fc.show() == (
+        f"W502: {Check.W502.value}:\n"
+        "  foo/big.so (1.2 MiB)\n"
+        "  foo/data.bin (900 B)\n"
+        "  ... and 3 more"
+    )
+
+
 def test_show_no_args_filename() -> None:
     fc = FailedCheck(Check.W001)
     assert (
         fc.show("dist/foo-1.0-py3-none-any.whl")
         == f"dist/foo-1.0-py3-none-any.whl: W001: {Check.W001.value}"
     )
+
+
+@pytest.mark.parametrize(
+    "fc",
+    [
+        FailedCheck(Check.W001),
+        FailedCheck(Check.W002, ["foo.py", "bar/foo.py"]),
+        FailedCheck(Check.W502, ["foo.so", "bar.so"], ["1.2 MiB", "900 B"], 3),
+        FailedCheck(Check.W505, ["foo.so"], ["1.2 MiB"], note="overall ratio 1.10"),
+    ],
+)
+def test_pickle(fc: FailedCheck) -> None:
+    assert pickle.loads(pickle.dumps(fc)) == fc
@@ -1,5 +1,7 @@
 from __future__ import annotations
 import pytest
+from pytest_mock import MockerFixture
+from check_wheel_contents import filetree
 from check_wheel_contents.errors import WheelValidationError
 from check_wheel_contents.filetree import File
 
@@ -21,6 +23,10 @@ from check_wheel_contents.filetree import File
             ["foo/bar.py", "", ""],
             File(parts=("foo", "bar.py"), size=None, hashsum=None),
         ),
+        (
+            [".foo/..bar/baz..", "", ""],
+            File(parts=(".foo", "..bar", "baz.."), size=None, hashsum=None),
+        ),
     ],
 )
 def test_from_record_row(row: list[str], expected: File) -> None:
@@ -249,6 +255,22 @@ def test_extension(path: str, ext: str) -> None:
     assert File.from_record_row([path, "", ""]).extension == ext
 
 
+def test_classification_cached(mocker: MockerFixture) -> None:
+    f = File.from_record_row(["foo-1.0.data/purelib/foo/bar.py", "", ""])
+    spy = mocker.spy(filetree, "classify_basename")
+    assert f.libparts == ("foo", "bar.py")
+    assert f.libparts is f.libparts
+    assert f.libpath == "foo/bar.py"
+    assert f.extension == ".py"
+    assert f.has_module_ext()
+    assert f.is_valid_module_path()
+    spy.assert_called_once_with("bar.py")
+    # Cached values do not affect equality or hashing:
+    g = File.from_record_row(["foo-1.0.data/purelib/foo/bar.py", "", ""])
+    assert f == g
+    assert hash(f) == hash(g)
+
+
 def test_signature() -> None:
     assert File.from_record_row(["foo.py", "sha256=abc", "42"]).signature == (
         42,
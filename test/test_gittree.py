@@ -0,0 +1,118 @@
+from __future__ import annotations
+from pathlib import Path
+import shutil
+import subprocess
+import pytest
+from check_wheel_contents.errors import UserInputError
+from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.gittree import git_ls_files, git_tree
+from check_wheel_contents.lightconfig import LightConfiguration
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="Git required")
+
+
+def create_file(p: Path) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.touch()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """
+    A Git repository with tracked files in :file:`src/` and untracked build
+    artifacts alongside them
+    """
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    for f in [
+        "src/foo/__init__.py",
+        "src/foo/bar.py",
+        "src/foo/tests/test_bar.py",
+        "src/foo/.gitignore",
+        "setup.py",
+    ]:
+        create_file(tmp_path / f)
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    for f in [
+        "src/foo/bar.pyc",
+        "src/foo/_speedups.c",
+        "src/foo/build/lib/foo/__init__.py",
+        "src/foo.egg-info/PKG-INFO",
+    ]:
+        create_file(tmp_path / f)
+    return tmp_path
+
+
+def test_git_ls_files(repo: Path) -> None:
+    assert sorted(git_ls_files(repo / "src")) == [
+        "foo/.gitignore",
+        "foo/__init__.py",
+        "foo/bar.py",
+        "foo/tests/test_bar.py",
+    ]
+
+
+def test_git_ls_files_not_repo(tmp_path: Path) -> None:
+    with pytest.raises(UserInputError) as excinfo:
+        git_ls_files(tmp_path)
+    assert str(excinfo.value).startswith(
+        f"{tmp_path}: could not list files tracked by git: "
+    )
+
+
+def test_git_tree_src_dir(repo: Path) -> None:
+    tree = git_tree(repo / "src", exclude=[".*", "tests"], include_root=False)
+    assert tree == Directory(
+        path=None,
+        entries={
+            "foo": Directory(
+                path="foo/",
+                entries={
+                    "__init__.py": File(("foo", "__init__.py"), None, None),
+                    "bar.py": File(("foo", "bar.py"), None, None),
+                },
+            ),
+        },
+    )
+    assert tree.stats.files == 2
+
+
+def test_git_tree_package(repo: Path) -> None:
+    exclude = ["*/src/foo/tests"]
+    tree = git_tree(repo / "src" / "foo", exclude=exclude)
+    assert tree == Directory(
+        path=None,
+        entries={
+            "foo": Directory(
+                path="foo/",
+                entries={
+                    ".gitignore": File(("foo", ".gitignore"), None, None),
+                    "__init__.py": File(("foo", "__init__.py"), None, None),
+                    "bar.py": File(("foo", "bar.py"), None, None),
+                },
+            ),
+        },
+    )
+    # Apart from the untracked files and empty directories, the result is the
+    # same as that of walking the filesystem:
+    shutil.rmtree(repo / "src" / "foo" / "build")
+    (repo / "src" / "foo" / "bar.pyc").unlink()
+    (repo / "src" / "foo" / "_speedups.c").unlink()
+    assert tree == Directory.from_local_tree(repo / "src" / "foo", exclude=exclude)
+
+
+def test_git_tree_file(repo: Path) -> None:
+    assert git_tree(repo / "setup.py") == Directory(
+        path=None, entries={"setup.py": File(("setup.py",), None, None)}
+    )
+    assert git_tree(repo / "src" / "foo" / "bar.pyc") == Directory()
+
+
+def test_get_package_tree_src_from_git(repo: Path) -> None:
+    cfg = LightConfiguration(src_dirs=[repo / "src"], src_from_git=True)
+    tree = cfg.get_package_tree()
+    assert tree is not None
+    assert sorted(f.path for f in tree.all_files()) == [
+        "foo/__init__.py",
+        "foo/bar.py",
+        "foo/tests/test_bar.py",
+    ]
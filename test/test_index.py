@@ -0,0 +1,243 @@
+from __future__ import annotations
+from pathlib import Path
+from zipfile import ZipFile
+from click.testing import CliRunner
+import pytest
+from check_wheel_contents.__main__ import main
+from check_wheel_contents.checker import WheelChecker
+from check_wheel_contents.checks import Check, FailedCheck
+from check_wheel_contents.contents import WheelContents
+from check_wheel_contents.index import (
+    DuplicateIndex,
+    ReleaseGroup,
+    ReleaseIndex,
+    project_name,
+)
+
+HASH_A = "sha256=NVefY26xjCmYCQCnZaKUTNc5WaqZHDKxVde8l72cVOk"
+HASH_B = "sha256=tQnRYEpcEVliJvvWU8Y4pAoe9rl1NqH6YJQuuPgXmtQ"
+
+
+def make_contents(project: str, rows: list[list[str]]) -> WheelContents:
+    whlcon = WheelContents(
+        dist_info_dir=f"{project}-1.0.dist-info",
+        data_dir=f"{project}-1.0.data",
+        root_is_purelib=True,
+    )
+    whlcon.add_record_rows(rows)
+    return whlcon
+
+
+def test_project_name() -> None:
+    assert project_name(make_contents("Foo_Bar", [])) == "foo-bar"
+
+
+def test_duplicate_index() -> None:
+    index = DuplicateIndex(WheelChecker().is_allowed_duplicate)
+    foo = make_contents(
+        "foo",
+        [
+            ["foo/six.py", HASH_A, "100"],
+            ["foo/other.py", HASH_B, "200"],
+            ["foo/__init__.py", "", ""],
+            ["foo-1.0.dist-info/LICENSE", HASH_B, "300"],
+        ],
+    )
+    assert index.add("foo-1.0-py3-none-any.whl", foo) == []
+    # Other wheels of the same project may contain the same files:
+    assert index.add("foo-1.0-cp38-none-any.whl", foo) == []
+    bar = make_contents(
+        "bar",
+        [
+            ["bar/__init__.py", "", ""],
+            ["bar/_vendor/six.py", HASH_A, "100"],
+            ["bar/_vendor/six2.py", HASH_A, "100"],
+            ["bar/license.txt", HASH_B, "300"],
+            ["bar-1.0.dist-info/RECORD", HASH_B, "200"],
+        ],
+    )
+    assert index.add("bar-1.0-py3-none-any.whl", bar) == [
+        FailedCheck(
+            Check.W301,
+            [
+                "bar/_vendor/six.py",
+                "bar/_vendor/six2.py",
+                "foo-1.0-py3-none-any.whl:foo/six.py",
+            ],
+        ),
+    ]
+    baz = make_contents("baz", [["baz.py", HASH_A, "100"]])
+    assert index.add("baz-1.0-py3-none-any.whl", baz) == [
+        FailedCheck(
+            Check.W301,
+            [
+                "baz.py",
+                "foo-1.0-py3-none-any.whl:foo/six.py",
+                "bar-1.0-py3-none-any.whl:bar/_vendor/six.py",
+            ],
+        ),
+    ]
+    assert index.signatures[(100, HASH_A)] == {
+        "foo": ("foo-1.0-py3-none-any.whl", "foo/six.py"),
+        "bar": ("bar-1.0-py3-none-any.whl", "bar/_vendor/six.py"),
+        "baz": ("baz-1.0-py3-none-any.whl", "baz.py"),
+    }
+
+
+def test_duplicate_index_allowed() -> None:
+    checker = WheelChecker()
+    checker.allowed_duplicates = frozenset({HASH_A})
+    index = checker.new_duplicate_index()
+    assert index is not None
+    index.add("foo.whl", make_contents("foo", [["foo.py", HASH_A, "100"]]))
+    assert index.add("bar.whl", make_contents("bar", [["bar.py", HASH_A, "100"]])) == []
+
+
+def test_new_duplicate_index_unselected() -> None:
+    checker = WheelChecker()
+    checker.selected = {Check.W001}
+    assert checker.new_duplicate_index() is None
+
+
+def write_wheel(dirpath: Path, project: str, files: dict[str, str]) -> str:
+    name = f"{project}-1.0-py3-none-any.whl"
+    record = "".join(f"{path},{sig},\n" for path, sig in files.items())
+    record += f"{project}-1.0.dist-info/RECORD,,\n"
+    with ZipFile(dirpath / name, "w") as zf:
+        zf.writestr(f"{project}-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(f"{project}-1.0.dist-info/RECORD", record)
+    return name
+
+
+def test_main_cross_wheel_duplicates(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    foo = write_wheel(tmp_path, "foo", {"foo/__init__.py": HASH_A})
+    bar = write_wheel(tmp_path, "bar", {"bar/__init__.py": HASH_B})
+    baz = write_wheel(tmp_path, "baz", {"baz/__init__.py": HASH_A})
+    args = ["--no-config", "--select=W301", foo, bar, baz]
+    r = CliRunner().invoke(main, args)
+    assert r.exit_code == 0
+    assert r.stdout == f"{foo}: OK\n{bar}: OK\n{baz}: OK\n"
+    r = CliRunner().invoke(main, ["--cross-project", *args])
+    assert r.exit_code == 1
+    assert r.stdout == (
+        f"{foo}: OK\n"
+        f"{bar}: OK\n"
+        f"{baz}: W301: Wheel contains files duplicated in another wheel:\n"
+        "  baz/__init__.py\n"
+        f"  {foo}:foo/__init__.py\n"
+    )
+    r = CliRunner().invoke(
+        main,
+        [
+            "--no-config",
+            "--select=W301",
+            "--cross-project",
+            f"--allow-duplicates={HASH_A}",
+            foo,
+            baz,
+        ],
+    )
+    assert r.exit_code == 0
+
+
+def test_release_index() -> None:
+    index = ReleaseIndex(frozenset({Check.W302, Check.W303}))
+    linux = make_contents(
+        "foo",
+        [
+            ["foo/__init__.py", HASH_A, "100"],
+            ["foo/core.py", HASH_A, "100"],
+            ["foo/_speedups.cpython-38-x86_64-linux-gnu.so", HASH_B, "500"],
+            ["foo/data.txt", HASH_B, "5"],
+        ],
+    )
+    windows = make_contents(
+        "foo",
+        [
+            ["foo/__init__.py", HASH_A, "100"],
+            ["foo/core.py", HASH_A, "100"],
+            ["foo/_speedups.cp38-win_amd64.pyd", HASH_A, "400"],
+        ],
+    )
+    stale = make_contents(
+        "foo",
+        [
+            ["foo/__init__.py", HASH_A, "100"],
+            ["foo/core.py", HASH_B, "120"],
+            ["foo/old.py", HASH_B, "120"],
+        ],
+    )
+    other = make_contents("bar", [["bar.py", HASH_A, "100"]])
+    index.add("foo-1.0-cp38-cp38-manylinux1_x86_64.whl", linux)
+    index.add(Path("dist", "foo-1.0-cp38-cp38-win_amd64.whl"), windows)
+    index.add("Foo-1.0.0-py3-none-any.whl", stale)
+    index.add("bar-1.0-py3-none-any.whl", other)
+    assert list(index.groups) == [("foo", "1"), ("bar", "1")]
+    assert index.check("foo-1.0-cp38-cp38-manylinux1_x86_64.whl") == [
+        FailedCheck(Check.W302, ["foo/old.py"])
+    ]
+    assert index.check(Path("dist", "foo-1.0-cp38-cp38-win_amd64.whl")) == [
+        FailedCheck(Check.W302, ["foo/old.py"])
+    ]
+    assert index.check("Foo-1.0.0-py3-none-any.whl") == [
+        FailedCheck(Check.W302, ["foo/_speedups.cpython-38-x86_64-linux-gnu.so"]),
+        FailedCheck(Check.W303, ["foo/core.py"]),
+    ]
+    assert index.check("bar-1.0-py3-none-any.whl") == []
+    assert index.check("unknown-1.0-py3-none-any.whl") == []
+    index.checks = frozenset({Check.W303})
+    assert index.check("Foo-1.0.0-py3-none-any.whl") == [
+        FailedCheck(Check.W303, ["foo/core.py"])
+    ]
+
+
+def test_release_group_platlib() -> None:
+    purelib = make_contents("foo", [["foo/__init__.py", HASH_A, "100"]])
+    platlib = WheelContents(
+        dist_info_dir="foo-1.0.dist-info",
+        data_dir="foo-1.0.data",
+        root_is_purelib=False,
+    )
+    platlib.add_record_rows([["foo-1.0.data/purelib/foo/__init__.py", HASH_B, "1"]])
+    group = ReleaseGroup()
+    assert group.add("a.whl", purelib) == 0
+    assert group.add("b.whl", platlib) == 1
+    assert group.missing_modules(0) == group.missing_modules(1) == []
+    # Ties are broken in favor of the first wheel:
+    assert group.differing_sources(0) == []
+    assert group.differing_sources(1) == ["foo-1.0.data/purelib/foo/__init__.py"]
+
+
+def test_new_release_index() -> None:
+    checker = WheelChecker()
+    assert checker.new_release_index() == ReleaseIndex(
+        frozenset({Check.W302, Check.W303})
+    )
+    checker.selected = {Check.W001, Check.W303}
+    assert checker.new_release_index() == ReleaseIndex(frozenset({Check.W303}))
+    checker.selected = {Check.W001}
+    assert checker.new_release_index() is None
+
+
+def test_main_matrix(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    foo1 = write_wheel(tmp_path, "foo", {"foo/__init__.py": HASH_A})
+    (tmp_path / "plat").mkdir()
+    foo2 = "plat/" + write_wheel(
+        tmp_path / "plat", "foo", {"foo/__init__.py": HASH_A, "foo/extra.py": HASH_B}
+    )
+    args = ["--no-config", "--select=W302,W303", foo1, foo2]
+    r = CliRunner().invoke(main, args)
+    assert r.exit_code == 0
+    assert r.stdout == f"{foo1}: OK\n{foo2}: OK\n"
+    r = CliRunner().invoke(main, ["--matrix", *args])
+    assert r.exit_code == 1
+    assert r.stdout == (
+        f"{foo1}: W302: Wheel is missing modules present in other wheels of the"
+        " same release:\n"
+        "  foo/extra.py\n"
+        f"{foo2}: OK\n"
+    )
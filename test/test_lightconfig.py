@@ -0,0 +1,244 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any
+from pydantic import ValidationError
+import pytest
+from pytest_mock import MockerFixture
+from check_wheel_contents.checks import Check
+from check_wheel_contents.config import Configuration
+from check_wheel_contents.errors import UserInputError
+from check_wheel_contents.filetree import Directory
+from check_wheel_contents.lightconfig import (
+    TRAVERSAL_EXCLUSIONS,
+    LightConfiguration,
+    load_config_section,
+)
+
+FIELDS = [
+    "select",
+    "ignore",
+    "toplevel",
+    "package_paths",
+    "src_dirs",
+    "sdist",
+    "src_from_git",
+    "package_omit",
+    "plugins",
+    "allow_duplicates",
+    "max_library_size",
+    "max_file_size",
+    "max_toplevel_size",
+    "max_stored_size",
+    "min_compression_ratio",
+]
+
+
+def fields_of(cfg: Configuration | LightConfiguration) -> dict[str, Any]:
+    return {f: getattr(cfg, f) for f in FIELDS}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"package_omit": ""},
+        {"package_omit": "foo"},
+        {"package_omit": "foo, bar,"},
+        {"package_omit": ["foo", "bar"]},
+        {"package_omit": ["foo, bar,"]},
+        {"plugins": "X001, Y"},
+        {"allow_duplicates": "sha256=abc, md5=def"},
+        {"allow_duplicates": ["sha256=abc"]},
+        {"max_library_size": "10M"},
+        {"max_file_size": 1024},
+        {"max_toplevel_size": "1.5 GiB"},
+        {"max_stored_size": "64K"},
+        {"min_compression_ratio": "1.5"},
+        {"min_compression_ratio": 2},
+        {"select": ""},
+        {"select": "W001"},
+        {"select": "W001, W002,"},
+        {"select": ["W001", "W002"]},
+        {"select": ["W1", Check.W001]},
+        {"ignore": {Check.W001, Check.W002}},
+        {"toplevel": "foo.py,bar/"},
+        {"toplevel": ["foo.py", "bar/"]},
+        {"package_paths": ("foo.py", "bar")},
+        {"src_dirs": [Path("src")]},
+        {"src_dirs": "src,source"},
+        {"sdist": "dist/foo-1.0.tar.gz"},
+        {"src_from_git": True},
+    ],
+)
+def test_same_as_configuration(data: dict[str, Any]) -> None:
+    assert fields_of(LightConfiguration(**data)) == fields_of(
+        Configuration.model_validate(data)
+    )
+
+
+@pytest.mark.parametrize(
+    "field,value",
+    [
+        (field, value)
+        for field in FIELDS
+        if field != "src_from_git" and not field.startswith(("max_", "min_"))
+        for value in [42, True, [42], ["foo", 42], ["foo", None]]
+    ]
+    + [
+        ("select", ["W001, W002,"]),
+        ("ignore", ["W9", ""]),
+        ("select", {"W001"}),
+        ("src_from_git", 42),
+        ("src_from_git", [True]),
+        ("max_file_size", -1),
+        ("max_file_size", ["1M"]),
+        ("max_file_size", "1X"),
+        ("max_file_size", ""),
+        ("min_compression_ratio", 0),
+        ("min_compression_ratio", -1.5),
+        ("min_compression_ratio", "lots"),
+        ("min_compression_ratio", [2]),
+    ],
+)
+def test_convert_error(field: str, value: Any) -> None:
+    with pytest.raises(ValidationError) as excinfo:
+        Configuration.model_validate({field: value})
+    with pytest.raises(ValidationError) as light_excinfo:
+        LightConfiguration(**{field: value})
+    assert str(light_excinfo.value) == str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"src_from_git": "yes"},
+        {"max_file_size": True},
+        {"min_compression_ratio": True},
+        {"max_file_size": 1024.0},
+    ],
+)
+def test_same_as_configuration_unusual(data: dict[str, Any]) -> None:
+    assert fields_of(LightConfiguration(**data)) == fields_of(
+        Configuration.model_validate(data)
+    )
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (0, 0),
+        (1000, 1000),
+        ("1000", 1000),
+        ("2K", 2048),
+        ("1.5 MiB", 3 << 19),
+        ("1g", 1 << 30),
+    ],
+)
+def test_convert_size(value: Any, expected: int) -> None:
+    assert LightConfiguration(max_file_size=value).max_file_size == expected
+    assert Configuration(max_file_size=value).max_file_size == expected
+
+
+@pytest.mark.parametrize("value,expected", [(2, 2.0), (1.5, 1.5), ("1.25", 1.25)])
+def test_convert_ratio(value: Any, expected: float) -> None:
+    cfg = LightConfiguration(min_compression_ratio=value)
+    assert cfg.min_compression_ratio == expected
+    cfg2 = Configuration(min_compression_ratio=value)
+    assert cfg2.min_compression_ratio == expected
+
+
+def test_from_command_options() -> None:
+    kwargs: dict[str, Any] = {
+        "select": {Check.W001, Check.W002},
+        "ignore": {Check.W003, Check.W004},
+        "toplevel": ["foo.py", "bar/"],
+        "package": ("foo.py", "bar"),
+        "src_dir": (),
+        "package_omit": ["RCS", "*.pyc"],
+    }
+    assert fields_of(LightConfiguration.from_command_options(**kwargs)) == (
+        fields_of(Configuration.from_command_options(**kwargs))
+    )
+
+
+def test_update_from_configuration() -> None:
+    cfg = LightConfiguration(select=["W001"], toplevel=["foo.py"])
+    cfg.update(
+        Configuration(
+            select={Check.W002},
+            package_paths=[Path("bar")],
+            package_omit=[],
+        )
+    )
+    assert cfg == LightConfiguration(
+        select={Check.W002},
+        toplevel=["foo.py"],
+        package_paths=[Path("bar")],
+        package_omit=[],
+    )
+
+
+def test_update_from_light() -> None:
+    cfg = LightConfiguration(select=["W001"], toplevel=["foo.py"])
+    cfg.update(LightConfiguration(ignore=["W002"], toplevel=[]))
+    assert cfg == LightConfiguration(
+        select={Check.W001}, ignore={Check.W002}, toplevel=[]
+    )
+
+
+@pytest.mark.parametrize(
+    "select,ignore,expected",
+    [
+        (None, None, set(Check)),
+        (None, {Check.W201, Check.W202}, set(Check) - {Check.W201, Check.W202}),
+        ({Check.W201, Check.W202}, {Check.W001, Check.W201}, {Check.W202}),
+    ],
+)
+def test_get_selected_checks(
+    select: set[Check] | None, ignore: set[Check] | None, expected: set[Check]
+) -> None:
+    cfg = LightConfiguration(select=select, ignore=ignore)
+    assert cfg.get_selected_checks() == expected
+
+
+def test_get_package_tree(mocker: MockerFixture) -> None:
+    assert LightConfiguration().get_package_tree() is None
+    tree = Directory()
+    fltmock = mocker.patch.object(Directory, "from_local_tree", return_value=tree)
+    cfg = LightConfiguration(package_paths=["foobar"])
+    assert cfg.get_package_tree() == tree
+    fltmock.assert_called_once_with(Path("foobar"), exclude=TRAVERSAL_EXCLUSIONS)
+
+
+@pytest.mark.parametrize(
+    "hashes,expected",
+    [
+        (None, frozenset()),
+        ([], frozenset()),
+        (["sha256=abc-_", "md5=def"], frozenset({"sha256=abc-_", "md5=def"})),
+    ],
+)
+def test_get_allowed_duplicates(
+    hashes: list[str] | None, expected: frozenset[str]
+) -> None:
+    cfg = LightConfiguration(allow_duplicates=hashes)
+    assert cfg.get_allowed_duplicates() == expected
+    assert Configuration(allow_duplicates=hashes).get_allowed_duplicates() == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "sha256=", "=abc", "sha256=a/b"])
+def test_get_allowed_duplicates_error(value: str) -> None:
+    cfg = LightConfiguration(allow_duplicates=[value])
+    with pytest.raises(UserInputError) as excinfo:
+        cfg.get_allowed_duplicates()
+    assert str(excinfo.value) == (
+        f"allow_duplicates: invalid hash (expected ALG=DIGEST): {value!r}"
+    )
+
+
+def test_load_config_section(tmp_path: Path) -> None:
+    (tmp_path / "empty.cfg").write_text("[other]\nselect = W001\n")
+    assert load_config_section(str(tmp_path / "empty.cfg")) is None
+    path = tmp_path / "pyproject.toml"
+    path.write_text('[tool.check-wheel-contents]\nselect = "W001"\n')
+    assert load_config_section(str(path)) == (path, {"select": "W001"})
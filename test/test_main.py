@@ -4,12 +4,14 @@ from operator import attrgetter
 from pathlib import Path
 from traceback import format_exception
 from typing import Any
+from zipfile import ZIP_STORED, ZipFile
 from click.testing import CliRunner, Result
 import pytest
 from pytest_mock import MockerFixture
-from check_wheel_contents.__main__ import main
+from check_wheel_contents.__main__ import args2wheelpaths, main
 from check_wheel_contents.checker import NO_CONFIG
 from check_wheel_contents.checks import Check
+from check_wheel_contents.contents import WheelContents
 
 WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
 
@@ -34,7 +36,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -46,7 +57,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -58,7 +78,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -70,7 +99,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -82,7 +120,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -94,7 +141,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -106,7 +162,16 @@ def show_result(r: Result) -> str:
                 "toplevel": ["foo", "bar/"],
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -118,7 +183,58 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": ("foo",),
                 "src_dir": ("src",),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
+            },
+        ),
+        (
+            ["--src-dir", "src", "--src-from-git"],
+            {
+                "configpath": None,
+                "select": None,
+                "ignore": None,
+                "toplevel": None,
+                "package": (),
+                "src_dir": ("src",),
+                "sdist": None,
+                "src_from_git": True,
+                "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
+            },
+        ),
+        (
+            ["--sdist", "foo-1.0.tar.gz"],
+            {
+                "configpath": None,
+                "select": None,
+                "ignore": None,
+                "toplevel": None,
+                "package": (),
+                "src_dir": (),
+                "sdist": "foo-1.0.tar.gz",
+                "src_from_git": False,
+                "package_omit": None,
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -130,7 +246,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": ["__*__", "test/data"],
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
         (
@@ -142,7 +267,16 @@ def show_result(r: Result) -> str:
                 "toplevel": None,
                 "package": (),
                 "src_dir": (),
+                "sdist": None,
+                "src_from_git": False,
                 "package_omit": [],
+                "plugins": None,
+                "allow_duplicates": None,
+                "max_library_size": None,
+                "max_file_size": None,
+                "max_toplevel_size": None,
+                "max_stored_size": None,
+                "min_compression_ratio": None,
             },
         ),
     ],
@@ -157,14 +291,19 @@ def test_options2configargs(
     (tmp_path / "foo").mkdir()
     (tmp_path / "src").mkdir()
     (tmp_path / "foo.cfg").touch()
+    (tmp_path / "foo-1.0.tar.gz").touch()
     monkeypatch.chdir(tmp_path)
     mock_checker = mocker.patch(
         "check_wheel_contents.__main__.WheelChecker",
         autospec=True,
     )
+    mock_checker.return_value.plugins = []
     r = CliRunner().invoke(main, options)
     assert r.exit_code == 0, show_result(r)
-    assert mock_checker.method_calls == [mocker.call().configure_options(**configargs)]
+    assert mock_checker.method_calls == [
+        mocker.call().configure_options(**configargs),
+        mocker.call().plan(),
+    ]
 
 
 @pytest.mark.parametrize(
@@ -238,3 +377,213 @@ def test_bad_config_error(
     assert r.exit_code != 0, show_result(r)
     assert f"Error: {cfgname}: " in r.output
     assert errmsg.format(missing_path=str(tmp_path / "missing")) in r.output
+
+
+def test_main_fail_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(str(WHEEL_DIR))
+    r = CliRunner().invoke(
+        main,
+        [
+            "--no-config",
+            "--fail-fast",
+            "NLPTriples-0.1.7-py3-none-any.whl",
+            "physlearn-1.2.2-py3-none-any.whl",
+            "whatodo-0.1.0a4-py3-none-any.whl",
+        ],
+    )
+    assert r.exit_code == 1, show_result(r)
+    assert r.stdout == (
+        "NLPTriples-0.1.7-py3-none-any.whl: OK\n"
+        "physlearn-1.2.2-py3-none-any.whl: W006: __init__.py at top level of"
+        " library:\n"
+        "  __init__.py\n"
+    )
+
+
+def make_installed(site_packages: Path, name: str, files: list[str]) -> Path:
+    dist_info = site_packages / f"{name}-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "WHEEL").write_text("Root-Is-Purelib: true\n")
+    (dist_info / "RECORD").write_text(
+        "".join(f"{f},sha256={name}{i},{i}\n" for i, f in enumerate(files, start=1))
+        + f"../../../bin/{name},,\n"
+        + f"{name}-1.0.dist-info/WHEEL,,\n"
+        + f"{name}-1.0.dist-info/RECORD,,\n"
+    )
+    return dist_info
+
+
+def test_args2wheelpaths_installed(tmp_path: Path) -> None:
+    foo = make_installed(tmp_path, "foo", ["foo.py"])
+    bar = make_installed(tmp_path, "bar", ["bar.py"])
+    (tmp_path / "baz-1.0.dist-info").mkdir()
+    (tmp_path / "quux-1.0-py3-none-any.whl").touch()
+    assert list(args2wheelpaths([str(tmp_path)], installed=True)) == [bar, foo]
+    assert list(args2wheelpaths([str(foo)], installed=True)) == [foo]
+    assert list(args2wheelpaths([str(tmp_path)])) == [
+        tmp_path / "quux-1.0-py3-none-any.whl"
+    ]
+
+
+def test_main_zip_listing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(Path(__file__).with_name("data") / "wheels")
+    whlname = "no_record-1.0.0-py3-none-any.whl"
+    r = CliRunner().invoke(main, ["--no-config", whlname])
+    assert r.exit_code == 1, show_result(r)
+    assert r.stderr == f"{whlname}: invalid wheel: No RECORD file in wheel\n"
+    r = CliRunner().invoke(main, ["--no-config", "--zip-listing=fallback", whlname])
+    assert r.exit_code == 0, show_result(r)
+    assert r.stdout == f"{whlname}: OK\n"
+
+
+def test_main_hash_collisions(mocker: MockerFixture, tmp_path: Path) -> None:
+    whlfile = tmp_path / "foo-1.0-py3-none-any.whl"
+    with ZipFile(whlfile, "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/a.py", "import sys\n")
+        zf.writestr("foo/b.py", "import sys\n")
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+    spy = mocker.spy(WheelContents, "hash_crc_duplicates")
+    r = CliRunner().invoke(
+        main, ["--no-config", "--zip-listing=always", "--ignore=W002", str(whlfile)]
+    )
+    assert r.exit_code == 0, show_result(r)
+    assert spy.call_count == 0
+    r = CliRunner().invoke(main, ["--no-config", "--zip-listing=always", str(whlfile)])
+    assert r.exit_code == 1, show_result(r)
+    assert spy.call_count == 1
+    assert r.stdout == (
+        f"{whlfile}: W002: Wheel contains duplicate files:\n"
+        "  foo/a.py\n"
+        "  foo/b.py\n"
+    )
+
+
+def test_main_record_mismatch(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    with ZipFile(tmp_path / "foo-1.0-py3-none-any.whl", "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/core.py", "print('Hello')\n")
+        zf.writestr("foo/extra.py", "")
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(
+            "foo-1.0.dist-info/RECORD",
+            "foo/__init__.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo/core.py,sha256=abc,42\n"
+            "foo/missing.py,sha256=def,10\n"
+            "foo-1.0.dist-info/WHEEL,sha256=ghi,22\n"
+            "foo-1.0.dist-info/RECORD,,\n",
+        )
+    monkeypatch.chdir(tmp_path)
+    r = CliRunner().invoke(
+        main, ["--no-config", "--select=W4", "foo-1.0-py3-none-any.whl"]
+    )
+    assert r.exit_code == 1, show_result(r)
+    assert r.stdout == (
+        "foo-1.0-py3-none-any.whl: W401: Wheel contains files not listed in"
+        " RECORD:\n"
+        "  foo/extra.py\n"
+        "foo-1.0-py3-none-any.whl: W402: RECORD lists files not present in"
+        " wheel:\n"
+        "  foo/missing.py\n"
+        "foo-1.0-py3-none-any.whl: W403: File sizes in RECORD do not match"
+        " wheel:\n"
+        "  foo/core.py\n"
+    )
+
+
+def test_main_size_budgets(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    with ZipFile(tmp_path / "foo-1.0-py3-none-any.whl", "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/data.bin", b"\0" * 3000)
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(
+            "foo-1.0.dist-info/RECORD",
+            "foo/__init__.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo/data.bin,sha256=abc,3000\n"
+            "foo-1.0.dist-info/WHEEL,sha256=def,22\n"
+            "foo-1.0.dist-info/RECORD,,\n",
+        )
+    monkeypatch.chdir(tmp_path)
+    r = CliRunner().invoke(
+        main,
+        [
+            "--no-config",
+            "--max-library-size=2K",
+            "--max-file-size=2.5k",
+            "--max-toplevel-size=4KiB",
+            "foo-1.0-py3-none-any.whl",
+        ],
+    )
+    assert r.exit_code == 1, show_result(r)
+    assert r.stdout == (
+        "foo-1.0-py3-none-any.whl: W501: Wheel library exceeds maximum size:\n"
+        "  foo/ (2.9 KiB)\n"
+        "foo-1.0-py3-none-any.whl: W502: Wheel contains file exceeding maximum"
+        " size:\n"
+        "  foo/data.bin (2.9 KiB)\n"
+    )
+    r = CliRunner().invoke(
+        main, ["--no-config", "--max-file-size=lots", "foo-1.0-py3-none-any.whl"]
+    )
+    assert r.exit_code != 0
+    assert "Invalid size: 'lots'" in r.output
+
+
+def test_main_compression(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    with ZipFile(tmp_path / "foo-1.0-py3-none-any.whl", "w", ZIP_STORED) as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/data.bin", b"\0" * 3000)
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(
+            "foo-1.0.dist-info/RECORD",
+            "foo/__init__.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo/data.bin,sha256=abc,3000\n"
+            "foo-1.0.dist-info/WHEEL,sha256=def,22\n"
+            "foo-1.0.dist-info/RECORD,,\n",
+        )
+    monkeypatch.chdir(tmp_path)
+    r = CliRunner().invoke(
+        main,
+        [
+            "--no-config",
+            "--max-stored-size=1K",
+            "--min-compression-ratio=2",
+            "foo-1.0-py3-none-any.whl",
+        ],
+    )
+    assert r.exit_code == 1, show_result(r)
+    assert r.stdout == (
+        "foo-1.0-py3-none-any.whl: W504: Wheel contains large uncompressed file:\n"
+        "  foo/data.bin (2.9 KiB)\n"
+        "foo-1.0-py3-none-any.whl: W505: Wheel compression ratio is below"
+        " minimum (overall ratio 1.00):\n"
+        "  foo/data.bin (2.9 KiB)\n"
+        "  foo-1.0.dist-info/RECORD (163 B)\n"
+        "  foo-1.0.dist-info/WHEEL (22 B)\n"
+    )
+    r = CliRunner().invoke(
+        main, ["--no-config", "--min-compression-ratio=0", "foo-1.0-py3-none-any.whl"]
+    )
+    assert r.exit_code != 0
+    assert "Invalid value for '--min-compression-ratio'" in r.output
+
+
+@pytest.mark.parametrize("jobs", ["1", "4"])
+def test_main_installed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, jobs: str
+) -> None:
+    make_installed(tmp_path / "site-packages", "foo", ["foo/__init__.py"])
+    make_installed(tmp_path / "site-packages", "bar", ["__init__.py", "bar.py"])
+    make_installed(tmp_path / "site-packages", "baz", ["baz/__init__.py"])
+    monkeypatch.chdir(tmp_path)
+    r = CliRunner().invoke(
+        main, ["--no-config", "--installed", "-j", jobs, "site-packages"]
+    )
+    assert r.exit_code == 1, show_result(r)
+    assert r.stdout == (
+        f"{Path('site-packages', 'bar-1.0.dist-info')}: W006: __init__.py at top"
+        " level of library:\n"
+        "  __init__.py\n"
+        f"{Path('site-packages', 'baz-1.0.dist-info')}: OK\n"
+        f"{Path('site-packages', 'foo-1.0.dist-info')}: OK\n"
+    )
@@ -0,0 +1,157 @@
+from __future__ import annotations
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from click.testing import CliRunner
+import pytest
+from pytest_mock import MockerFixture
+from check_wheel_contents.__main__ import main
+from check_wheel_contents.checker import WheelChecker
+from check_wheel_contents.checks import Check, FailedCheck, Needs, PluginCheck
+from check_wheel_contents.contents import WheelContents
+from check_wheel_contents.errors import UserInputError
+from check_wheel_contents.plugins import ENTRY_POINT_GROUP, load_plugins
+
+WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
+
+
+def check_license(_checker: WheelChecker, contents: WheelContents) -> list[FailedCheck]:
+    if any(f.parts[-1].startswith("LICENSE") for f in contents.filetree.all_files()):
+        return []
+    else:
+        return [X001.fail()]
+
+
+def check_so(_checker: WheelChecker, contents: WheelContents) -> list[FailedCheck]:
+    badfiles = [f.path for f in contents.filetree.all_files() if f.extension == ".so"]
+    return [X002.fail(badfiles)] if badfiles else []
+
+
+X001 = PluginCheck(
+    name="X001",
+    message="Wheel does not contain a license file",
+    func=check_license,
+    needs=frozenset({Needs.ALL_FILES}),
+    cost=50,
+)
+
+X002 = PluginCheck(
+    name="X002",
+    message="Wheel contains shared libraries",
+    func=check_so,
+)
+
+NOT_A_CHECK = object()
+
+
+def entry_point(name: str, attrname: str) -> EntryPoint:
+    return EntryPoint(
+        name=name, value=f"{__name__}:{attrname}", group=ENTRY_POINT_GROUP
+    )
+
+
+@pytest.fixture
+def mock_entry_points(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "check_wheel_contents.plugins.entry_points",
+        return_value=[
+            entry_point("X001", "X001"),
+            entry_point("X002", "X002"),
+            entry_point("Y001", "NOT_A_CHECK"),
+            entry_point("W001", "X001"),
+            entry_point("Z001", "X001"),
+        ],
+    )
+
+
+@pytest.mark.usefixtures("mock_entry_points")
+@pytest.mark.parametrize(
+    "prefixes,plugins",
+    [
+        ([], []),
+        (["X001"], [X001]),
+        (["X002", "X"], [X001, X002]),
+    ],
+)
+def test_load_plugins(prefixes: list[str], plugins: list[PluginCheck]) -> None:
+    assert load_plugins(prefixes) == plugins
+
+
+@pytest.mark.usefixtures("mock_entry_points")
+@pytest.mark.parametrize(
+    "prefixes,msg",
+    [
+        (["X003"], "Unknown/invalid plugin check prefix: 'X003'"),
+        (["W"], "Plugin check W001 conflicts with builtin check"),
+        (
+            ["Y"],
+            f"Entry point Y001 = '{__name__}:NOT_A_CHECK' is not a plugin check"
+            " named Y001",
+        ),
+        (
+            ["Z"],
+            f"Entry point Z001 = '{__name__}:X001' is not a plugin check named Z001",
+        ),
+    ],
+)
+def test_load_plugins_error(prefixes: list[str], msg: str) -> None:
+    with pytest.raises(UserInputError) as excinfo:
+        load_plugins(prefixes)
+    assert str(excinfo.value) == msg
+
+
+def test_load_plugins_lazy(mocker: MockerFixture) -> None:
+    ep = mocker.Mock()
+    ep.name = "X001"
+    other = mocker.Mock()
+    other.name = "Y001"
+    ep.load.return_value = X001
+    mocker.patch("check_wheel_contents.plugins.entry_points", return_value=[ep, other])
+    assert load_plugins(["X"]) == [X001]
+    ep.load.assert_called_once_with()
+    other.load.assert_not_called()
+
+
+def test_plan_with_plugins() -> None:
+    checker = WheelChecker()
+    checker.selected = {Check.W001, Check.W008, Check.W101}
+    checker.plugins = [X001, X002]
+    assert checker.plan().describe() == [
+        "W008 (cost 1; needs toplevel entries)",
+        "W001 (cost 50; needs all files)",
+        "X001 (cost 50; needs all files)",
+        "W101 (cost 100; needs library files, package tree)",
+        "X002 (cost 100; needs all files)",
+    ]
+
+
+def test_check_contents_with_plugins() -> None:
+    checker = WheelChecker()
+    checker.selected = {Check.W005}
+    checker.plugins = [X001, X002]
+    contents = WheelContents.from_wheel(WHEEL_DIR / "whatodo-0.1.0a4-py3-none-any.whl")
+    assert checker.check_contents(contents) == [
+        FailedCheck(Check.W005, ["src/"]),
+        FailedCheck(X001),
+    ]
+
+
+@pytest.mark.usefixtures("mock_entry_points")
+def test_main_plugins(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(str(WHEEL_DIR))
+    r = CliRunner().invoke(
+        main,
+        [
+            "--no-config",
+            "--select=W005",
+            "--plugins=X001",
+            "whatodo-0.1.0a4-py3-none-any.whl",
+        ],
+    )
+    assert r.exit_code == 1
+    assert r.stdout == (
+        "whatodo-0.1.0a4-py3-none-any.whl: W005: Wheel contains common toplevel"
+        " name in library:\n"
+        "  src/\n"
+        "whatodo-0.1.0a4-py3-none-any.whl: X001: Wheel does not contain a"
+        " license file\n"
+    )
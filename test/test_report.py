@@ -0,0 +1,169 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from click.testing import CliRunner
+import pytest
+from check_wheel_contents.__main__ import main
+from check_wheel_contents.checks import Check, FailedCheck, PluginCheck
+from check_wheel_contents.report import (
+    REPORTERS,
+    JSONLinesReporter,
+    JSONReporter,
+    SARIFReporter,
+    TextReporter,
+    WheelReport,
+)
+
+WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
+
+REPORTS = [
+    WheelReport(wheel="ok-1.0-py3-none-any.whl", failures=[], elapsed=0.5),
+    WheelReport(
+        wheel="bad-1.0-py3-none-any.whl",
+        failures=[
+            FailedCheck(Check.W001, ["bad/foo.pyc", "bad/bar.pyc"]),
+            FailedCheck(Check.W007),
+        ],
+        elapsed=0.25,
+    ),
+    WheelReport(wheel="broken.whl", error="wheel has invalid filename"),
+]
+
+
+def run_reporter(
+    cls: type, reports: list[WheelReport], plugins: list[PluginCheck] | None = None
+) -> list[tuple[str, bool]]:
+    lines: list[tuple[str, bool]] = []
+
+    def echo(line: str, err: bool) -> None:
+        lines.append((line, err))
+
+    reporter = cls(echo, plugins or [])
+    reporter.start()
+    for r in reports:
+        reporter.report(r)
+    reporter.finish()
+    return lines
+
+
+def test_wheel_report_ok() -> None:
+    assert [r.ok for r in REPORTS] == [True, False, False]
+
+
+def test_text_reporter() -> None:
+    assert run_reporter(TextReporter, REPORTS) == [
+        ("ok-1.0-py3-none-any.whl: OK", False),
+        (
+            "bad-1.0-py3-none-any.whl: W001: Wheel contains .pyc/.pyo files:\n"
+            "  bad/foo.pyc\n"
+            "  bad/bar.pyc",
+            False,
+        ),
+        ("bad-1.0-py3-none-any.whl: W007: Wheel library is empty", False),
+        ("broken.whl: wheel has invalid filename", True),
+    ]
+
+
+def test_jsonl_reporter() -> None:
+    lines = run_reporter(JSONLinesReporter, REPORTS)
+    assert all(not err for _, err in lines)
+    assert [json.loads(ln) for ln, _ in lines] == [
+        {
+            "wheel": "ok-1.0-py3-none-any.whl",
+            "ok": True,
+            "error": None,
+            "failures": [],
+            "elapsed": 0.5,
+        },
+        {
+            "wheel": "bad-1.0-py3-none-any.whl",
+            "ok": False,
+            "error": None,
+            "failures": [
+                {
+                    "check": "W001",
+                    "message": "Wheel contains .pyc/.pyo files",
+                    "paths": ["bad/foo.pyc", "bad/bar.pyc"],
+                    "details": [],
+                    "omitted": 0,
+                    "note": None,
+                },
+                {
+                    "check": "W007",
+                    "message": "Wheel library is empty",
+                    "paths": [],
+                    "details": [],
+                    "omitted": 0,
+                    "note": None,
+                },
+            ],
+            "elapsed": 0.25,
+        },
+        {
+            "wheel": "broken.whl",
+            "ok": False,
+            "error": "wheel has invalid filename",
+            "failures": [],
+            "elapsed": 0.0,
+        },
+    ]
+
+
+@pytest.mark.parametrize("reports", [[], REPORTS])
+def test_json_reporter(reports: list[WheelReport]) -> None:
+    lines = run_reporter(JSONReporter, reports)
+    assert json.loads("\n".join(ln for ln, _ in lines)) == [
+        r.as_json() for r in reports
+    ]
+
+
+@pytest.mark.parametrize("reports", [[], REPORTS])
+def test_sarif_reporter(reports: list[WheelReport]) -> None:
+    lines = run_reporter(SARIFReporter, reports)
+    log = json.loads("\n".join(ln for ln, _ in lines))
+    assert log["version"] == "2.1.0"
+    (run,) = log["runs"]
+    assert [r["id"] for r in run["tool"]["driver"]["rules"]] == [c.name for c in Check]
+    assert [(r.get("ruleId"), r["message"]["text"]) for r in run["results"]] == (
+        [
+            (
+                "W001",
+                "Wheel contains .pyc/.pyo files: bad/foo.pyc, bad/bar.pyc",
+            ),
+            ("W007", "Wheel library is empty"),
+            (None, "wheel has invalid filename"),
+        ]
+        if reports
+        else []
+    )
+
+
+def test_sarif_reporter_plugins() -> None:
+    plugin = PluginCheck(name="X001", message="Plugin failed", func=lambda _c, _w: [])
+    report = WheelReport(
+        wheel="bad-1.0-py3-none-any.whl",
+        failures=[FailedCheck(plugin, ["bad/foo.py"])],
+    )
+    lines = run_reporter(SARIFReporter, [report], [plugin])
+    (run,) = json.loads("\n".join(ln for ln, _ in lines))["runs"]
+    rules = run["tool"]["driver"]["rules"]
+    assert [r["id"] for r in rules] == [c.name for c in Check] + ["X001"]
+    assert rules[-1]["shortDescription"] == {"text": "Plugin failed"}
+    assert [r["ruleId"] for r in run["results"]] == ["X001"]
+
+
+@pytest.mark.parametrize("fmt", sorted(REPORTERS))
+def test_main_format(monkeypatch: pytest.MonkeyPatch, fmt: str) -> None:
+    monkeypatch.chdir(str(WHEEL_DIR))
+    wheels = sorted(p.name for p in WHEEL_DIR.glob("*.whl"))
+    r = CliRunner().invoke(main, ["--no-config", "--format", fmt, *wheels])
+    assert r.exit_code == 1
+    if fmt == "json":
+        data = json.loads(r.stdout)
+        assert [d["wheel"] for d in data] == wheels
+    elif fmt == "jsonl":
+        data = [json.loads(ln) for ln in r.stdout.splitlines()]
+        assert [d["wheel"] for d in data] == wheels
+    elif fmt == "sarif":
+        data = json.loads(r.stdout)
+        assert data["runs"][0]["results"]
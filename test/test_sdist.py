@@ -0,0 +1,265 @@
+from __future__ import annotations
+from pathlib import Path
+import tarfile
+from zipfile import ZipFile
+from click.testing import CliRunner
+import pytest
+from check_wheel_contents.__main__ import main
+from check_wheel_contents.errors import UserInputError
+from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.lightconfig import TRAVERSAL_EXCLUSIONS, LightConfiguration
+from check_wheel_contents.sdist import normalize_member, sdist_tree
+
+
+def create_file(p: Path) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.touch()
+
+
+def make_sdist(tmp_path: Path, files: list[str], fmt: str) -> Path:
+    """
+    Create an sdist named ``foo-1.0`` containing the given files (relative to
+    the toplevel directory) and return its path
+    """
+    srcdir = tmp_path / "foo-1.0"
+    for f in files:
+        create_file(srcdir / f)
+    if fmt == "zip":
+        path = tmp_path / "foo-1.0.zip"
+        with ZipFile(path, "w") as zf:
+            for p in sorted(srcdir.rglob("*")):
+                zf.write(p, p.relative_to(tmp_path).as_posix())
+    else:
+        path = tmp_path / "foo-1.0.tar.gz"
+        with tarfile.open(path, "w:gz") as tf:
+            tf.add(srcdir, "foo-1.0")
+    return path
+
+
+@pytest.mark.parametrize(
+    "normed,parts",
+    [
+        ("foo-1.0", ("foo-1.0",)),
+        ("./foo-1.0/foo/", ("foo-1.0", "foo")),
+        ("foo-1.0//foo/./bar.py", ("foo-1.0", "foo", "bar.py")),
+        ("/foo-1.0/foo.py", None),
+        ("foo-1.0/../foo.py", None),
+    ],
+)
+def test_normalize_member(normed: str, parts: tuple[str, ...] | None) -> None:
+    assert normalize_member(normed) == parts
+
+
+@pytest.mark.parametrize("fmt", ["tar", "zip"])
+def test_sdist_tree_src_layout(tmp_path: Path, fmt: str) -> None:
+    path = make_sdist(
+        tmp_path,
+        [
+            "PKG-INFO",
+            "setup.py",
+            "src/foo/__init__.py",
+            "src/foo/bar.py",
+            "src/foo/bar.pyc",
+            "src/foo/__pycache__/bar.cpython-312.pyc",
+            "src/foo.egg-info/PKG-INFO",
+            "test/test_foo.py",
+        ],
+        fmt,
+    )
+    tree = sdist_tree(path, exclude=TRAVERSAL_EXCLUSIONS)
+    assert tree == Directory.from_local_tree(
+        tmp_path / "foo-1.0" / "src", exclude=TRAVERSAL_EXCLUSIONS, include_root=False
+    )
+    assert tree == Directory(
+        path=None,
+        entries={
+            "foo": Directory(
+                path="foo/",
+                entries={
+                    "__init__.py": File(("foo", "__init__.py"), None, None),
+                    "bar.py": File(("foo", "bar.py"), None, None),
+                    "__pycache__": Directory(path="foo/__pycache__/"),
+                },
+            ),
+        },
+    )
+    assert tree.stats.files == 2
+
+
+@pytest.mark.parametrize("fmt", ["tar", "zip"])
+def test_sdist_tree_flat_layout(tmp_path: Path, fmt: str) -> None:
+    path = make_sdist(
+        tmp_path,
+        ["PKG-INFO", "setup.py", "foo/__init__.py", "test/test_foo.py"],
+        fmt,
+    )
+    assert sdist_tree(path, exclude=[], toplevel=["foo"]) == Directory(
+        path=None,
+        entries={
+            "foo": Directory(
+                path="foo/",
+                entries={"__init__.py": File(("foo", "__init__.py"), None, None)},
+            ),
+        },
+    )
+    with pytest.raises(UserInputError) as excinfo:
+        sdist_tree(path, exclude=[])
+    assert str(excinfo.value) == (
+        f"{path}: sdist does not have a src/ directory; use --toplevel to"
+        " specify the packages & modules to check"
+    )
+
+
+def test_main_sdist_flat_layout(tmp_path: Path) -> None:
+    sdist = make_sdist(
+        tmp_path, ["PKG-INFO", "setup.py", "foo/__init__.py", "foo/bar.py"], "tar"
+    )
+    whl = tmp_path / "foo-1.0-py3-none-any.whl"
+    with ZipFile(whl, "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/bar.py", "")
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(
+            "foo-1.0.dist-info/RECORD",
+            "foo/__init__.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo/bar.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo-1.0.dist-info/WHEEL,,\n"
+            "foo-1.0.dist-info/RECORD,,\n",
+        )
+    r = CliRunner().invoke(
+        main,
+        ["--no-config", "--ignore=W002", "--sdist", str(sdist), str(whl)],
+    )
+    assert r.exit_code != 0
+    assert (
+        f"{sdist}: sdist does not have a src/ directory; use --toplevel to"
+        " specify the packages & modules to check"
+    ) in r.output
+    r = CliRunner().invoke(
+        main,
+        [
+            "--no-config",
+            "--ignore=W002",
+            "--sdist",
+            str(sdist),
+            "--toplevel=foo",
+            str(whl),
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert r.stdout == f"{whl}: OK\n"
+
+
+def test_sdist_tree_omit_patterns(tmp_path: Path) -> None:
+    path = make_sdist(
+        tmp_path,
+        [
+            "src/foo/__init__.py",
+            "src/foo/tests/test_bar.py",
+            "src/foo/data/tests/data.txt",
+        ],
+        "tar",
+    )
+    # Patterns are matched against paths relative to the toplevel directory,
+    # like those for --package & --src-dir are matched against full paths:
+    assert sdist_tree(path, exclude=["src/foo/tests"]) == Directory(
+        path=None,
+        entries={
+            "foo": Directory(
+                path="foo/",
+                entries={
+                    "__init__.py": File(("foo", "__init__.py"), None, None),
+                    "data": Directory(
+                        path="foo/data/",
+                        entries={
+                            "tests": Directory(
+                                path="foo/data/tests/",
+                                entries={
+                                    "data.txt": File(
+                                        ("foo", "data", "tests", "data.txt"),
+                                        None,
+                                        None,
+                                    ),
+                                },
+                            ),
+                        },
+                    ),
+                },
+            ),
+        },
+    )
+    assert sdist_tree(path, exclude=["tests"]) == Directory(
+        path=None,
+        entries={
+            "foo": Directory(
+                path="foo/",
+                entries={
+                    "__init__.py": File(("foo", "__init__.py"), None, None),
+                    "data": Directory(path="foo/data/"),
+                },
+            ),
+        },
+    )
+
+
+def test_sdist_tree_multiple_toplevels(tmp_path: Path) -> None:
+    path = tmp_path / "foo-1.0.zip"
+    with ZipFile(path, "w") as zf:
+        zf.writestr("foo-1.0/foo.py", "")
+        zf.writestr("bar.py", "")
+    with pytest.raises(UserInputError) as excinfo:
+        sdist_tree(path, exclude=[])
+    assert str(excinfo.value) == (
+        f"{path}: sdist does not have a single toplevel directory"
+    )
+
+
+def test_sdist_tree_not_archive(tmp_path: Path) -> None:
+    path = tmp_path / "foo-1.0.tar.gz"
+    path.write_text("This is not an archive.\n")
+    with pytest.raises(UserInputError) as excinfo:
+        sdist_tree(path, exclude=[])
+    assert str(excinfo.value).startswith(f"{path}: could not read sdist: ")
+
+
+def test_get_package_tree_sdist_conflict(tmp_path: Path) -> None:
+    path = make_sdist(tmp_path, ["src/foo/__init__.py"], "tar")
+    create_file(tmp_path / "src" / "foo" / "__init__.py")
+    cfg = LightConfiguration(src_dirs=[tmp_path / "src"], sdist=path)
+    with pytest.raises(UserInputError) as excinfo:
+        cfg.get_package_tree()
+    assert str(excinfo.value) == (
+        f"`--sdist {path}` adds 'foo' to file tree, but it is already present"
+        " from prior --package or --src-dir option"
+    )
+
+
+def test_main_sdist(tmp_path: Path) -> None:
+    sdist = make_sdist(
+        tmp_path, ["src/foo/__init__.py", "src/foo/bar.py", "src/foo/quux.py"], "tar"
+    )
+    whl = tmp_path / "foo-1.0-py3-none-any.whl"
+    with ZipFile(whl, "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/bar.py", "")
+        zf.writestr("foo/glarch.py", "")
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(
+            "foo-1.0.dist-info/RECORD",
+            "foo/__init__.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo/bar.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo/glarch.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+            "foo-1.0.dist-info/WHEEL,,\n"
+            "foo-1.0.dist-info/RECORD,,\n",
+        )
+    r = CliRunner().invoke(
+        main,
+        ["--no-config", "--ignore=W002", "--sdist", str(sdist), str(whl)],
+    )
+    assert r.exit_code == 1
+    assert r.stdout == (
+        f"{whl}: W101: Wheel library is missing files in package tree:\n"
+        "  foo/quux.py\n"
+        f"{whl}: W102: Wheel library contains files not in package tree:\n"
+        "  foo/glarch.py\n"
+    )
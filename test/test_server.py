@@ -0,0 +1,303 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterator
+import json
+from operator import attrgetter
+import os
+from pathlib import Path
+import signal
+import socket
+import threading
+import time
+from typing import Any
+from click.testing import CliRunner
+import pytest
+from check_wheel_contents.__main__ import main
+from check_wheel_contents.checker import NO_CONFIG, WheelChecker
+from check_wheel_contents.checks import Check
+from check_wheel_contents.errors import UserInputError
+from check_wheel_contents.server import (
+    HAS_UNIX_SOCKETS,
+    CheckServer,
+    decode_options,
+    encode_options,
+    send_request,
+    serve,
+)
+
+pytestmark = pytest.mark.skipif(
+    not HAS_UNIX_SOCKETS, reason="Unix domain sockets not supported"
+)
+
+WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
+
+
+@pytest.fixture(scope="module")
+def server_socket(tmp_path_factory: pytest.TempPathFactory) -> Iterator[str]:
+    socket_path = str(tmp_path_factory.mktemp("server") / "cwc.sock")
+    server = CheckServer(socket_path, jobs=2)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield socket_path
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def test_encode_decode_options(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "cfg.ini").write_text("[check-wheel-contents]\nselect = W001\n")
+    monkeypatch.chdir(tmp_path)
+    options = encode_options(
+        configpath="cfg.ini",
+        select={Check.W002, Check.W001},
+        ignore=None,
+        toplevel=["pkg"],
+        package=("pkg",),
+        src_dir=(),
+        package_omit=None,
+        plugins=["X1"],
+        allow_duplicates=["sha256=abc"],
+        max_file_size=1 << 20,
+        min_compression_ratio=1.5,
+    )
+    assert json.loads(json.dumps(options)) == options
+    assert decode_options(options) == {
+        "configpath": str(tmp_path / "cfg.ini"),
+        "select": {Check.W001, Check.W002},
+        "ignore": None,
+        "toplevel": ["pkg"],
+        "package": (str(tmp_path / "pkg"),),
+        "src_dir": (),
+        "sdist": None,
+        "src_from_git": False,
+        "package_omit": None,
+        "plugins": ["X1"],
+        "allow_duplicates": ["sha256=abc"],
+        "max_library_size": None,
+        "max_file_size": 1 << 20,
+        "max_toplevel_size": None,
+        "max_stored_size": None,
+        "min_compression_ratio": 1.5,
+    }
+
+
+def test_encode_options_default_config(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert decode_options(encode_options(configpath=None))["configpath"] is NO_CONFIG
+    (tmp_path / "tox.ini").write_text("[check-wheel-contents]\nselect = W001\n")
+    assert decode_options(encode_options(configpath=None))["configpath"] == str(
+        tmp_path / "tox.ini"
+    )
+
+
+@pytest.mark.parametrize(
+    "whlfile",
+    list(WHEEL_DIR.glob("*.whl")),
+    ids=attrgetter("name"),
+)
+def test_connect(
+    monkeypatch: pytest.MonkeyPatch, server_socket: str, whlfile: Path
+) -> None:
+    with whlfile.with_suffix(".json").open() as fp:
+        expected = json.load(fp)
+    monkeypatch.chdir(str(WHEEL_DIR))
+    r = CliRunner().invoke(
+        main, ["--connect", server_socket, "--no-config", whlfile.name]
+    )
+    assert r.exit_code == expected["rc"]
+    assert r.stdout.rstrip() == expected["stdout"]
+    assert r.stderr.rstrip() == expected["stderr"]
+
+
+def test_checker_reuse(server_socket: str) -> None:
+    request = {
+        "cwd": str(WHEEL_DIR),
+        "options": encode_options(configpath=NO_CONFIG, select={Check.W007}),
+        "wheels": ["whatodo-0.1.0a4-py3-none-any.whl"],
+    }
+    lines: list[tuple[str, bool]] = []
+
+    def echo(line: str, err: bool) -> None:
+        lines.append((line, err))
+
+    assert send_request(server_socket, request, echo) == 0
+    assert send_request(server_socket, request, echo) == 0
+    assert lines == [("whatodo-0.1.0a4-py3-none-any.whl: OK", False)] * 2
+
+
+def test_bad_config(server_socket: str, tmp_path: Path) -> None:
+    cfgpath = tmp_path / "cfg.ini"
+    cfgpath.write_text("[check-wheel-contents]\nselect = W9\n")
+    request = {
+        "cwd": str(tmp_path),
+        "options": encode_options(configpath=str(cfgpath)),
+        "wheels": [],
+    }
+    with pytest.raises(UserInputError) as excinfo:
+        send_request(server_socket, request, lambda _line, _err: None)
+    assert "Unknown/invalid check prefix: 'W9'" in str(excinfo.value)
+
+
+def test_missing_wheel(server_socket: str, tmp_path: Path) -> None:
+    request = {
+        "cwd": str(tmp_path),
+        "options": encode_options(configpath=NO_CONFIG),
+        "wheels": ["missing-1.0-py3-none-any.whl"],
+    }
+    with pytest.raises(UserInputError) as excinfo:
+        send_request(server_socket, request, lambda _line, _err: None)
+    assert "missing-1.0-py3-none-any.whl" in str(excinfo.value)
+
+
+def test_serve_with_wheels(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(str(WHEEL_DIR))
+    r = CliRunner().invoke(
+        main, ["--serve", "cwc.sock", "whatodo-0.1.0a4-py3-none-any.whl"]
+    )
+    assert r.exit_code == 2
+    assert "--serve cannot be combined with --connect or wheel arguments" in r.output
+
+
+def test_get_checker_lru(tmp_path: Path) -> None:
+    server = CheckServer(str(tmp_path / "cwc.sock"), jobs=1, max_checkers=2)
+    try:
+        options = [
+            encode_options(configpath=NO_CONFIG, select={c})
+            for c in (Check.W001, Check.W002, Check.W003)
+        ]
+        first = server.get_checker(options[0])
+        server.get_checker(options[1])
+        assert server.get_checker(options[0]) is first
+        server.get_checker(options[2])
+        assert len(server.checkers) == 2
+        # options[1] was the least recently used and so was evicted:
+        assert server.get_checker(options[0]) is first
+        assert server.get_checker(options[1]).selected == {Check.W002}
+        assert len(server.checkers) == 2
+    finally:
+        server.server_close()
+
+
+def test_get_checker_package_changed(tmp_path: Path) -> None:
+    pkg = tmp_path / "src" / "foo"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").touch()
+    server = CheckServer(str(tmp_path / "cwc.sock"), jobs=1)
+    try:
+        options = encode_options(configpath=NO_CONFIG, package=(str(pkg),))
+        checker = server.get_checker(options)
+        assert server.get_checker(options) is checker
+        assert checker.pkgtree is not None
+        assert [f.path for f in checker.pkgtree.all_files()] == ["foo/__init__.py"]
+        (pkg / "sub").mkdir()
+        (pkg / "sub" / "bar.py").touch()
+        checker2 = server.get_checker(options)
+        assert checker2 is not checker
+        assert checker2.pkgtree is not None
+        assert sorted(f.path for f in checker2.pkgtree.all_files()) == [
+            "foo/__init__.py",
+            "foo/sub/bar.py",
+        ]
+        assert server.get_checker(options) is checker2
+    finally:
+        server.server_close()
+
+
+def test_get_checker_builds_outside_lock(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    server = CheckServer(str(tmp_path / "cwc.sock"), jobs=1)
+    locked = []
+
+    def configure_options(self: WheelChecker, **_kwargs: Any) -> None:
+        locked.append(server.checkers_lock.locked())
+
+    monkeypatch.setattr(WheelChecker, "configure_options", configure_options)
+    try:
+        server.get_checker(encode_options(configpath=NO_CONFIG))
+    finally:
+        server.server_close()
+    assert locked == [False]
+
+
+def wait_for_socket(socket_path: str) -> None:
+    for _ in range(500):
+        if os.path.exists(socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                try:
+                    s.connect(socket_path)
+                except OSError:
+                    pass
+                else:
+                    return
+        time.sleep(0.01)
+    raise AssertionError("Server did not start")
+
+
+def run_serve(socket_path: str, client: Callable[[], None]) -> None:
+    """
+    Run `serve()` in the main thread (so that it can install its signal
+    handlers) while ``client`` is run in another thread once the server is up,
+    after which the server is sent a SIGTERM
+    """
+    errors: list[Exception] = []
+
+    def run_client() -> None:
+        try:
+            wait_for_socket(socket_path)
+            client()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    thread = threading.Thread(target=run_client)
+    handler = signal.getsignal(signal.SIGTERM)
+    thread.start()
+    try:
+        serve(socket_path, jobs=1)
+    finally:
+        thread.join()
+    assert signal.getsignal(signal.SIGTERM) is handler
+    assert not os.path.exists(socket_path)
+    if errors:
+        raise errors[0]
+
+
+def test_serve(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    socket_path = str(tmp_path / "cwc.sock")
+    lines: list[tuple[str, bool]] = []
+
+    def client() -> None:
+        request = {
+            "cwd": str(WHEEL_DIR),
+            "options": encode_options(configpath=NO_CONFIG, select={Check.W007}),
+            "wheels": ["whatodo-0.1.0a4-py3-none-any.whl"],
+        }
+        rc = send_request(socket_path, request, lambda ln, err: lines.append((ln, err)))
+        assert rc == 0
+
+    run_serve(socket_path, client)
+    assert lines == [("whatodo-0.1.0a4-py3-none-any.whl: OK", False)]
+    assert capsys.readouterr().err == f"Listening on {socket_path}\n"
+
+
+def test_serve_stale_socket(tmp_path: Path) -> None:
+    socket_path = str(tmp_path / "cwc.sock")
+    # Binding without listening leaves behind a socket file that cannot be
+    # connected to:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.bind(socket_path)
+    assert os.path.exists(socket_path)
+    run_serve(socket_path, lambda: None)
+
+
+def test_serve_already_running(server_socket: str) -> None:
+    with pytest.raises(UserInputError) as excinfo:
+        serve(server_socket, jobs=1)
+    assert str(excinfo.value) == f"{server_socket}: server is already running"
+    assert os.path.exists(server_socket)
@@ -2,6 +2,7 @@ from __future__ import annotations
 import pytest
 from check_wheel_contents.errors import WheelValidationError
 from check_wheel_contents.util import (
+    classify_basename,
     comma_split,
     find_wheel_dirs,
     is_data_dir,
@@ -36,6 +37,21 @@ def test_pymodule_basename(filename: str, expected: str | None) -> None:
     assert pymodule_basename(filename) == expected
 
 
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        ("foo.py", (".py", "foo")),
+        ("foo.pyc", (".pyc", None)),
+        ("py.typed", (".typed", None)),
+        ("README", ("", None)),
+        (".py", ("", None)),
+        ("_ffi.abi3.so", (".so", "_ffi")),
+    ],
+)
+def test_classify_basename(filename: str, expected: tuple[str, str | None]) -> None:
+    assert classify_basename(filename) == expected
+
+
 @pytest.mark.parametrize(
     "sin,lout",
     [
@@ -1,9 +1,19 @@
 from __future__ import annotations
+import csv
+from io import StringIO
+from operator import attrgetter
 from pathlib import Path
+import pickle
+from zipfile import ZipFile
 import pytest
-from check_wheel_contents.contents import WheelContents
+from pytest_mock import MockerFixture
+from check_wheel_contents.checker import WheelChecker
+from check_wheel_contents.checks import Check, FailedCheck
+from check_wheel_contents.contents import WheelContents, split_record
 from check_wheel_contents.errors import WheelValidationError
 from check_wheel_contents.filetree import Directory, File
+from check_wheel_contents.util import bytes_signature
+from check_wheel_contents.zipstream import ZipMember
 
 WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
 
@@ -756,12 +766,225 @@ def test_from_wheel_no_record_file() -> None:
     assert str(excinfo.value) == "No RECORD file in wheel"
 
 
+def test_from_wheel_zip_listing_fallback() -> None:
+    whlcon = WheelContents.from_wheel(
+        WHEEL_DIR / "no_record-1.0.0-py3-none-any.whl", zip_listing="fallback"
+    )
+    assert whlcon.filetree == Directory(
+        path=None,
+        entries={
+            "module.py": File(("module.py",), 65, None),
+            "no_record-1.0.0.dist-info": Directory(
+                path="no_record-1.0.0.dist-info/",
+                entries={
+                    "METADATA": File(
+                        ("no_record-1.0.0.dist-info", "METADATA"), 146, None
+                    ),
+                    "WHEEL": File(("no_record-1.0.0.dist-info", "WHEEL"), 79, None),
+                },
+            ),
+        },
+    )
+
+
+@pytest.mark.parametrize("zip_listing", ["never", "fallback"])
+def test_from_wheel_zip_listing_with_record(zip_listing: str) -> None:
+    whlfile = WHEEL_DIR / "ttyrec2video-0.1.0.dev1-py3-none-any.whl"
+    assert WheelContents.from_wheel(
+        whlfile, zip_listing=zip_listing
+    ) == WheelContents.from_wheel(whlfile)
+
+
+def test_from_wheel_zip_listing_always() -> None:
+    whlfile = WHEEL_DIR / "ttyrec2video-0.1.0.dev1-py3-none-any.whl"
+    from_record = WheelContents.from_wheel(whlfile)
+    from_zip = WheelContents.from_wheel(whlfile, zip_listing="always")
+    assert from_zip.root_is_purelib is from_record.root_is_purelib
+    record = "ttyrec2video-0.1.0.dev1.dist-info/RECORD"
+    # The files are the same apart from the RECORD's own size, which it does
+    # not list, but they have no hashes:
+    assert [(f.path, f.size) for f in from_zip.filetree.all_files()] == [
+        (f.path, 1269 if f.path == record else f.size)
+        for f in from_record.filetree.all_files()
+    ]
+    assert all(f.hashsum is None for f in from_zip.filetree.all_files())
+
+
+def test_from_wheel_hash_crc_duplicates(tmp_path: Path) -> None:
+    whlfile = tmp_path / "foo-1.0-py3-none-any.whl"
+    sys_hash = bytes_signature(b"import sys\n")[1]
+    os_hash = bytes_signature(b"import os\n")[1]
+    with ZipFile(whlfile, "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        zf.writestr("foo/a.py", "import sys\n")
+        zf.writestr("foo/b.py", "import sys\n")
+        zf.writestr("foo/c.py", "import os\n")
+        zf.writestr("foo/d.py", "import os\n")
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr(
+            "foo-1.0.dist-info/RECORD",
+            "foo/__init__.py,,\n"
+            "foo/a.py,,\n"
+            "foo/b.py,,\n"
+            f"foo/c.py,{os_hash},10\n"
+            "foo/d.py,,\n"
+            "foo-1.0.dist-info/WHEEL,,\n"
+            "foo-1.0.dist-info/RECORD,,\n",
+        )
+    whlcon = WheelContents.from_wheel(whlfile)
+    assert whlcon.archive is not None
+    # Only the hashless files whose sizes & CRC-32s collide are hashed:
+    assert {m.name: m.digest for m in whlcon.archive if m.digest is not None} == {
+        "foo/a.py": sys_hash,
+        "foo/b.py": sys_hash,
+    }
+    assert [[f.path for f, _ in g] for g in whlcon.crc_duplicates()] == [
+        ["foo/a.py", "foo/b.py"]
+    ]
+    whlcon = WheelContents.from_wheel(whlfile, hash_collisions=False)
+    assert whlcon.archive is not None
+    assert all(m.digest is None for m in whlcon.archive)
+
+
 def test_from_wheel_no_wheel_file() -> None:
     with pytest.raises(WheelValidationError) as excinfo:
         WheelContents.from_wheel(WHEEL_DIR / "no_wheel_file-1.0.0-py3-none-any.whl")
     assert str(excinfo.value) == "No WHEEL file in wheel"
 
 
+def make_dist_info(root: Path, name: str, record: str, wheel: str | None) -> Path:
+    dist_info = root / f"{name}.dist-info"
+    dist_info.mkdir(parents=True)
+    if wheel is not None:
+        (dist_info / "WHEEL").write_text(wheel)
+    (dist_info / "RECORD").write_text(record)
+    return dist_info
+
+
+def test_from_dist_info_installed(tmp_path: Path) -> None:
+    dist_info = make_dist_info(
+        tmp_path / "site-packages",
+        "foo-1.0",
+        "../../../bin/foo,sha256=abc,42\n"
+        "foo/__init__.py,sha256=def,100\n"
+        "foo/__pycache__/__init__.cpython-312.pyc,,\n"
+        "foo/_cext.cpython-312-x86_64-linux-gnu.so,sha256=ghi,200\n"
+        "foo-1.0.dist-info/INSTALLER,sha256=jkl,4\n"
+        "foo-1.0.dist-info/WHEEL,sha256=mno,80\n"
+        "foo-1.0.dist-info/RECORD,,\n",
+        "Wheel-Version: 1.0\nRoot-Is-Purelib: false\n",
+    )
+    whlcon = WheelContents.from_dist_info(dist_info)
+    assert whlcon.dist_info_dir == "foo-1.0.dist-info"
+    assert whlcon.data_dir == "foo-1.0.data"
+    assert not whlcon.root_is_purelib
+    assert [f.path for f in whlcon.filetree.all_files()] == [
+        "foo/__init__.py",
+        "foo/_cext.cpython-312-x86_64-linux-gnu.so",
+        "foo-1.0.dist-info/INSTALLER",
+        "foo-1.0.dist-info/WHEEL",
+        "foo-1.0.dist-info/RECORD",
+    ]
+    assert [f.path for f in whlcon.platlib_tree.all_files()] == [
+        "foo/__init__.py",
+        "foo/_cext.cpython-312-x86_64-linux-gnu.so",
+    ]
+
+
+def test_from_dist_info_shipped_bytecode(tmp_path: Path) -> None:
+    # Bytecode that was in the wheel is listed in RECORD with a hash, unlike
+    # bytecode generated by the installer:
+    dist_info = make_dist_info(
+        tmp_path / "site-packages",
+        "foo-1.0",
+        "foo/__init__.py,sha256=abc,100\n"
+        "foo/__pycache__/__init__.cpython-312.pyc,,\n"
+        "foo/__pycache__/bar.cpython-312.pyc,sha256=def,200\n"
+        "foo/baz.pyc,sha256=ghi,300\n"
+        "foo-1.0.dist-info/WHEEL,sha256=jkl,80\n"
+        "foo-1.0.dist-info/RECORD,,\n",
+        "Root-Is-Purelib: true\n",
+    )
+    whlcon = WheelContents.from_dist_info(dist_info)
+    assert [f.path for f in whlcon.filetree.all_files()] == [
+        "foo/__init__.py",
+        "foo/__pycache__/bar.cpython-312.pyc",
+        "foo/baz.pyc",
+        "foo-1.0.dist-info/WHEEL",
+        "foo-1.0.dist-info/RECORD",
+    ]
+    assert WheelChecker().check_W001(whlcon) == [
+        FailedCheck(Check.W001, ["foo/__pycache__/bar.cpython-312.pyc", "foo/baz.pyc"])
+    ]
+
+
+def test_from_dist_info_unpacked_wheel(tmp_path: Path) -> None:
+    dist_info = make_dist_info(
+        tmp_path / "foo-1.0",
+        "foo-1.0",
+        "foo.py,sha256=abc,42\n"
+        "foo-1.0.data/scripts/foo,sha256=def,100\n"
+        "foo-1.0.dist-info/WHEEL,sha256=ghi,80\n"
+        "foo-1.0.dist-info/RECORD,,\n",
+        "Root-Is-Purelib: true\n",
+    )
+    whlcon = WheelContents.from_dist_info(str(dist_info))
+    assert whlcon.root_is_purelib
+    assert [f.path for f in whlcon.filetree.all_files()] == [
+        "foo.py",
+        "foo-1.0.data/scripts/foo",
+        "foo-1.0.dist-info/WHEEL",
+        "foo-1.0.dist-info/RECORD",
+    ]
+
+
+@pytest.mark.parametrize(
+    "name,record,wheel,errmsg",
+    [
+        (
+            "foo-1.0",
+            "foo.py,,\nfoo-1.0.dist-info/RECORD,,\n",
+            None,
+            "No WHEEL file in .dist-info directory",
+        ),
+        (
+            "foo-1.0",
+            "foo.py,,\n",
+            "Wheel-Version: 1.0\n",
+            "Root-Is-Purelib header not found in WHEEL file",
+        ),
+        (
+            "foo-1.0",
+            "foo.py,,\nbar-1.0.dist-info/RECORD,,\n",
+            "Root-Is-Purelib: true\n",
+            ".dist-info directory in RECORD ('bar-1.0.dist-info') does not match"
+            " actual directory name ('foo-1.0.dist-info')",
+        ),
+    ],
+)
+def test_from_dist_info_error(
+    tmp_path: Path, name: str, record: str, wheel: str | None, errmsg: str
+) -> None:
+    dist_info = make_dist_info(tmp_path, name, record, wheel)
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_dist_info(dist_info)
+    assert str(excinfo.value) == errmsg
+
+
+def test_from_dist_info_no_record(tmp_path: Path) -> None:
+    dist_info = make_dist_info(tmp_path, "foo-1.0", "", "Root-Is-Purelib: true\n")
+    (dist_info / "RECORD").unlink()
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_dist_info(dist_info)
+    assert str(excinfo.value) == "No RECORD file in .dist-info directory"
+
+
+def test_from_dist_info_not_dist_info(tmp_path: Path) -> None:
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_dist_info(tmp_path / "foo-1.0")
+    assert str(excinfo.value) == "Not a .dist-info directory: 'foo-1.0'"
+
+
 def test_by_signature_dup_files() -> None:
     whlcon = WheelContents(
         dist_info_dir="foo-1.0.dist-info",
@@ -821,3 +1044,190 @@ def test_by_signature_dup_files() -> None:
             )
         ],
     }
+
+
+def test_library_files() -> None:
+    whlcon = WheelContents(
+        dist_info_dir="foo-1.0.dist-info",
+        data_dir="foo-1.0.data",
+        root_is_purelib=True,
+    )
+    whlcon.add_record_rows(
+        [
+            ["foo-1.0.dist-info/METADATA", "", ""],
+            ["foo-1.0.data/platlib/bar.so", "", ""],
+            ["foo.py", "", ""],
+        ]
+    )
+    assert [f.path for f in whlcon.library_files] == [
+        "foo.py",
+        "foo-1.0.data/platlib/bar.so",
+    ]
+    whlcon.add_record_rows([["foo/__init__.py", "", ""]])
+    assert [f.path for f in whlcon.library_files] == [
+        "foo.py",
+        "foo/__init__.py",
+        "foo-1.0.data/platlib/bar.so",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "\n",
+        "foo.py,sha256=abc,42\n",
+        "foo.py,sha256=abc,42",
+        "foo.py,sha256=abc,42\r\nbar.py,,\r\n",
+        "foo.py,,\rbar.py,,\r",
+        "foo.py,,\n\nbar.py,,\n",
+        'foo.py,,\n"foo,bar.py",sha256=abc,42\nbaz.py,,\n',
+        '"a ""quoted"" name.py",,\n',
+        '"multi\r\nline.py",,\r\nbaz.py,,\r\n',
+        '"multi\nline\nname.py",,\nbaz.py,,\n',
+        '"unterminated.py,,\nbaz.py,,\n',
+        "foo.py,sha256=abc,42,extra\nbar.py\n",
+    ],
+)
+def test_split_record(text: str) -> None:
+    expected = list(
+        csv.reader(StringIO(text, newline=""), delimiter=",", quotechar='"')
+    )
+    assert list(split_record(text)) == expected
+
+
+def test_add_record_text() -> None:
+    whlcon = WheelContents(dist_info_dir="foo-1.0.dist-info", data_dir="foo-1.0.data")
+    whlcon.add_record_text(
+        "foo/__init__.py,sha256=abc,42\r\n"
+        '"foo/a,b.py",,\r\n'
+        '"foo/a\r\n.",,\r\n'
+        "foo/,,\r\n"
+        "foo-1.0.dist-info/RECORD,,\r\n"
+    )
+    assert [f.path for f in whlcon.filetree.all_files()] == [
+        "foo/__init__.py",
+        "foo/a,b.py",
+        "foo/a\r\n.",
+        "foo-1.0.dist-info/RECORD",
+    ]
+    assert whlcon.filetree["foo"]["__init__.py"] == File(  # type: ignore[index]
+        ("foo", "__init__.py"), 42, "sha256=abc"
+    )
+
+
+@pytest.mark.parametrize(
+    "text,errmsg",
+    [
+        ("foo.py,,\n/bar.py,,\n", "Absolute path in RECORD: '/bar.py'"),
+        ("foo/../bar.py,,\n", "Non-normalized path in RECORD: 'foo/../bar.py'"),
+        ("foo.py,,\n\n", "Invalid RECORD entry: []"),
+        ("foo.py,,4x\n", "Invalid RECORD entry: ['foo.py', '', '4x']"),
+        ("foo.py,,4x\n/bar.py,,\n", "Invalid RECORD entry: ['foo.py', '', '4x']"),
+        ("foo/,,\nfoo,,\n./bar.py,,\n", "Conflicting occurrences of path 'foo'"),
+    ],
+)
+def test_add_record_text_error(text: str, errmsg: str) -> None:
+    whlcon = WheelContents(dist_info_dir="foo-1.0.dist-info", data_dir="foo-1.0.data")
+    with pytest.raises(WheelValidationError) as excinfo:
+        whlcon.add_record_text(text)
+    assert str(excinfo.value) == errmsg
+
+
+@pytest.mark.parametrize(
+    "whlfile",
+    [
+        WHEEL_DIR / "physlearn-1.2.2-py3-none-any.whl",
+        WHEEL_DIR / "ttyrec2video-0.1.0.dev1-py3-none-any.whl",
+        WHEEL_DIR / "bcrypt-3.1.7-cp38-cp38-win_amd64.whl",
+    ],
+    ids=attrgetter("name"),
+)
+def test_pickle(whlfile: Path) -> None:
+    whlcon = WheelContents.from_wheel(whlfile)
+    rebuilt = pickle.loads(pickle.dumps(whlcon))
+    assert rebuilt == whlcon
+    assert list(rebuilt.by_signature) == list(whlcon.by_signature)
+    assert list(rebuilt.filetree.all_files()) == list(whlcon.filetree.all_files())
+    assert rebuilt.filetree.stats == whlcon.filetree.stats
+    # The files in by_signature are the same objects as those in the tree:
+    tree_files = {id(f) for f in rebuilt.filetree.all_files()}
+    assert all(
+        id(f) in tree_files for files in rebuilt.by_signature.values() for f in files
+    )
+
+
+@pytest.mark.parametrize(
+    "archive",
+    [
+        None,
+        [],
+        [
+            ZipMember(name="foo/", size=0, crc=0),
+            ZipMember(
+                name="foo/ünï,\ncode.py",
+                size=3,
+                crc=0xFFFFFFFF,
+                compress_size=5,
+                compress_type=8,
+            ),
+        ],
+    ],
+)
+def test_pickle_archive(archive: list[ZipMember] | None) -> None:
+    whlcon = WheelContents(
+        dist_info_dir="foo-1.0.dist-info",
+        data_dir="foo-1.0.data",
+        root_is_purelib=False,
+        archive=archive,
+    )
+    whlcon.add_record_rows([["foo/ünï,\ncode.py", "sha256=abc", "3"]])
+    assert pickle.loads(pickle.dumps(whlcon)) == whlcon
+
+
+def test_library_tree_view_stats(mocker: MockerFixture) -> None:
+    whlcon = WheelContents.from_wheel(WHEEL_DIR / "physlearn-1.2.2-py3-none-any.whl")
+    spy = mocker.spy(Directory, "update_stats")
+    purelib = whlcon.purelib_tree
+    assert spy.call_count == 0
+    assert purelib.stats.files == len(whlcon.library_files)
+
+
+def test_add_record_rows_clears_caches_once(mocker: MockerFixture) -> None:
+    whlcon = WheelContents(dist_info_dir="foo-1.0.dist-info", data_dir="foo-1.0.data")
+    spy = mocker.spy(whlcon, "_clear_caches")
+    whlcon.add_record_rows([["foo/__init__.py", "", ""], ["foo/bar.py", "", ""]])
+    assert spy.call_count == 1
+
+
+def test_add_entry_clears_caches() -> None:
+    whlcon = WheelContents(dist_info_dir="foo-1.0.dist-info", data_dir="foo-1.0.data")
+    whlcon.add_record_rows([["foo/__init__.py", "", ""]])
+    assert [f.path for f in whlcon.library_files] == ["foo/__init__.py"]
+    whlcon.add_entry(File(("foo", "bar.py"), None, None))
+    assert [f.path for f in whlcon.library_files] == [
+        "foo/__init__.py",
+        "foo/bar.py",
+    ]
+    assert list(whlcon.files_by_path) == ["foo/__init__.py", "foo/bar.py"]
+
+
+def test_library_trees_live() -> None:
+    whlcon = WheelContents(
+        dist_info_dir="foo-1.0.dist-info",
+        data_dir="foo-1.0.data",
+        root_is_purelib=True,
+    )
+    purelib = whlcon.purelib_tree
+    assert not purelib
+    assert not whlcon.platlib_tree
+    whlcon.add_record_rows(
+        [
+            ["foo-1.0.dist-info/METADATA", "", ""],
+            ["foo/__init__.py", "", ""],
+            ["foo-1.0.data/platlib/bar.so", "", ""],
+        ]
+    )
+    assert list(purelib.entries) == ["foo"]
+    assert purelib == whlcon.purelib_tree
+    assert whlcon.platlib_tree is whlcon.filetree["foo-1.0.data"]["platlib"]  # type: ignore[index]
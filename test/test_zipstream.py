@@ -0,0 +1,202 @@
+from __future__ import annotations
+import io
+from operator import attrgetter
+from pathlib import Path
+import struct
+from typing import IO, cast
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+from click.testing import CliRunner
+import pytest
+from check_wheel_contents.__main__ import main
+from check_wheel_contents.contents import WheelContents
+from check_wheel_contents.errors import WheelValidationError
+from check_wheel_contents.zipstream import ZipMember, read_zip_stream
+
+WHEEL_DIR = Path(__file__).with_name("data") / "wheels"
+
+RECORD = (
+    "foo/__init__.py,sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU,0\n"
+    "foo/data.bin,sha256=abc,200000\n"
+    "foo-1.0.dist-info/WHEEL,sha256=def,22\n"
+    "foo-1.0.dist-info/RECORD,,\n"
+)
+
+
+class Pipe(io.RawIOBase):
+    """A non-seekable file that returns at most ``size`` bytes per read"""
+
+    def __init__(self, data: bytes, size: int = 1000) -> None:
+        self.data = data
+        self.pos = 0
+        self.size = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: bytearray) -> int:  # type: ignore[override]
+        n = min(len(b), self.size, len(self.data) - self.pos)
+        b[:n] = self.data[self.pos : self.pos + n]
+        self.pos += n
+        return n
+
+
+def pipe(data: bytes) -> IO[bytes]:
+    return cast(IO[bytes], Pipe(data))
+
+
+class WritePipe(io.RawIOBase):
+    """A non-seekable file for writing, which makes `ZipFile` use data
+    descriptors"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: bytes) -> int:  # type: ignore[override]
+        self.data += b
+        return len(b)
+
+
+def make_wheel(compression: int, streamed: bool) -> bytes:
+    fp: io.BytesIO | WritePipe = WritePipe() if streamed else io.BytesIO()
+    with ZipFile(fp, "w", compression=compression) as zf:
+        zf.writestr("foo/__init__.py", "")
+        with zf.open("foo/data.bin", "w") as member:
+            # Contains data descriptor signatures that are not followed by
+            # the right size:
+            member.write(b"PK\x07\x08" * 50000)
+        zf.writestr("foo-1.0.dist-info/WHEEL", "Root-Is-Purelib: true\n")
+        zf.writestr("foo-1.0.dist-info/RECORD", RECORD)
+    return bytes(fp.getvalue() if isinstance(fp, io.BytesIO) else fp.data)
+
+
+@pytest.mark.parametrize("compression", [ZIP_STORED, ZIP_DEFLATED])
+@pytest.mark.parametrize("streamed", [False, True])
+def test_read_zip_stream(compression: int, streamed: bool) -> None:
+    data = make_wheel(compression, streamed)
+    members, kept = read_zip_stream(pipe(data), lambda n: n.endswith("RECORD"))
+    assert members == [
+        ZipMember(
+            name=zi.filename,
+            size=zi.file_size,
+            crc=zi.CRC,
+            compress_size=zi.compress_size,
+            compress_type=zi.compress_type,
+        )
+        for zi in ZipFile(io.BytesIO(data)).infolist()
+    ]
+    assert kept == {"foo-1.0.dist-info/RECORD": RECORD.encode()}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        # A data descriptor signature followed by a zero CRC & zero sizes,
+        # which are right for the empty prefix before it, but not by the
+        # signature of another record:
+        b"PK\x07\x08" + bytes(12) + b"more data",
+        # A signature followed by the right sizes for the bytes before it but
+        # the wrong CRC:
+        b"abcd" + b"PK\x07\x08" + bytes(4) + struct.pack("<LL", 4, 4) + b"more",
+    ],
+)
+def test_read_zip_stream_stored_fake_descriptor(body: bytes) -> None:
+    fp = WritePipe()
+    with ZipFile(fp, "w", compression=ZIP_STORED) as zf:
+        with zf.open("foo/data.bin", "w") as member:
+            member.write(body)
+        zf.writestr("foo-1.0.dist-info/RECORD", RECORD)
+    data = bytes(fp.data)
+    members, kept = read_zip_stream(pipe(data), lambda _: True)
+    assert [(m.name, m.size) for m in members] == [
+        ("foo/data.bin", len(body)),
+        ("foo-1.0.dist-info/RECORD", len(RECORD)),
+    ]
+    assert kept == {
+        "foo/data.bin": body,
+        "foo-1.0.dist-info/RECORD": RECORD.encode(),
+    }
+
+
+@pytest.mark.parametrize("compression", [ZIP_STORED, ZIP_DEFLATED])
+@pytest.mark.parametrize("streamed", [False, True])
+def test_from_stream(compression: int, streamed: bool) -> None:
+    data = make_wheel(compression, streamed)
+    whlcon = WheelContents.from_stream(pipe(data))
+    assert whlcon.dist_info_dir == "foo-1.0.dist-info"
+    assert whlcon.data_dir == "foo-1.0.data"
+    assert whlcon.filetree == (
+        WheelContents.from_wheel(
+            "foo-1.0-py3-none-any.whl", fileobj=io.BytesIO(data)
+        ).filetree
+    )
+
+
+@pytest.mark.parametrize(
+    "whlfile",
+    [
+        p
+        for p in sorted(WHEEL_DIR.glob("*.whl"))
+        if not p.name.startswith(("bad_", "no_", "empty_", "multiple_"))
+    ],
+    ids=attrgetter("name"),
+)
+def test_from_stream_same_as_from_wheel(whlfile: Path) -> None:
+    try:
+        expected = WheelContents.from_wheel(whlfile)
+    except (ValueError, WheelValidationError):
+        pytest.skip("Wheel is not readable")
+    whlcon = WheelContents.from_stream(pipe(whlfile.read_bytes()), whlfile.name)
+    assert whlcon == expected
+
+
+@pytest.mark.parametrize("zip_listing", ["fallback", "always"])
+def test_from_stream_zip_listing(zip_listing: str) -> None:
+    whlfile = WHEEL_DIR / "no_record-1.0.0-py3-none-any.whl"
+    whlcon = WheelContents.from_stream(
+        pipe(whlfile.read_bytes()), zip_listing=zip_listing
+    )
+    assert whlcon == WheelContents.from_wheel(whlfile, zip_listing=zip_listing)
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_stream(pipe(whlfile.read_bytes()))
+    assert str(excinfo.value) == "No RECORD file in wheel"
+
+
+def test_from_stream_mismatched_central_directory() -> None:
+    data = make_wheel(ZIP_DEFLATED, False)
+    # Rename a member in the central directory only:
+    i = data.rindex(b"foo/data.bin")
+    data = data[:i] + b"foo/data.txt" + data[i + 12 :]
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_stream(pipe(data))
+    assert str(excinfo.value) == (
+        "ZIP stream's central directory does not match its local file headers"
+    )
+
+
+def test_from_stream_truncated() -> None:
+    data = make_wheel(ZIP_DEFLATED, True)
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_stream(pipe(data[: len(data) // 2]))
+    assert str(excinfo.value) == "ZIP stream is truncated"
+
+
+def test_from_stream_not_zip() -> None:
+    with pytest.raises(WheelValidationError) as excinfo:
+        WheelContents.from_stream(pipe(b"This is not a wheel.\n"))
+    assert str(excinfo.value) == "Invalid ZIP stream: unexpected signature b'This'"
+
+
+def test_main_stdin() -> None:
+    whlfile = WHEEL_DIR / "NLPTriples-0.1.7-py3-none-any.whl"
+    r = CliRunner().invoke(main, ["--no-config", "-"], input=whlfile.read_bytes())
+    assert r.exit_code == 0
+    assert r.stdout == "-: OK\n"
+
+
+def test_main_stdin_connect() -> None:
+    r = CliRunner().invoke(main, ["--connect", "sock", "-"])
+    assert r.exit_code != 0
+    assert "Wheels cannot be read from standard input with --connect" in r.output